@@ -0,0 +1,79 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Per-token sign/verify cost of HS256/RS256 algorithms.
+
+Compares PEM strings vs loaded keys and the generic PyJWT pipeline vs
+lean verification.
+
+Usage: python benchmarks/bench_algorithms.py [--number N] [--bitness B]
+"""
+
+import argparse
+import timeit
+
+import jwt
+
+from gcl_iam import algorithms
+from gcl_iam import tokens
+
+
+def _report(name: str, number: int, seconds: float) -> None:
+    print(f"{name:<40} {seconds / number * 1e6:10.1f} us/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--bitness", type=int, default=2048)
+    args = parser.parse_args()
+
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=args.bitness)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(private_key=private_key_pem, public_key=public_key_pem)
+    lean_algo = algorithms.RS256(
+        private_key=private_key_pem,
+        public_key=public_key_pem,
+        lean_verify=True,
+    )
+    hs256_key = "a-secret-key-that-is-at-least-32-bytes"
+    hs256_algo = algorithms.HS256(key=hs256_key)
+    hs256_lean_algo = algorithms.HS256(key=hs256_key, lean_verify=True)
+    payload = {"sub": "user", "exp": 2**32}
+    token = algo.encode(payload)
+    parsed_token = tokens.ParsedToken(token)
+    hs256_token = hs256_algo.encode(payload)
+
+    cases = {
+        "sign: jwt.encode(PEM)": lambda: jwt.encode(
+            payload, key=private_key_pem, algorithm="RS256"
+        ),
+        "sign: RS256.encode (loaded key)": lambda: algo.encode(payload),
+        "verify: jwt.decode(PEM)": lambda: jwt.decode(
+            token, key=public_key_pem, algorithms=["RS256"]
+        ),
+        "verify: RS256.decode (loaded key)": lambda: algo.decode(token),
+        "verify: RS256.decode (parsed token)": lambda: algo.decode(parsed_token),
+        "verify: RS256.decode (lean)": lambda: lean_algo.decode(token),
+        "verify: HS256.decode": lambda: hs256_algo.decode(hs256_token),
+        "verify: HS256.decode (lean)": lambda: hs256_lean_algo.decode(hs256_token),
+    }
+    for name, case in cases.items():
+        _report(name, args.number, timeit.timeit(case, number=args.number))
+
+
+if __name__ == "__main__":
+    main()
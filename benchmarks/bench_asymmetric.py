@@ -0,0 +1,70 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Per-token sign/verify cost of RS256 vs ES256 vs EdDSA.
+
+Usage: python benchmarks/bench_asymmetric.py [--number N]
+"""
+
+import argparse
+import timeit
+
+from gcl_iam import algorithms
+
+
+def _report(name: str, number: int, seconds: float) -> None:
+    print(f"{name:<36} {seconds / number * 1e6:10.1f} us/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    private_keys = {
+        "RS256-2048": (
+            algorithms.RS256,
+            algorithms.generate_rsa_private_key_pem(bitness=2048),
+        ),
+        "RS256-4096": (
+            algorithms.RS256,
+            algorithms.generate_rsa_private_key_pem(bitness=4096),
+        ),
+        "ES256": (algorithms.ES256, algorithms.generate_es256_private_key_pem()),
+        "EdDSA": (algorithms.EdDSA, algorithms.generate_eddsa_private_key_pem()),
+    }
+    payload = {"sub": "user", "exp": 2**32}
+
+    for name, (algorithm_cls, private_key_pem) in private_keys.items():
+        public_key_pem = algorithms.generate_public_key_pem(private_key_pem)
+        algo = algorithm_cls(private_key=private_key_pem, public_key=public_key_pem)
+        lean_algo = algorithm_cls(
+            private_key=private_key_pem,
+            public_key=public_key_pem,
+            lean_verify=True,
+        )
+        token = algo.encode(payload)
+        cases = {
+            f"sign: {name}": lambda: algo.encode(payload),
+            f"verify: {name}": lambda: algo.decode(token),
+            f"verify: {name} (lean)": lambda: lean_algo.decode(token),
+        }
+        for case_name, case in cases.items():
+            _report(case_name, args.number, timeit.timeit(case, number=args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Throughput of RS256 `decode_many` serially and on thread/process pools.
+
+Run it with several `--workers` values on a machine with at least as many
+cores to see how the batch path scales; "keys once" rows use an
+`AlgorithmProcessPool` that receives the public keys at worker start.
+
+Usage: python benchmarks/bench_decode_many.py [--tokens N] [--workers 1,2,4]
+"""
+
+import argparse
+import os
+import time
+from concurrent import futures
+
+from gcl_iam import algorithms
+
+
+def _report(name: str, count: int, seconds: float) -> None:
+    print(f"{name:<40} {count / seconds:10.0f} tokens/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=5000)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--lean", action="store_true")
+    args = parser.parse_args()
+
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(
+        private_key=private_key_pem,
+        public_key=public_key_pem,
+        lean_verify=args.lean,
+    )
+    batch = [algo.encode({"sub": "user", "n": i}) for i in range(args.tokens)]
+    print(f"CPUs available: {os.cpu_count()}")
+
+    started = time.perf_counter()
+    for token in batch:
+        algo.decode(token)
+    _report("serial decode()", len(batch), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    algo.decode_many(batch, chunk_size=args.chunk_size)
+    _report("decode_many()", len(batch), time.perf_counter() - started)
+
+    for workers in (int(w) for w in args.workers.split(",")):
+        for name, make_executor in (
+            ("threads", futures.ThreadPoolExecutor),
+            ("processes", futures.ProcessPoolExecutor),
+            (
+                "processes, keys once",
+                lambda max_workers: algorithms.AlgorithmProcessPool(
+                    algo.verify_only(), max_workers=max_workers
+                ),
+            ),
+        ):
+            with make_executor(max_workers=workers) as executor:
+                started = time.perf_counter()
+                algo.decode_many(batch, executor=executor, chunk_size=args.chunk_size)
+                elapsed = time.perf_counter() - started
+            _report(f"decode_many() {workers} {name}", len(batch), elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cost of building or sharing enforcers and of a single decision.
+
+Usage: python benchmarks/bench_enforcers.py [--number N] [--perms N]
+"""
+
+import argparse
+import json
+import timeit
+
+from gcl_iam import catalogs
+from gcl_iam import enforcers
+from gcl_iam import rules
+
+
+def _report(name: str, number: int, seconds: float) -> None:
+    print(f"{name:<44} {seconds / number * 1e6:10.3f} us/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--perms", type=int, default=200)
+    args = parser.parse_args()
+
+    perms = [f"service_{i % 10}.resource_{i}.read" for i in range(args.perms)]
+    perms += ["service_1.*.list", "service_2.resource_2.*"]
+    enforcer = enforcers.Enforcer(perms)
+    compiled = enforcers.CompiledEnforcer(perms)
+    allowed = rules.Rule("service_2", "resource_2", "update")
+    denied = rules.Rule("service_3", "resource_1", "read")
+    raw = "service_1.resource_1.read"
+    registry = enforcers.EnforcerRegistry()
+    perms_json = json.dumps(perms)
+
+    cases = {
+        "build: Enforcer": (lambda: enforcers.Enforcer(perms), 100),
+        "build: CompiledEnforcer": (lambda: enforcers.CompiledEnforcer(perms), 100),
+        "per request: Enforcer": (
+            lambda: enforcers.Enforcer(json.loads(perms_json)),
+            100,
+        ),
+        "per request: EnforcerRegistry.get": (
+            # Fresh strings as decoded from every introspection response
+            lambda: registry.get(json.loads(perms_json)),
+            args.number // 100,
+        ),
+        "enforce allow: Enforcer": (lambda: enforcer.enforce(allowed), args.number),
+        "enforce allow: CompiledEnforcer": (
+            lambda: compiled.enforce(allowed),
+            args.number,
+        ),
+        "enforce deny: Enforcer": (lambda: enforcer.enforce(denied), args.number),
+        "enforce deny: CompiledEnforcer": (
+            lambda: compiled.enforce(denied),
+            args.number,
+        ),
+        "enforce_raw: Enforcer": (lambda: enforcer.enforce_raw(raw), args.number),
+        "enforce_raw: CompiledEnforcer": (
+            lambda: compiled.enforce_raw(raw),
+            args.number,
+        ),
+        "allowed_resources: Enforcer": (
+            lambda: enforcer.allowed_resources("service_1", "read"),
+            args.number,
+        ),
+    }
+    for name, (case, number) in cases.items():
+        _report(name, number, timeit.timeit(case, number=number))
+
+    # Field checks of a list endpoint: every row checks the same field rules
+    field_rules = [f"service_{i}.resource_{i}.read_field" for i in range(10)] * 1000
+    bulk_cases = {
+        "10k field rules: enforce_raw loop": lambda: [
+            enforcer.enforce_raw(r) for r in field_rules
+        ],
+        "10k field rules: enforce_many": lambda: enforcer.enforce_many(field_rules),
+    }
+    if enforcers.np is not None:
+        users = [registry.get(perms[: i % 5 + 1]) for i in range(1000)]
+        bulk_cases["1k users x 10 rules: enforce_matrix"] = lambda: (
+            enforcers.enforce_matrix(users, field_rules[:10])
+        )
+
+    # "Which of these principals can do X" over a catalog of every rule
+    catalog = catalogs.PermissionCatalog(p for p in perms if "*" not in p)
+    catalog.add("service_1.resource_1.list")
+    masks = [catalog.compile(perms[: i % 50 + 1]) for i in range(50000)]
+    question = ["service_1.resource_1.read"]
+    bulk_cases["50k principals: who_can (int masks)"] = lambda: catalog.who_can(
+        masks, question
+    )
+    if catalogs.np is not None:
+        bitset = catalog.to_bitset(masks)
+        bulk_cases["50k principals: who_can (NumPy bitset)"] = lambda: catalog.who_can(
+            bitset, question
+        )
+    for name, case in bulk_cases.items():
+        _report(name, 10, timeit.timeit(case, number=10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Glob permissions: trie matching against a linear scan of the patterns.
+
+Usage: python benchmarks/bench_globs.py [--number N] [--sizes N [N ...]]
+"""
+
+import argparse
+import fnmatch
+import time
+import timeit
+
+from gcl_iam import enforcers
+from gcl_iam import rules
+
+
+def _report(name: str, number: int, seconds: float) -> None:
+    print(f"{name:<44} {seconds / number * 1e6:10.3f} us/op")
+
+
+def _linear_scan(patterns, rule):
+    # What an enforcer without an index has to do
+    for service, res, perm in patterns:
+        if (
+            fnmatch.fnmatchcase(rule.service, service)
+            and fnmatch.fnmatchcase(rule.res, res)
+            and fnmatch.fnmatchcase(rule.perm, perm)
+        ):
+            return enforcers.Grant.ALLOW
+    return enforcers.Grant.DENY
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        # Half prefix globs on resources, half suffix globs on actions
+        perms = [
+            f"service_{i % 10}.resource_{i}_*.read"
+            if i % 2
+            else f"service_{i % 10}.resource_{i}.*_{i}"
+            for i in range(size)
+        ]
+        patterns = [p.split(".", maxsplit=2) for p in perms]
+        last = size - 1
+        allowed = rules.Rule(f"service_{last % 10}", f"resource_{last}_x", "read")
+        denied = rules.Rule("service_1", "resource_x", "read")
+
+        start = time.perf_counter()
+        enforcer = enforcers.Enforcer(perms)
+        _report(f"build: Enforcer ({size} globs)", 1, time.perf_counter() - start)
+
+        number = max(args.number * 10 // size, 10)
+        cases = {
+            f"allow: Enforcer ({size} globs)": (
+                lambda: enforcer.enforce(allowed),
+                args.number,
+            ),
+            f"deny: Enforcer ({size} globs)": (
+                lambda: enforcer.enforce(denied),
+                args.number,
+            ),
+            f"allow: linear scan ({size} globs)": (
+                lambda: _linear_scan(patterns, allowed),
+                number,
+            ),
+            f"deny: linear scan ({size} globs)": (
+                lambda: _linear_scan(patterns, denied),
+                number,
+            ),
+        }
+        for name, (case, n) in cases.items():
+            _report(name, n, timeit.timeit(case, number=n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Throughput of RS256 token issuance serially and with `TokenIssuer` pools.
+
+Usage: python benchmarks/bench_issuer.py [--tokens N] [--workers 1,2,4]
+"""
+
+import argparse
+import os
+import time
+
+import jwt
+
+from gcl_iam import algorithms
+from gcl_iam import issuers
+
+
+def _report(name: str, count: int, seconds: float) -> None:
+    print(f"{name:<32} {count / seconds:10.0f} tokens/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=500)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--bitness", type=int, default=2048)
+    args = parser.parse_args()
+
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=args.bitness)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(private_key=private_key_pem, public_key=public_key_pem)
+    payloads = [{"sub": "user", "n": i} for i in range(args.tokens)]
+    print(f"CPUs available: {os.cpu_count()}")
+
+    started = time.perf_counter()
+    for payload in payloads[:50]:
+        jwt.encode(payload, key=private_key_pem, algorithm="RS256")
+    _report("jwt.encode(PEM)", 50, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    algo.encode_many(payloads, chunk_size=args.chunk_size)
+    _report("encode_many()", len(payloads), time.perf_counter() - started)
+
+    for workers in (int(w) for w in args.workers.split(",")):
+        for name, processes in (("threads", False), ("processes", True)):
+            with issuers.TokenIssuer(
+                algo,
+                max_workers=workers,
+                chunk_size=args.chunk_size,
+                processes=processes,
+            ) as issuer:
+                started = time.perf_counter()
+                issuer.encode_many(payloads)
+                elapsed = time.perf_counter() - started
+            _report(f"TokenIssuer {workers} {name}", len(payloads), elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Overhead of the per phase auth timers of the middleware.
+
+Usage: python benchmarks/bench_timings.py [--number N]
+"""
+
+import argparse
+import time
+import timeit
+from unittest import mock
+
+import webob
+
+from gcl_iam import algorithms
+from gcl_iam import drivers
+from gcl_iam import middlewares
+from gcl_iam import timings
+
+HS256_KEY = "a-secret-key-that-is-at-least-32-bytes"
+
+
+def _report(name: str, number: int, seconds: float) -> None:
+    print(f"{name:<44} {seconds / number * 1e6:10.3f} us/op")
+
+
+def _best(case, number: int) -> float:
+    # The differences are small, take the least disturbed run
+    return min(timeit.repeat(case, number=number, repeat=5))
+
+
+class _NullSink(timings.StatsSink):
+    def record(self, phase, seconds):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    driver = drivers.DummyDriver()
+    driver.algorithm_keys = {"client-1": drivers.HS256AlgorithmKeys(key=HS256_KEY)}
+    token = algorithms.HS256(key=HS256_KEY).encode(
+        {"aud": "client-1", "exp": int(time.time()) + 3600}
+    )
+    ctx = mock.MagicMock()
+    app = webob.Response("ok")
+
+    def request(middleware):
+        req = webob.Request.blank(
+            "/v1/vms", headers={"Authorization": f"Bearer {token}"}
+        )
+        return middleware._get_response(ctx, req)
+
+    configs = {
+        "timers off": {},
+        "timers on, stats sink": {"timing_sink": _NullSink()},
+        "timers on, Server-Timing header": {"server_timing": True},
+    }
+    for name, kwargs in configs.items():
+        middleware = middlewares.GenesisCoreAuthMiddleware(
+            application=app, iam_engine_driver=driver, **kwargs
+        )
+        _report(
+            f"request: {name}",
+            args.number,
+            _best(lambda: request(middleware), args.number),
+        )
+
+    timer = timings.PhaseTimer()
+    cases = {
+        "start/stop: NULL_TIMER": lambda: timings.NULL_TIMER.stop(
+            "verify", timings.NULL_TIMER.start()
+        ),
+        "start/stop: PhaseTimer": lambda: timer.stop("verify", timer.start()),
+    }
+    for name, case in cases.items():
+        number = args.number * 10
+        _report(name, number, _best(case, number))
+        timer.phases.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,24 +17,57 @@
 import abc
 import base64
 import binascii
+import dataclasses
+import functools
+import hashlib
+import hmac
+import json
 import logging
 import os
+import time
 import typing as tp
+from concurrent import futures
 
+from cryptography import exceptions as crypto_exceptions
+from cryptography.hazmat.primitives import hashes as crypto_hashes
+from cryptography.hazmat.primitives.asymmetric import ec as crypto_ec
+from cryptography.hazmat.primitives.asymmetric import ed25519 as crypto_ed25519
+from cryptography.hazmat.primitives.asymmetric import padding as crypto_padding
 from cryptography.hazmat.primitives.asymmetric import rsa as crypto_rsa
+from cryptography.hazmat.primitives.asymmetric import utils as crypto_utils
 from cryptography.hazmat.primitives.ciphers import aead
 from cryptography.hazmat.primitives import (
     serialization as crypto_serialization,
 )
 import jwt
 
+import gcl_iam.caches as caches
 import gcl_iam.constants as c
 import gcl_iam.exceptions as exc
+import gcl_iam.tokens as tokens
+import gcl_iam.tracing as tracing
 
 LOG = logging.getLogger(__name__)
 
 ALGORITHM_HS256 = c.ALGORITHM_HS256
 ALGORITHM_RS256 = c.ALGORITHM_RS256
+ALGORITHM_ES256 = c.ALGORITHM_ES256
+ALGORITHM_EDDSA = c.ALGORITHM_EDDSA
+
+RSAPublicKeyType = tp.Union[str, crypto_rsa.RSAPublicKey]
+RSAPrivateKeyType = tp.Union[str, crypto_rsa.RSAPrivateKey]
+
+_ASYMMETRIC_KEY_TYPES = (
+    crypto_rsa.RSAPublicKey,
+    crypto_rsa.RSAPrivateKey,
+    crypto_ec.EllipticCurvePublicKey,
+    crypto_ec.EllipticCurvePrivateKey,
+    crypto_ed25519.Ed25519PublicKey,
+    crypto_ed25519.Ed25519PrivateKey,
+)
+
+# Size in bytes of P-256 coordinates and of ES256 signature halves
+_P256_SIZE = 32
 
 
 def _prepare_a256gcm_key(key: tp.Union[str, bytes], key_name: str) -> bytes:
@@ -98,22 +131,137 @@ def _to_base64url_uint(value: int) -> str:
     return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
 
 
+def _to_base64url(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+_THUMBPRINT_MEMBERS = {
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+    "RSA": ("e", "kty", "n"),
+    "oct": ("k", "kty"),
+}
+
+
+def jwk_thumbprint(jwk: tp.Dict[str, tp.Any]) -> str:
+    """Return RFC 7638 JWK SHA-256 thumbprint, suitable as `kid`."""
+    try:
+        members = _THUMBPRINT_MEMBERS[jwk["kty"]]
+    except KeyError:
+        raise ValueError(f"Unsupported key type: {jwk.get('kty')!r}")
+    canonical = json.dumps(
+        {name: jwk[name] for name in members},
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return _to_base64url(hashlib.sha256(canonical.encode("utf-8")).digest())
+
+
+def hs256_key_id(key: str) -> str:
+    return jwk_thumbprint({"kty": "oct", "k": _to_base64url(key.encode("utf-8"))})
+
+
+def _check_key_curve(key: tp.Any) -> tp.Any:
+    # ES256 is defined for P-256 only
+    if isinstance(
+        key, (crypto_ec.EllipticCurvePublicKey, crypto_ec.EllipticCurvePrivateKey)
+    ) and not isinstance(key.curve, crypto_ec.SECP256R1):
+        raise ValueError(f"Unsupported elliptic curve: {key.curve.name}")
+    return key
+
+
+def _load_public_key(public_key: tp.Any, key_type: tp.Type[tp.Any]) -> tp.Any:
+    if isinstance(public_key, key_type):
+        return _check_key_curve(public_key)
+    loaded_key = crypto_serialization.load_pem_public_key(public_key.encode("utf-8"))
+    if not isinstance(loaded_key, key_type):
+        raise ValueError("Unsupported public key type")
+    return _check_key_curve(loaded_key)
+
+
+def _load_rsa_public_key(
+    public_key: tp.Union[str, crypto_rsa.RSAPublicKey],
+) -> crypto_rsa.RSAPublicKey:
+    return _load_public_key(public_key, crypto_rsa.RSAPublicKey)
+
+
+def _public_key_to_jwk(public_key: tp.Any) -> dict:
+    jwk: tp.Dict[str, tp.Any]
+    if isinstance(public_key, crypto_rsa.RSAPublicKey):
+        public_numbers = public_key.public_numbers()
+        jwk = {
+            "kty": "RSA",
+            "use": "sig",
+            "alg": ALGORITHM_RS256,
+            "n": _to_base64url_uint(public_numbers.n),
+            "e": _to_base64url_uint(public_numbers.e),
+        }
+    elif isinstance(public_key, crypto_ec.EllipticCurvePublicKey):
+        _check_key_curve(public_key)
+        public_numbers = public_key.public_numbers()
+        jwk = {
+            "kty": "EC",
+            "use": "sig",
+            "alg": ALGORITHM_ES256,
+            "crv": "P-256",
+            "x": _to_base64url(public_numbers.x.to_bytes(_P256_SIZE, "big")),
+            "y": _to_base64url(public_numbers.y.to_bytes(_P256_SIZE, "big")),
+        }
+    elif isinstance(public_key, crypto_ed25519.Ed25519PublicKey):
+        raw = public_key.public_bytes(
+            encoding=crypto_serialization.Encoding.Raw,
+            format=crypto_serialization.PublicFormat.Raw,
+        )
+        jwk = {
+            "kty": "OKP",
+            "use": "sig",
+            "alg": ALGORITHM_EDDSA,
+            "crv": "Ed25519",
+            "x": _to_base64url(raw),
+        }
+    else:
+        raise ValueError("Unsupported public key type")
+    jwk["kid"] = jwk_thumbprint(jwk)
+    return jwk
+
+
+def public_key_id(public_key: tp.Any) -> str:
+    """Return the JWK thumbprint of an RSA, P-256 or Ed25519 public key."""
+    if isinstance(public_key, str):
+        public_key = crypto_serialization.load_pem_public_key(
+            public_key.encode("utf-8")
+        )
+    return _public_key_to_jwk(public_key)["kid"]
+
+
+def rsa_public_key_id(
+    public_key: tp.Union[str, crypto_rsa.RSAPublicKey],
+) -> str:
+    return _public_key_to_jwk(_load_rsa_public_key(public_key))["kid"]
+
+
 def public_pem_to_jwk(public_key_pem: str) -> dict:
     public_key = crypto_serialization.load_pem_public_key(
         public_key_pem.encode("utf-8")
     )
-    if not isinstance(public_key, crypto_rsa.RSAPublicKey):
-        raise ValueError("Unsupported public key type")
+    return _public_key_to_jwk(public_key)
+
+
+def _private_key_to_pem(private_key: tp.Any) -> str:
+    private_key_pem = private_key.private_bytes(
+        encoding=crypto_serialization.Encoding.PEM,
+        format=crypto_serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=crypto_serialization.NoEncryption(),
+    )
+    return private_key_pem.decode("utf-8")
 
-    public_numbers = public_key.public_numbers()
-    jwk: tp.Dict[str, tp.Any] = {
-        "kty": "RSA",
-        "use": "sig",
-        "alg": ALGORITHM_RS256,
-        "n": _to_base64url_uint(public_numbers.n),
-        "e": _to_base64url_uint(public_numbers.e),
-    }
-    return jwk
+
+def generate_es256_private_key_pem() -> str:
+    return _private_key_to_pem(crypto_ec.generate_private_key(crypto_ec.SECP256R1()))
+
+
+def generate_eddsa_private_key_pem() -> str:
+    return _private_key_to_pem(crypto_ed25519.Ed25519PrivateKey.generate())
 
 
 def generate_rsa_private_key_pem(
@@ -128,22 +276,38 @@ def generate_rsa_private_key_pem(
         public_exponent=public_exponent,
         key_size=bitness,
     )
-    private_key_pem = private_key.private_bytes(
-        encoding=crypto_serialization.Encoding.PEM,
-        format=crypto_serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=crypto_serialization.NoEncryption(),
+    return _private_key_to_pem(private_key)
+
+
+def _load_private_key(private_key: tp.Any, key_type: tp.Type[tp.Any]) -> tp.Any:
+    if isinstance(private_key, key_type):
+        return _check_key_curve(private_key)
+    loaded_key = crypto_serialization.load_pem_private_key(
+        private_key.encode("utf-8"),
+        password=None,
     )
-    return private_key_pem.decode("utf-8")
+    if not isinstance(loaded_key, key_type):
+        raise ValueError("Unsupported private key type")
+    return _check_key_curve(loaded_key)
+
+
+def _load_rsa_private_key(
+    private_key_pem: tp.Union[str, crypto_rsa.RSAPrivateKey],
+) -> crypto_rsa.RSAPrivateKey:
+    return _load_private_key(private_key_pem, crypto_rsa.RSAPrivateKey)
 
 
-def _load_rsa_private_key(private_key_pem: str) -> crypto_rsa.RSAPrivateKey:
+def generate_public_key_pem(private_key_pem: str) -> str:
+    """Return the public key PEM of an RSA, P-256 or Ed25519 private key."""
     private_key = crypto_serialization.load_pem_private_key(
         private_key_pem.encode("utf-8"),
         password=None,
     )
-    if not isinstance(private_key, crypto_rsa.RSAPrivateKey):
-        raise ValueError("Unsupported private key type")
-    return private_key
+    public_key_pem = private_key.public_key().public_bytes(
+        encoding=crypto_serialization.Encoding.PEM,
+        format=crypto_serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return public_key_pem.decode("utf-8")
 
 
 def generate_rsa_public_key_pem(private_key_pem: str) -> str:
@@ -163,6 +327,268 @@ def get_rsa_bitness_from_private_key_pem(private_key_pem: str) -> int:
     return int(private_key.key_size)
 
 
+class _PickledKey(tp.NamedTuple):
+    der: bytes
+    private: bool
+
+
+def _pickle_key(key: tp.Any) -> tp.Any:
+    # `cryptography` key objects are not picklable, pass them around as DER
+    if not isinstance(key, _ASYMMETRIC_KEY_TYPES):
+        return key
+    if hasattr(key, "private_bytes"):
+        return _PickledKey(
+            key.private_bytes(
+                encoding=crypto_serialization.Encoding.DER,
+                format=crypto_serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=crypto_serialization.NoEncryption(),
+            ),
+            True,
+        )
+    return _PickledKey(
+        key.public_bytes(
+            encoding=crypto_serialization.Encoding.DER,
+            format=crypto_serialization.PublicFormat.SubjectPublicKeyInfo,
+        ),
+        False,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _load_der_key(der: bytes, private: bool) -> tp.Any:
+    # Workers of a process pool get the same keys with every chunk, loading
+    # a private RSA key costs milliseconds.
+    if private:
+        return crypto_serialization.load_der_private_key(der, password=None)
+    return crypto_serialization.load_der_public_key(der)
+
+
+def _unpickle_key(key: tp.Any) -> tp.Any:
+    if not isinstance(key, _PickledKey):
+        return key
+    return _load_der_key(key.der, key.private)
+
+
+def _map_keys(
+    state: tp.Dict[str, tp.Any],
+    func: tp.Callable[[tp.Any], tp.Any],
+) -> tp.Dict[str, tp.Any]:
+    # The same key object is referenced from several attributes and by
+    # several kids, keep it a single object on both sides.
+    memo: tp.Dict[int, tp.Any] = {}
+
+    def convert(value: tp.Any) -> tp.Any:
+        if value is None or isinstance(value, (str, bytes, bool, int)):
+            return value
+        if id(value) not in memo:
+            memo[id(value)] = func(value)
+        return memo[id(value)]
+
+    return {
+        name: (
+            {k: convert(v) for k, v in value.items()}
+            if isinstance(value, dict)
+            else convert(value)
+        )
+        for name, value in state.items()
+    }
+
+
+@dataclasses.dataclass(frozen=True)
+class DecodeResult:
+    """Outcome of a single token verification in `decode_many`."""
+
+    token_info: tp.Optional[tp.Dict[str, tp.Any]] = None
+    error: tp.Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _WorkerAlgorithm(tp.NamedTuple):
+    # Reference to an algorithm a worker of `AlgorithmProcessPool` got at
+    # start, sent instead of the keys themselves.
+    key_set_id: str
+    algorithm_class: type
+
+
+_WORKER_ALGORITHMS: tp.Dict[_WorkerAlgorithm, "BaseJwtAlgorithm"] = {}
+
+
+def _init_worker(algorithms: tp.Sequence["BaseJwtAlgorithm"]) -> None:
+    for algorithm in algorithms:
+        _WORKER_ALGORITHMS[algorithm._worker_ref] = algorithm
+
+
+def _run_in_worker(
+    algorithm: tp.Union["BaseJwtAlgorithm", _WorkerAlgorithm],
+    method: str,
+    *args: tp.Any,
+) -> tp.Any:
+    if isinstance(algorithm, _WorkerAlgorithm):
+        algorithm = _WORKER_ALGORITHMS[algorithm]
+    return getattr(algorithm, method)(*args)
+
+
+class AlgorithmProcessPool(futures.ProcessPoolExecutor):
+    """Process pool whose workers receive their algorithms once, at start.
+
+    `decode_many` and `encode_many` of these algorithms then send only the
+    tokens or payloads to the workers. The keys of every algorithm given
+    here, private keys and HMAC secrets included, are pickled to each
+    worker process, pass `verify_only()` algorithms to a pool that only
+    verifies.
+    """
+
+    def __init__(
+        self,
+        *algorithms: "BaseJwtAlgorithm",
+        max_workers: tp.Optional[int] = None,
+    ):
+        super().__init__(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(algorithms,),
+        )
+        self._worker_refs = frozenset(a._worker_ref for a in algorithms)
+
+    def holds(self, algorithm: "BaseJwtAlgorithm") -> bool:
+        return algorithm._worker_ref in self._worker_refs
+
+
+def _signature_error() -> jwt.exceptions.InvalidSignatureError:
+    # Cause of the error raised when no key verifies a signature
+    return jwt.exceptions.InvalidSignatureError("Signature verification failed")
+
+
+# Claims of already parsed tokens are checked with `PyJWT._validate_claims`,
+# PyJWT has no public API for that. It is private, so the PyJWT versions in
+# pyproject.toml are capped to the ones it is known to work with.
+_CLAIMS_VALIDATORS: tp.Dict[tp.Tuple[tp.Tuple[str, bool], ...], jwt.PyJWT] = {}
+
+
+def _get_claims_validator(options: tp.Dict[str, bool]) -> jwt.PyJWT:
+    key = tuple(sorted(options.items()))
+    validator = _CLAIMS_VALIDATORS.get(key)
+    if validator is None:
+        full_options: tp.Dict[str, tp.Any] = dict(options)
+        # Same defaults as `jwt.decode` applies when the signature is not
+        # verified, the PyJWT constructor does not do that on older versions.
+        if not options.get("verify_signature", True):
+            for claim in ("nbf", "iat", "iss", "sub", "jti"):
+                full_options.setdefault(f"verify_{claim}", False)
+        validator = _CLAIMS_VALIDATORS[key] = jwt.PyJWT(options=full_options)
+    return validator
+
+
+def _validate_claims_lean(
+    token_info: tp.Dict[str, tp.Any],
+    options: tp.Dict[str, bool],
+    audience: tp.Optional[str],
+) -> bool:
+    """Validate the claims of a typical auth token without PyJWT.
+
+    Checks are done in the same order and with the same outcome as in
+    PyJWT. Returns False when the claims are unusual (floats, `nbf`, a list
+    audience and so on) and the full PyJWT validation must decide.
+    """
+    now = time.time()
+    # PyJWT verifies registered claims only together with the signature
+    if options["verify_signature"]:
+        if "iat" in token_info:
+            iat = token_info["iat"]
+            if type(iat) is not int or iat > now:
+                return False
+        if "nbf" in token_info:
+            return False
+        for claim in ("sub", "jti"):
+            if claim in token_info and not isinstance(token_info[claim], str):
+                return False
+
+    if options["verify_exp"] and "exp" in token_info:
+        exp = token_info["exp"]
+        if type(exp) is not int:
+            return False
+        if exp <= now:
+            raise jwt.exceptions.ExpiredSignatureError("Signature has expired")
+
+    if options["verify_aud"]:
+        aud = token_info.get("aud")
+        if audience is None:
+            if aud:
+                raise jwt.exceptions.InvalidAudienceError("Invalid audience")
+        elif not isinstance(aud, str) or aud != audience:
+            return False
+
+    return True
+
+
+class _HS256Verifier:
+    def __init__(self, key: bytes):
+        super().__init__()
+        self._mac = hmac.new(key, digestmod=hashlib.sha256)
+
+    def verify(self, signing_input: memoryview, signature: bytes) -> bool:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return hmac.compare_digest(mac.digest(), signature)
+
+
+class _RS256Verifier:
+    def __init__(self, public_key: crypto_rsa.RSAPublicKey):
+        super().__init__()
+        self._public_key = public_key
+        self._padding = crypto_padding.PKCS1v15()
+        self._hash = crypto_hashes.SHA256()
+
+    def verify(self, signing_input: memoryview, signature: bytes) -> bool:
+        try:
+            self._public_key.verify(
+                signature,
+                signing_input,
+                self._padding,
+                self._hash,
+            )
+        except crypto_exceptions.InvalidSignature:
+            return False
+        return True
+
+
+class _ES256Verifier:
+    def __init__(self, public_key: crypto_ec.EllipticCurvePublicKey):
+        super().__init__()
+        self._public_key = public_key
+        self._algorithm = crypto_ec.ECDSA(crypto_hashes.SHA256())
+
+    def verify(self, signing_input: memoryview, signature: bytes) -> bool:
+        # JWS carries raw r || s, cryptography wants DER
+        if len(signature) != 2 * _P256_SIZE:
+            return False
+        der_signature = crypto_utils.encode_dss_signature(
+            int.from_bytes(signature[:_P256_SIZE], "big"),
+            int.from_bytes(signature[_P256_SIZE:], "big"),
+        )
+        try:
+            self._public_key.verify(der_signature, signing_input, self._algorithm)
+        except crypto_exceptions.InvalidSignature:
+            return False
+        return True
+
+
+class _EdDSAVerifier:
+    def __init__(self, public_key: crypto_ed25519.Ed25519PublicKey):
+        super().__init__()
+        self._public_key = public_key
+
+    def verify(self, signing_input: memoryview, signature: bytes) -> bool:
+        try:
+            self._public_key.verify(signature, signing_input)
+        except crypto_exceptions.InvalidSignature:
+            return False
+        return True
+
+
 class AbstractAlgorithm(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def decode(self, data: str) -> tp.Dict[str, tp.Any]:
@@ -174,6 +600,23 @@ class AbstractAlgorithm(metaclass=abc.ABCMeta):
 
 
 class BaseJwtAlgorithm(AbstractAlgorithm):
+    def __init__(
+        self,
+        verified_cache: tp.Optional[caches.TTLCache] = None,
+        lean_verify: bool = False,
+    ):
+        super().__init__()
+        # Check signatures and claims directly instead of going through
+        # PyJWT, see `_decode_lean`.
+        self._lean_verify = lean_verify
+        self._lean_verifiers: tp.Dict[int, tp.Any] = {}
+        # Successful verifications keyed by key set and token digest, the
+        # cache may be shared by several algorithm instances.
+        self._verified_cache = verified_cache
+        self._key_set_id: tp.Optional[str] = None
+        self._jwt_algorithm: tp.Optional[jwt.algorithms.Algorithm] = None
+        self._prepared_keys: tp.Dict[int, tp.Any] = {}
+
     @property
     @abc.abstractmethod
     def algorithm(self) -> str:
@@ -181,9 +624,72 @@ class BaseJwtAlgorithm(AbstractAlgorithm):
 
     @property
     @abc.abstractmethod
-    def candidate_keys(self) -> tp.Iterable[tp.Optional[str]]:
+    def keys_by_kid(self) -> tp.Mapping[str, tp.Any]:
         raise NotImplementedError("Not implemented")
 
+    @property
+    def key_ids(self) -> tp.AbstractSet[str]:
+        return self.keys_by_kid.keys()
+
+    def _make_lean_verifier(self, key: tp.Any) -> tp.Any:
+        raise NotImplementedError("Lean verification is not supported")
+
+    @property
+    def key_set_id(self) -> str:
+        """Identifier of the set of keys this algorithm verifies with."""
+        if self._key_set_id is None:
+            ids = "\n".join(sorted(self.key_ids))
+            self._key_set_id = hashlib.sha256(ids.encode("utf-8")).hexdigest()
+        return self._key_set_id
+
+    @property
+    def _worker_ref(self) -> _WorkerAlgorithm:
+        return _WorkerAlgorithm(self.key_set_id, type(self))
+
+    def verify_only(self) -> "BaseJwtAlgorithm":
+        """Return an algorithm with only the keys needed to verify tokens.
+
+        HMAC verifies with the signing secret itself, so this is the
+        algorithm as is unless it holds a private key.
+        """
+        return self
+
+    def _executor_target(
+        self,
+        executor: futures.Executor,
+        verify: bool = False,
+    ) -> tp.Union["BaseJwtAlgorithm", _WorkerAlgorithm]:
+        # Threads share the algorithm, workers of an `AlgorithmProcessPool`
+        # already have it, anything else gets it pickled with every task.
+        if isinstance(executor, futures.ThreadPoolExecutor):
+            return self
+        candidates = (self, self.verify_only()) if verify else (self,)
+        if isinstance(executor, AlgorithmProcessPool):
+            for candidate in candidates:
+                if executor.holds(candidate):
+                    return candidate._worker_ref
+        return candidates[-1]
+
+    @property
+    def candidate_keys(self) -> tp.Iterable[tp.Optional[str]]:
+        # Every key is indexed by its thumbprint and possibly by an extra
+        # advertised kid, so deduplicate keeping the order.
+        return tuple({id(k): k for k in self.keys_by_kid.values()}.values())
+
+    @staticmethod
+    def _index_keys(
+        current: tp.Tuple[str, tp.Any, tp.Optional[str]],
+        others: tp.Iterable[tp.Tuple[str, tp.Any, tp.Optional[str]]],
+    ) -> tp.Dict[str, tp.Any]:
+        keys: tp.Dict[str, tp.Any] = {}
+        for thumbprint, key, kid in (current, *others):
+            if key is None:
+                continue
+            keys.setdefault(thumbprint, key)
+            if kid is not None:
+                keys.setdefault(kid, key)
+        return keys
+
     def _jwt_decode_options(
         self,
         verify: bool,
@@ -196,6 +702,30 @@ class BaseJwtAlgorithm(AbstractAlgorithm):
             "verify_aud": not ignore_audience,
         }
 
+    def _select_keys(
+        self,
+        data: tp.Union[str, tokens.ParsedToken],
+    ) -> tp.Iterable[tp.Any]:
+        try:
+            if isinstance(data, tokens.ParsedToken):
+                kid = data.header.get("kid")
+            else:
+                kid = jwt.get_unverified_header(data).get("kid")
+        except jwt.exceptions.DecodeError as e:
+            LOG.debug("Invalid token by reason: %s", e)
+            raise exc.CredentialsAreInvalidError() from e
+
+        # Tokens issued without `kid` are checked against every key
+        if kid is None:
+            return self.candidate_keys
+        if not isinstance(kid, str):
+            raise exc.CredentialsAreInvalidError()
+
+        try:
+            return (self.keys_by_kid[kid],)
+        except KeyError:
+            raise exc.UnknownKeyIdError(kid=kid)
+
     def _decode_with_fallback_keys(
         self,
         data: str,
@@ -204,6 +734,7 @@ class BaseJwtAlgorithm(AbstractAlgorithm):
         options: tp.Dict[str, bool],
         audience: tp.Optional[str],
     ) -> tp.Dict[str, tp.Any]:
+        error = None
         for key in keys:
             if key is None:
                 continue
@@ -216,88 +747,565 @@ class BaseJwtAlgorithm(AbstractAlgorithm):
                     audience=audience,
                 )
             except jwt.exceptions.DecodeError as e:
-                LOG.warning("Invalid token by reason: %s", e)
+                LOG.debug("Invalid token by reason: %s", e)
+                error = e
+        raise exc.CredentialsAreInvalidError() from error
+
+    def _prepare_key(self, key: tp.Any) -> tp.Any:
+        prepared_key = self._prepared_keys.get(id(key))
+        if prepared_key is None:
+            prepared_key = self._prepared_keys[id(key)] = (
+                self._jwt_algorithm.prepare_key(key)
+            )
+        return prepared_key
+
+    def _verify_parsed_signature(
+        self,
+        parsed: tokens.ParsedToken,
+        keys: tp.Iterable[tp.Optional[str]],
+        algorithm: str,
+    ) -> None:
+        alg = parsed.header.get("alg")
+        if not alg:
+            raise jwt.exceptions.InvalidAlgorithmError("Algorithm not specified")
+        if alg != algorithm:
+            raise jwt.exceptions.InvalidAlgorithmError(
+                "The specified alg value is not allowed"
+            )
+        if self._jwt_algorithm is None:
+            self._jwt_algorithm = jwt.get_algorithm_by_name(algorithm)
+
+        for key in keys:
+            if key is None:
                 continue
-        raise exc.CredentialsAreInvalidError()
+            if self._jwt_algorithm.verify(
+                parsed.signing_input,
+                self._prepare_key(key),
+                parsed.signature,
+            ):
+                return
+            LOG.debug("Invalid token by reason: Signature verification failed")
+        raise exc.CredentialsAreInvalidError() from _signature_error()
+
+    def _decode_parsed_with_fallback_keys(
+        self,
+        parsed: tokens.ParsedToken,
+        keys: tp.Iterable[tp.Optional[str]],
+        algorithm: str,
+        options: tp.Dict[str, bool],
+        audience: tp.Optional[str],
+    ) -> tp.Dict[str, tp.Any]:
+        """Same as `_decode_with_fallback_keys` for an already parsed token."""
+        if options["verify_signature"]:
+            self._verify_parsed_signature(parsed, keys, algorithm)
+
+        token_info = dict(parsed.payload)
+        validator = _get_claims_validator(options)
+        try:
+            # NOTE: PyJWT has no public API to validate already decoded
+            # claims, so use its own validation to keep the same semantics.
+            validator._validate_claims(
+                token_info,
+                validator.options,
+                audience=audience,
+            )
+        except jwt.exceptions.DecodeError as e:
+            LOG.debug("Invalid token by reason: %s", e)
+            raise exc.CredentialsAreInvalidError() from e
+        return token_info
+
+    def _decode_lean(
+        self,
+        parsed: tokens.ParsedToken,
+        keys: tp.Iterable[tp.Optional[str]],
+        algorithm: str,
+        options: tp.Dict[str, bool],
+        audience: tp.Optional[str],
+    ) -> tp.Dict[str, tp.Any]:
+        """Same as `_decode_parsed_with_fallback_keys` but bypasses PyJWT.
+
+        The signature is checked by a verifier prepared once per key, only
+        claims of a typical auth token are validated here, anything else is
+        delegated to PyJWT.
+        """
+        if options["verify_signature"]:
+            alg = parsed.header.get("alg")
+            if not alg:
+                raise jwt.exceptions.InvalidAlgorithmError("Algorithm not specified")
+            if alg != algorithm:
+                raise jwt.exceptions.InvalidAlgorithmError(
+                    "The specified alg value is not allowed"
+                )
+            for key in keys:
+                if key is None:
+                    continue
+                verifier = self._lean_verifiers.get(id(key))
+                if verifier is None:
+                    verifier = self._lean_verifiers[id(key)] = self._make_lean_verifier(
+                        key
+                    )
+                if verifier.verify(parsed.signing_input, parsed.signature):
+                    break
+                LOG.debug("Invalid token by reason: Signature verification failed")
+            else:
+                raise exc.CredentialsAreInvalidError() from _signature_error()
+
+        token_info = dict(parsed.payload)
+        if _validate_claims_lean(token_info, options, audience):
+            return token_info
+
+        validator = _get_claims_validator(options)
+        try:
+            validator._validate_claims(
+                token_info,
+                validator.options,
+                audience=audience,
+            )
+        except jwt.exceptions.DecodeError as e:
+            LOG.debug("Invalid token by reason: %s", e)
+            raise exc.CredentialsAreInvalidError() from e
+        return token_info
+
+    def _cache_verified(
+        self,
+        cache_key: tp.Hashable,
+        token_info: tp.Dict[str, tp.Any],
+    ) -> None:
+        # Tokens without expiration are never cached, otherwise an entry
+        # must not outlive the token.
+        exp = token_info.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        ttl = min(self._verified_cache.ttl_seconds, exp - time.time())
+        self._verified_cache.set(cache_key, dict(token_info), ttl_seconds=ttl)
 
     def decode(
         self,
-        data: str,
+        data: tp.Union[str, tokens.ParsedToken],
         audience: tp.Optional[str] = None,
         ignore_audience: bool = False,
         ignore_expiration: bool = False,
         verify: bool = True,
     ) -> tp.Dict[str, tp.Any]:
+        tracer = tracing.TRACER
+        if not tracer.enabled:
+            return self._decode(
+                data, audience, ignore_audience, ignore_expiration, verify
+            )
+        with tracer.start_span(
+            "gcl_iam.algorithm.decode",
+            {"gcl_iam.algorithm": self.algorithm, "gcl_iam.verify": verify},
+        ):
+            return self._decode(
+                data, audience, ignore_audience, ignore_expiration, verify
+            )
+
+    def _decode(
+        self,
+        data: tp.Union[str, tokens.ParsedToken],
+        audience: tp.Optional[str],
+        ignore_audience: bool,
+        ignore_expiration: bool,
+        verify: bool,
+    ) -> tp.Dict[str, tp.Any]:
+        parsed = data if isinstance(data, tokens.ParsedToken) else None
+
+        cache_key = None
+        if self._verified_cache is not None and verify:
+            raw = data.encode("utf-8") if parsed is None else parsed.raw
+            cache_key = (
+                self.key_set_id,
+                hashlib.sha256(raw).digest(),
+                audience,
+                ignore_audience,
+                ignore_expiration,
+            )
+            token_info = self._verified_cache.get(cache_key)
+            if token_info is not None:
+                return dict(token_info)
+
         options = self._jwt_decode_options(
             verify=verify,
             ignore_audience=ignore_audience,
             ignore_expiration=ignore_expiration,
         )
-        return self._decode_with_fallback_keys(
-            data,
-            keys=self.candidate_keys,
-            algorithm=self.algorithm,
-            options=options,
-            audience=audience,
+        if self._lean_verify:
+            if parsed is None:
+                try:
+                    parsed = tokens.ParsedToken(data)
+                except jwt.exceptions.DecodeError as e:
+                    LOG.debug("Invalid token by reason: %s", e)
+                    raise exc.CredentialsAreInvalidError() from e
+            token_info = self._decode_lean(
+                parsed,
+                keys=self._select_keys(parsed),
+                algorithm=self.algorithm,
+                options=options,
+                audience=audience,
+            )
+        elif parsed is None:
+            token_info = self._decode_with_fallback_keys(
+                data,
+                keys=self._select_keys(data),
+                algorithm=self.algorithm,
+                options=options,
+                audience=audience,
+            )
+        else:
+            token_info = self._decode_parsed_with_fallback_keys(
+                parsed,
+                keys=self._select_keys(parsed),
+                algorithm=self.algorithm,
+                options=options,
+                audience=audience,
+            )
+        if cache_key is not None:
+            self._cache_verified(cache_key, token_info)
+        return token_info
+
+    def _decode_chunk(
+        self,
+        chunk: tp.Sequence[tokens.ParsedToken],
+        decode_kwargs: tp.Dict[str, tp.Any],
+    ) -> tp.List[DecodeResult]:
+        results = []
+        for parsed in chunk:
+            try:
+                results.append(DecodeResult(self.decode(parsed, **decode_kwargs)))
+            except Exception as e:
+                results.append(DecodeResult(error=e))
+        return results
+
+    def decode_many(
+        self,
+        data: tp.Iterable[tp.Union[str, tokens.ParsedToken]],
+        audience: tp.Optional[str] = None,
+        ignore_audience: bool = False,
+        ignore_expiration: bool = False,
+        verify: bool = True,
+        executor: tp.Optional[futures.Executor] = None,
+        chunk_size: int = 64,
+    ) -> tp.List[DecodeResult]:
+        """Verify a batch of tokens, one result per token in input order.
+
+        Failures are returned as results instead of being raised. Tokens
+        are grouped by `kid` and verified in chunks, on `executor` if one is
+        given. Threads pay off for RSA since `cryptography` releases the GIL
+        while verifying. With processes only `verify_only()` keys are sent
+        along with every chunk; an `AlgorithmProcessPool` holding this
+        algorithm gets the keys once per worker and no key material with
+        the chunks, which is the only way to keep HMAC secrets from being
+        pickled over and over.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        decode_kwargs = {
+            "audience": audience,
+            "ignore_audience": ignore_audience,
+            "ignore_expiration": ignore_expiration,
+            "verify": verify,
+        }
+
+        results: tp.List[tp.Optional[DecodeResult]] = []
+        groups: tp.Dict[tp.Optional[str], tp.List[int]] = {}
+        parsed_tokens: tp.List[tp.Optional[tokens.ParsedToken]] = []
+        for i, token in enumerate(data):
+            try:
+                parsed = (
+                    token
+                    if isinstance(token, tokens.ParsedToken)
+                    else tokens.ParsedToken(token)
+                )
+            except jwt.exceptions.DecodeError as e:
+                LOG.debug("Invalid token by reason: %s", e)
+                results.append(DecodeResult(error=exc.CredentialsAreInvalidError()))
+                parsed_tokens.append(None)
+                continue
+            except Exception as e:
+                results.append(DecodeResult(error=e))
+                parsed_tokens.append(None)
+                continue
+            results.append(None)
+            parsed_tokens.append(parsed)
+            groups.setdefault(parsed.header.get("kid"), []).append(i)
+
+        chunks = [
+            indexes[start : start + chunk_size]
+            for indexes in groups.values()
+            for start in range(0, len(indexes), chunk_size)
+        ]
+        if executor is None:
+            chunk_results = (
+                self._decode_chunk([parsed_tokens[i] for i in c], decode_kwargs)
+                for c in chunks
+            )
+        else:
+            target = self._executor_target(executor, verify=True)
+            chunk_results = executor.map(
+                _run_in_worker,
+                [target] * len(chunks),
+                ["_decode_chunk"] * len(chunks),
+                [[parsed_tokens[i] for i in c] for c in chunks],
+                [decode_kwargs] * len(chunks),
+            )
+        for indexes, chunk_result in zip(chunks, chunk_results):
+            for i, result in zip(indexes, chunk_result):
+                results[i] = result
+        return results
+
+    def _encode_chunk(
+        self,
+        chunk: tp.Sequence[tp.Dict[str, tp.Any]],
+    ) -> tp.List[str]:
+        return [self.encode(payload) for payload in chunk]
+
+    def encode_many(
+        self,
+        data: tp.Iterable[tp.Dict[str, tp.Any]],
+        executor: tp.Optional[futures.Executor] = None,
+        chunk_size: int = 64,
+    ) -> tp.List[str]:
+        """Sign a batch of payloads, tokens are returned in input order.
+
+        Chunks are signed on `executor` if one is given. A process pool
+        gets the signing key pickled with every chunk, so the key leaves
+        this process; an `AlgorithmProcessPool` holding this algorithm
+        receives it once per worker instead.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        payloads = list(data)
+        chunks = [
+            payloads[start : start + chunk_size]
+            for start in range(0, len(payloads), chunk_size)
+        ]
+        if executor is None:
+            chunk_results = map(self._encode_chunk, chunks)
+        else:
+            target = self._executor_target(executor)
+            chunk_results = executor.map(
+                _run_in_worker,
+                [target] * len(chunks),
+                ["_encode_chunk"] * len(chunks),
+                chunks,
+            )
+        return [token for chunk in chunk_results for token in chunk]
+
+    def __getstate__(self) -> tp.Dict[str, tp.Any]:
+        # Caches, prepared keys and verifiers are local to the process
+        state = dict(
+            self.__dict__,
+            _verified_cache=None,
+            _lean_verifiers={},
+            _jwt_algorithm=None,
+            _prepared_keys={},
         )
+        return _map_keys(state, _pickle_key)
+
+    def __setstate__(self, state: tp.Dict[str, tp.Any]) -> None:
+        self.__dict__.update(_map_keys(state, _unpickle_key))
 
 
 class HS256(BaseJwtAlgorithm):
-    def __init__(self, key: str, previous_key: tp.Optional[str] = None):
-        super().__init__()
+    def __init__(
+        self,
+        key: str,
+        previous_key: tp.Optional[str] = None,
+        kid: tp.Optional[str] = None,
+        additional_keys: tp.Optional[tp.Mapping[str, str]] = None,
+        verified_cache: tp.Optional[caches.TTLCache] = None,
+        lean_verify: bool = False,
+    ):
+        super().__init__(verified_cache=verified_cache, lean_verify=lean_verify)
         self._key = key
         self._previous_key = previous_key
+        key_id = hs256_key_id(key)
+        self._kid = kid or key_id
+        self._keys = self._index_keys(
+            (key_id, key, kid),
+            (
+                (hs256_key_id(k), k, k_id)
+                for k_id, k in (
+                    (None, previous_key),
+                    *(additional_keys or {}).items(),
+                )
+                if k is not None
+            ),
+        )
 
     @property
     def algorithm(self) -> str:
         return ALGORITHM_HS256
 
+    def _make_lean_verifier(self, key: str) -> _HS256Verifier:
+        # PyJWT refuses asymmetric keys as HMAC secrets, do the same
+        prepared_key = jwt.get_algorithm_by_name(ALGORITHM_HS256).prepare_key(key)
+        return _HS256Verifier(prepared_key)
+
     @property
-    def candidate_keys(self) -> tp.Iterable[tp.Optional[str]]:
-        return (self._key, self._previous_key)
+    def keys_by_kid(self) -> tp.Mapping[str, tp.Any]:
+        return self._keys
 
     def encode(self, data: tp.Dict[str, tp.Any]) -> str:
-        return jwt.encode(data, key=self._key, algorithm=ALGORITHM_HS256)
+        return jwt.encode(
+            data,
+            key=self._key,
+            algorithm=ALGORITHM_HS256,
+            headers={"kid": self._kid},
+        )
+
+
+class BaseAsymmetricVerifyOnly(BaseJwtAlgorithm):
+    """Verification with public keys loaded once at construction.
+
+    Keys may be given as PEM strings or as `cryptography` public key objects.
+    """
 
+    public_key_type: tp.ClassVar[tp.Type[tp.Any]]
 
-class RS256VerifyOnly(BaseJwtAlgorithm):
     def __init__(
         self,
-        public_key: str,
-        previous_public_key: tp.Optional[str] = None,
+        public_key: tp.Any,
+        previous_public_key: tp.Optional[tp.Any] = None,
+        kid: tp.Optional[str] = None,
+        additional_public_keys: tp.Optional[tp.Mapping[str, tp.Any]] = None,
+        verified_cache: tp.Optional[caches.TTLCache] = None,
+        lean_verify: bool = False,
     ):
-        super().__init__()
-        self._public_key = public_key
-        self._previous_public_key = previous_public_key
-
-    @property
-    def algorithm(self) -> str:
-        return ALGORITHM_RS256
+        super().__init__(verified_cache=verified_cache, lean_verify=lean_verify)
+        self._public_key = _load_public_key(public_key, self.public_key_type)
+        self._previous_public_key = (
+            None
+            if previous_public_key is None
+            else _load_public_key(previous_public_key, self.public_key_type)
+        )
+        key_id = public_key_id(self._public_key)
+        self._kid = kid or key_id
+        additional_public_keys = {
+            k_id: _load_public_key(k, self.public_key_type)
+            for k_id, k in (additional_public_keys or {}).items()
+        }
+        self._keys = self._index_keys(
+            (key_id, self._public_key, kid),
+            (
+                (public_key_id(k), k, k_id)
+                for k_id, k in (
+                    (None, self._previous_public_key),
+                    *additional_public_keys.items(),
+                )
+                if k is not None
+            ),
+        )
 
     @property
-    def candidate_keys(self) -> tp.Iterable[tp.Optional[str]]:
-        return (self._public_key, self._previous_public_key)
+    def keys_by_kid(self) -> tp.Mapping[str, tp.Any]:
+        return self._keys
 
     def encode(self, data):
         raise NotImplementedError("Signing is not supported by this algorithm")
 
 
-class RS256(RS256VerifyOnly):
+class BaseAsymmetricAlgorithm(BaseAsymmetricVerifyOnly):
+    """Signing with a private key loaded once at construction."""
+
+    private_key_type: tp.ClassVar[tp.Type[tp.Any]]
+
     def __init__(
         self,
-        private_key: str,
-        public_key: str,
-        previous_public_key: tp.Optional[str] = None,
+        private_key: tp.Any,
+        public_key: tp.Any,
+        previous_public_key: tp.Optional[tp.Any] = None,
+        kid: tp.Optional[str] = None,
+        additional_public_keys: tp.Optional[tp.Mapping[str, tp.Any]] = None,
+        verified_cache: tp.Optional[caches.TTLCache] = None,
+        lean_verify: bool = False,
     ):
         super().__init__(
             public_key=public_key,
             previous_public_key=previous_public_key,
+            kid=kid,
+            additional_public_keys=additional_public_keys,
+            verified_cache=verified_cache,
+            lean_verify=lean_verify,
+        )
+        self._private_key = _load_private_key(private_key, self.private_key_type)
+
+    def verify_only(self) -> BaseAsymmetricVerifyOnly:
+        verify_only_class = next(
+            cls
+            for cls in type(self).__mro__
+            if issubclass(cls, BaseAsymmetricVerifyOnly)
+            and not issubclass(cls, BaseAsymmetricAlgorithm)
+        )
+        verifier = verify_only_class.__new__(verify_only_class)
+        verifier.__dict__.update(
+            self.__dict__,
+            _lean_verifiers={},
+            _jwt_algorithm=None,
+            _prepared_keys={},
         )
-        self._private_key = private_key
+        del verifier.__dict__["_private_key"]
+        return verifier
 
     def encode(self, data: tp.Dict[str, tp.Any]) -> str:
         return jwt.encode(
             data,
             key=self._private_key,
-            algorithm=ALGORITHM_RS256,
+            algorithm=self.algorithm,
+            headers={"kid": self._kid},
         )
+
+
+class RS256VerifyOnly(BaseAsymmetricVerifyOnly):
+    public_key_type = crypto_rsa.RSAPublicKey
+
+    @property
+    def algorithm(self) -> str:
+        return ALGORITHM_RS256
+
+    def _make_lean_verifier(self, key: crypto_rsa.RSAPublicKey) -> _RS256Verifier:
+        return _RS256Verifier(key)
+
+
+class RS256(BaseAsymmetricAlgorithm, RS256VerifyOnly):
+    private_key_type = crypto_rsa.RSAPrivateKey
+
+
+class ES256VerifyOnly(BaseAsymmetricVerifyOnly):
+    """ECDSA on P-256 with SHA-256."""
+
+    public_key_type = crypto_ec.EllipticCurvePublicKey
+
+    @property
+    def algorithm(self) -> str:
+        return ALGORITHM_ES256
+
+    def _make_lean_verifier(
+        self,
+        key: crypto_ec.EllipticCurvePublicKey,
+    ) -> _ES256Verifier:
+        return _ES256Verifier(key)
+
+
+class ES256(BaseAsymmetricAlgorithm, ES256VerifyOnly):
+    private_key_type = crypto_ec.EllipticCurvePrivateKey
+
+
+class EdDSAVerifyOnly(BaseAsymmetricVerifyOnly):
+    """EdDSA with Ed25519 keys."""
+
+    public_key_type = crypto_ed25519.Ed25519PublicKey
+
+    @property
+    def algorithm(self) -> str:
+        return ALGORITHM_EDDSA
+
+    def _make_lean_verifier(
+        self,
+        key: crypto_ed25519.Ed25519PublicKey,
+    ) -> _EdDSAVerifier:
+        return _EdDSAVerifier(key)
+
+
+class EdDSA(BaseAsymmetricAlgorithm, EdDSAVerifyOnly):
+    private_key_type = crypto_ed25519.Ed25519PrivateKey
@@ -30,6 +30,12 @@ class PolicyBasedControllerMixin(object):
     __policy_service_name__ = ""
     __policy_name__ = None
     _otp_mandatory = set()
+    # Rules by action, built on first use and cached per controller class
+    _policy_rules = None
+    # Model property holding the policy resource name of every row. When
+    # set, filter() asks the enforcer which resources may be read and lets
+    # the storage drop the rows of the other ones.
+    __policy_resource_field__ = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -40,16 +46,31 @@ class PolicyBasedControllerMixin(object):
             self._ctx_project_id = uuid.UUID(self._ctx_project_id)
         self._enforcer = contexts.get_context().iam_context.enforcer
 
+    def _get_policy_rule(self, action):
+        cls = type(self)
+        policy_rules = cls.__dict__.get("_policy_rules")
+        if policy_rules is None:
+            policy_rules = cls._policy_rules = {}
+        service = self.__policy_service_name__
+        name = self.__policy_name__ or "default"
+        rule = policy_rules.get(action)
+        # The policy names may be set after the class is created
+        if rule is None or rule.service != service or rule.res != name:
+            rule = policy_rules[action] = rules.Rule(service, name, action)
+        return rule
+
     def _enforce(self, action):
         return self._enforcer.enforce(
-            rules.Rule(
-                self.__policy_service_name__,
-                self.__policy_name__ or "default",
-                action,
-            ),
+            self._get_policy_rule(action),
             do_raise=True,
         )
 
+    def _enforce_many(self, actions):
+        """Return a grant per action without raising on deny."""
+        return self._enforcer.enforce_many(
+            self._get_policy_rule(action) for action in actions
+        )
+
     def _force_project_id(self, project_id):
         if isinstance(project_id, filters.AbstractClause):
             project_id = project_id.value
@@ -64,15 +85,42 @@ class PolicyBasedControllerMixin(object):
 
         self._force_project_id(project_id)
 
-    def _enforce_and_override_project_id_in_kwargs(self, method, kwargs):
-        if self._enforce(method) and not self._ctx_project_id:
-            return
-
+    def _override_project_id_in_kwargs(self, kwargs):
         if "project_id" in kwargs:
             self._force_project_id(kwargs["project_id"])
         else:
             kwargs["project_id"] = types.UUID().from_simple_type(self._ctx_project_id)
 
+    def _enforce_and_override_project_id_in_kwargs(self, method, kwargs):
+        if self._enforce(method) and not self._ctx_project_id:
+            return
+
+        self._override_project_id_in_kwargs(kwargs)
+
+    def _get_policy_filters(self, method, kwargs):
+        """Turn the granted resources and the project scope into filters.
+
+        Returns the filters and the allowed resources if rows still have to
+        be checked one by one (globs have no storage clause), else None.
+        """
+        allowed = self._enforcer.allowed_resources(self.__policy_service_name__, method)
+        if not allowed:
+            raise exceptions.PolicyNotAuthorized(
+                rule=str(self._get_policy_rule(method))
+            )
+
+        kwargs = dict(kwargs)
+        field = self.__policy_resource_field__
+        recheck = None
+        if not allowed.any_resource:
+            if allowed.globs or field in kwargs:
+                recheck = allowed
+            else:
+                kwargs[field] = filters.In(sorted(allowed.names))
+        if self._ctx_project_id:
+            self._override_project_id_in_kwargs(kwargs)
+        return kwargs, recheck
+
     def _check_otp(self, method):
         if self._introspection.get("otp_enabled") or method in self._otp_mandatory:
             if not self._introspection.get("otp_verified"):
@@ -93,8 +141,16 @@ class PolicyBasedController(
         return res
 
     def filter(self, filters, order_by=None):
-        self._enforce_and_override_project_id_in_kwargs("read", filters)
-        return super(PolicyBasedController, self).filter(filters, order_by=order_by)
+        field = self.__policy_resource_field__
+        if field is None:
+            self._enforce_and_override_project_id_in_kwargs("read", filters)
+            return super(PolicyBasedController, self).filter(filters, order_by=order_by)
+
+        filters, allowed = self._get_policy_filters("read", filters)
+        result = super(PolicyBasedController, self).filter(filters, order_by=order_by)
+        if allowed is not None:
+            result = [dm for dm in result if getattr(dm, field) in allowed]
+        return result
 
     def delete(self, uuid):
         filters = {}
@@ -16,10 +16,14 @@
 
 from __future__ import annotations
 
+import threading
+import weakref
+
 from restalchemy.api import constants
 from restalchemy.api import field_permissions as field_p
 from restalchemy.common import contexts
 
+from gcl_iam import enforcers
 from gcl_iam import rules
 
 # Make it easier to use
@@ -78,31 +82,72 @@ class FieldsIamPermissions(field_p.BasePermissions):
                 ) or isinstance(permission, rules.Rule)
         super().__init__(permission=default)
         self.fields = fields
+        # Rule based permissions per enforcer and method, enforcers never
+        # change their decisions and may be shared between requests.
+        self._rule_permissions = weakref.WeakKeyDictionary()
+        self._rule_permissions_lock = threading.Lock()
 
     @property
     def _enforcer(self):
         return contexts.get_context().iam_context.enforcer
 
-    def meets_field_permission(self, model_field_name, req, current_permission):
-
-        method = req.api_context.get_active_method()
+    def _get_permission(self, model_field_name, method):
         field_permission = self.fields.get(model_field_name, {})
 
         # NOTE(g.melikov): By DEFAULT permission is Permissions.RW
-        permission = (
+        return (
             field_permission.get(method)
             or field_permission.get(constants.ALL)
             or self._permission
         )
 
+    def get_rule_permissions(self, method, enforcer=None):
+        """Resolve all rule based field permissions of `method` at once.
+
+        Returns a dict of field name and `Permissions.RW` or
+        `Permissions.HIDDEN`, rules are enforced with one `enforce_many`
+        call.
+        """
+        enforcer = enforcer or self._enforcer
+        # Requests of several threads share this object, the weak dict is
+        # only touched under the lock, the rules are enforced outside of it.
+        with self._rule_permissions_lock:
+            permissions = self._rule_permissions.get(enforcer, {}).get(method)
+        if permissions is None:
+            field_rules = {}
+            for name in self.fields:
+                permission = self._get_permission(name, method)
+                if isinstance(permission, rules.Rule):
+                    field_rules[name] = permission
+            grants = enforcer.enforce_many(field_rules.values())
+            permissions = {
+                name: Permissions.RW if grant else Permissions.HIDDEN
+                for name, grant in zip(field_rules, grants)
+            }
+            with self._rule_permissions_lock:
+                by_method = self._rule_permissions.setdefault(enforcer, {})
+                permissions = by_method.setdefault(method, permissions)
+        return permissions
+
+    def meets_field_permission(self, model_field_name, req, current_permission):
+
+        method = req.api_context.get_active_method()
+        permission = self._get_permission(model_field_name, method)
+
         if isinstance(permission, rules.Rule):
-            permission = (
-                Permissions.RW
-                if self._enforcer.enforce(
-                    permission,
-                    do_raise=False,
+            enforcer = self._enforcer
+            if isinstance(enforcer, enforcers.Enforcer):
+                permission = self.get_rule_permissions(method, enforcer)[
+                    model_field_name
+                ]
+            else:
+                permission = (
+                    Permissions.RW
+                    if enforcer.enforce(
+                        permission,
+                        do_raise=False,
+                    )
+                    else Permissions.HIDDEN
                 )
-                else Permissions.HIDDEN
-            )
 
         return permission <= current_permission
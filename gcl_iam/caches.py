@@ -0,0 +1,135 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import dataclasses
+import threading
+import time
+import typing as tp
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache with a TTL per entry.
+
+    Entries are evicted in least-recently-used order once `maxsize` is
+    reached and are dropped lazily on access once their TTL is over.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl_seconds: float = 300,
+        timer: tp.Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._timer = timer
+        self._data: tp.OrderedDict[tp.Hashable, tp.Tuple[float, tp.Any]] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: tp.Hashable, default: tp.Any = None) -> tp.Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._timer():
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+            self._misses += 1
+            return default
+
+    def set(
+        self,
+        key: tp.Hashable,
+        value: tp.Any,
+        ttl_seconds: tp.Optional[float] = None,
+    ) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = self._ttl_seconds
+        if ttl_seconds <= 0:
+            return
+        expires_at = self._timer() + ttl_seconds
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: tp.Hashable, default: tp.Any = None) -> tp.Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def evict(self, predicate: tp.Callable[[tp.Hashable], bool]) -> int:
+        """Drop every entry whose key matches `predicate`."""
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                del self._data[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            size=len(self._data),
+            maxsize=self._maxsize,
+        )
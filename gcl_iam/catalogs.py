@@ -0,0 +1,186 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import typing as tp
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from gcl_iam import enforcers
+from gcl_iam import rules
+
+RuleType = tp.Union[str, rules.Rule]
+
+# Width of a NumPy bitset word
+_WORD_BITS = 64
+
+
+def _rule_key(
+    rule: tp.Union[RuleType, tp.Tuple[str, str, str]],
+) -> tp.Tuple[str, str, str]:
+    if isinstance(rule, tuple):
+        return rule
+    if isinstance(rule, str):
+        service, res, perm = rule.split(".", maxsplit=2)
+        return service, res, perm
+    return rule.service, rule.res, rule.perm
+
+
+class PermissionCatalog:
+    """Numbers every known `service.resource.action` with a bit index.
+
+    With a catalog a permission set compiles into a bitmask (a Python int),
+    a check becomes a single bit test and many principals can be matched at
+    once by AND-ing their masks, optionally as NumPy bitsets.
+    Catalog rules are concrete, wildcards belong to permissions only.
+    """
+
+    def __init__(self, catalog_rules: tp.Iterable[RuleType] = ()):
+        super().__init__()
+        self._index: tp.Dict[tp.Tuple[str, str, str], int] = {}
+        # (service, res) -> [(perm, bit index), ...]
+        self._resources: tp.Dict[tp.Tuple[str, str], tp.List[tp.Tuple[str, int]]] = {}
+        self._resource_masks: tp.Dict[tp.Tuple[str, str], int] = {}
+        for rule in catalog_rules:
+            self.add(rule)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, rule: RuleType) -> bool:
+        return _rule_key(rule) in self._index
+
+    @property
+    def rules(self) -> tp.Tuple[str, ...]:
+        """Catalog rules ordered by bit index."""
+        return tuple(".".join(key) for key in self._index)
+
+    def add(self, rule: RuleType) -> int:
+        """Register a rule if needed and return its bit index."""
+        key = _rule_key(rule)
+        if any("*" in part for part in key):
+            raise ValueError(f"Catalog rules must not be wildcards: {key}")
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self._index)
+            service, res, perm = key
+            self._resources.setdefault((service, res), []).append((perm, index))
+            self._resource_masks[(service, res)] = self._resource_masks.get(
+                (service, res), 0
+            ) | (1 << index)
+        return index
+
+    def index(self, rule: RuleType) -> tp.Optional[int]:
+        return self._index.get(_rule_key(rule))
+
+    def mask_of(self, catalog_rules: tp.Iterable[RuleType]) -> int:
+        """Bitmask with the bits of the given catalog rules."""
+        mask = 0
+        for rule in catalog_rules:
+            mask |= 1 << self._index[_rule_key(rule)]
+        return mask
+
+    def compile(self, perms: tp.Union[tp.Iterable[str], enforcers.Enforcer]) -> int:
+        """Compile permissions in `Enforcer` format into a bitmask.
+
+        Wildcards and globs are expanded against the catalog with exactly
+        the semantics of `Enforcer`.
+        """
+        if not isinstance(perms, enforcers.CompiledEnforcer):
+            perms = enforcers.CompiledEnforcer(perms)
+
+        mask = 0
+        if perms.has_globs:
+            for (service, res, perm), index in self._index.items():
+                if perms._match_globs(service, res, perm):
+                    mask |= 1 << index
+            return mask
+        for resource, catalog_perms in self._resources.items():
+            granted = perms.granted_perms(*resource)
+            if granted is None:
+                continue
+            if granted is enforcers.CompiledEnforcer.ANY:
+                mask |= self._resource_masks[resource]
+                continue
+            for perm, index in catalog_perms:
+                if perm in granted:
+                    mask |= 1 << index
+        return mask
+
+    def enforce(self, mask: int, rule: RuleType) -> enforcers.Grant:
+        index = self._index.get(_rule_key(rule))
+        if index is not None and mask >> index & 1:
+            return enforcers.Grant.ALLOW
+        return enforcers.Grant.DENY
+
+    def to_bitset(self, masks: tp.Sequence[int]) -> "np.ndarray":
+        """Stack masks into a `(len(masks), words)` uint64 NumPy array."""
+        if np is None:
+            raise ImportError("NumPy bitsets require NumPy to be installed")
+        words = max((len(self._index) + _WORD_BITS - 1) // _WORD_BITS, 1)
+        size = words * _WORD_BITS // 8
+        raw = b"".join(m.to_bytes(size, "little") for m in masks)
+        return np.frombuffer(raw, dtype="<u8").reshape(len(masks), words)
+
+    def who_can(
+        self,
+        masks: tp.Union[tp.Sequence[int], "np.ndarray"],
+        catalog_rules: tp.Iterable[RuleType],
+    ) -> tp.Union[tp.List[bool], "np.ndarray"]:
+        """Tell for every principal whether it holds all the given rules.
+
+        `masks` is a sequence of int masks or a bitset from `to_bitset`, in
+        the latter case the answer is a vectorized NumPy bool array.
+        """
+        required = self.mask_of(catalog_rules)
+        if np is not None and isinstance(masks, np.ndarray):
+            required_words = self.to_bitset([required])[0]
+            # Only words holding required bits matter, usually a single one
+            columns = np.flatnonzero(required_words)
+            result = np.ones(len(masks), dtype=bool)
+            for column in columns:
+                word = required_words[column]
+                result &= (masks[:, column] & word) == word
+            return result
+        return [mask & required == required for mask in masks]
+
+
+class CatalogEnforcer(enforcers.CompiledEnforcer):
+    """Enforcer answering catalog rules with a single bit test.
+
+    Rules missing from the catalog fall back to `CompiledEnforcer`.
+    """
+
+    def __init__(self, perms, catalog, memo_maxsize=4096):
+        super().__init__(perms, memo_maxsize=memo_maxsize)
+        self._catalog = catalog
+        # Rules added to the catalog later are not part of the mask
+        self._mask_bits = len(catalog)
+        self._mask = catalog.compile(self)
+
+    @property
+    def mask(self):
+        return self._mask
+
+    def _decide(self, service, res, perm):
+        index = self._catalog.index((service, res, perm))
+        if index is None or index >= self._mask_bits:
+            return super()._decide(service, res, perm)
+        if self._mask >> index & 1:
+            return enforcers.Grant.ALLOW
+        return enforcers.Grant.DENY
@@ -17,6 +17,8 @@
 # Algorithms
 ALGORITHM_HS256 = "HS256"
 ALGORITHM_RS256 = "RS256"
+ALGORITHM_ES256 = "ES256"
+ALGORITHM_EDDSA = "EdDSA"
 
 
 # Context storage key name
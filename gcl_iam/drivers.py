@@ -17,22 +17,31 @@
 
 import abc
 import base64
+import copy
 import dataclasses
 import functools
+import logging
+import threading
 import time
 import typing as tp
+import weakref
 
 import bazooka
 import bazooka.exceptions
+from cryptography.hazmat.primitives.asymmetric import ec as crypto_ec
+from cryptography.hazmat.primitives.asymmetric import ed25519 as crypto_ed25519
 from cryptography.hazmat.primitives.asymmetric import rsa as crypto_rsa
-from cryptography.hazmat.primitives import (
-    serialization as crypto_serialization,
-)
 from restalchemy.common import utils
 
 from gcl_iam import algorithms
+from gcl_iam import caches
 from gcl_iam import exceptions
+from gcl_iam import jwks
+from gcl_iam import metrics
 from gcl_iam import tokens
+from gcl_iam import tracing
+
+LOG = logging.getLogger(__name__)
 
 
 class AbstractAuthDriver(metaclass=abc.ABCMeta):
@@ -65,25 +74,79 @@ class RS256AlgorithmKeys(AlgorithmKeys):
     previous_public_key: tp.Optional[str] = None
 
 
+@dataclasses.dataclass(frozen=True)
+class ES256AlgorithmKeys(AlgorithmKeys):
+    public_key: str
+    previous_public_key: tp.Optional[str] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class EdDSAAlgorithmKeys(AlgorithmKeys):
+    public_key: str
+    previous_public_key: tp.Optional[str] = None
+
+
+def _base64url_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "===")
+
+
 def _base64url_to_int(value: str) -> int:
-    decoded = base64.urlsafe_b64decode(value + "===")
+    decoded = _base64url_decode(value)
     return int.from_bytes(decoded, byteorder="big")
 
 
-def _rsa_jwk_to_public_key_pem(jwk: tp.Dict[str, tp.Any]) -> str:
-    n = jwk["n"]
-    e = jwk["e"]
-
+def _rsa_jwk_to_public_key(jwk: tp.Dict[str, tp.Any]) -> crypto_rsa.RSAPublicKey:
     public_numbers = crypto_rsa.RSAPublicNumbers(
-        e=_base64url_to_int(e),
-        n=_base64url_to_int(n),
+        e=_base64url_to_int(jwk["e"]),
+        n=_base64url_to_int(jwk["n"]),
+    )
+    return public_numbers.public_key()
+
+
+def _ec_jwk_to_public_key(
+    jwk: tp.Dict[str, tp.Any],
+) -> crypto_ec.EllipticCurvePublicKey:
+    if jwk.get("crv") != "P-256":
+        raise ValueError(f"Unsupported elliptic curve: {jwk.get('crv')!r}")
+    public_numbers = crypto_ec.EllipticCurvePublicNumbers(
+        x=_base64url_to_int(jwk["x"]),
+        y=_base64url_to_int(jwk["y"]),
+        curve=crypto_ec.SECP256R1(),
     )
-    public_key = public_numbers.public_key()
-    public_key_pem = public_key.public_bytes(
-        encoding=crypto_serialization.Encoding.PEM,
-        format=crypto_serialization.PublicFormat.SubjectPublicKeyInfo,
+    return public_numbers.public_key()
+
+
+def _okp_jwk_to_public_key(
+    jwk: tp.Dict[str, tp.Any],
+) -> crypto_ed25519.Ed25519PublicKey:
+    if jwk.get("crv") != "Ed25519":
+        raise ValueError(f"Unsupported OKP curve: {jwk.get('crv')!r}")
+    return crypto_ed25519.Ed25519PublicKey.from_public_bytes(
+        _base64url_decode(jwk["x"])
     )
-    return public_key_pem.decode("utf-8")
+
+
+# algorithm: (JWK key type, required members, JWK loader, algorithm class)
+_ASYMMETRIC_JWKS = {
+    algorithms.ALGORITHM_RS256: (
+        "RSA",
+        ("n", "e"),
+        _rsa_jwk_to_public_key,
+        algorithms.RS256VerifyOnly,
+    ),
+    algorithms.ALGORITHM_ES256: (
+        "EC",
+        ("x", "y"),
+        _ec_jwk_to_public_key,
+        algorithms.ES256VerifyOnly,
+    ),
+    algorithms.ALGORITHM_EDDSA: (
+        "OKP",
+        ("x",),
+        _okp_jwk_to_public_key,
+        algorithms.EdDSAVerifyOnly,
+    ),
+}
 
 
 class DummyDriver(AbstractAuthDriver):
@@ -138,6 +201,18 @@ class DummyDriver(AbstractAuthDriver):
                 previous_public_key=keys.previous_public_key,
             )
 
+        if isinstance(keys, ES256AlgorithmKeys):
+            return algorithms.ES256VerifyOnly(
+                public_key=keys.public_key,
+                previous_public_key=keys.previous_public_key,
+            )
+
+        if isinstance(keys, EdDSAAlgorithmKeys):
+            return algorithms.EdDSAVerifyOnly(
+                public_key=keys.public_key,
+                previous_public_key=keys.previous_public_key,
+            )
+
         raise TypeError(f"Unexpected algorithm keys type: {type(keys)!r}")
 
 
@@ -164,6 +239,45 @@ class AnonDriver(AbstractAuthDriver):
         raise NotImplementedError("AnonDriver does not support token validation.")
 
 
+# Drivers exporting cache metrics, by registry. Each registry has a single
+# collector adding up the caches of all its drivers, so drivers of the same
+# audience never emit duplicate series. Drivers are not kept alive.
+_CACHE_METRICS_DRIVERS: tp.MutableMapping[
+    metrics.MetricsRegistry, "weakref.WeakSet[HttpDriver]"
+] = weakref.WeakKeyDictionary()
+_CACHE_METRICS_LOCK = threading.Lock()
+
+
+def _collect_cache_metrics(drivers: "weakref.WeakSet[HttpDriver]"):
+    totals: tp.Dict[tp.Tuple[str, str], caches.CacheStats] = {}
+    for driver in list(drivers):
+        for labels, stats in driver._cache_stats():
+            total = totals.get(labels)
+            if total is not None:
+                stats = caches.CacheStats(
+                    hits=total.hits + stats.hits,
+                    misses=total.misses + stats.misses,
+                    size=total.size + stats.size,
+                    maxsize=total.maxsize + stats.maxsize,
+                )
+            totals[labels] = stats
+    return metrics.cache_families(("audience", "cache"), totals.items())
+
+
+def _register_cache_metrics(
+    registry: metrics.MetricsRegistry,
+    driver: "HttpDriver",
+) -> None:
+    with _CACHE_METRICS_LOCK:
+        drivers = _CACHE_METRICS_DRIVERS.get(registry)
+        if drivers is None:
+            drivers = _CACHE_METRICS_DRIVERS[registry] = weakref.WeakSet()
+            registry.register_collector(
+                functools.partial(_collect_cache_metrics, drivers)
+            )
+        drivers.add(driver)
+
+
 class HttpDriver(AbstractAuthDriver):
     def __init__(
         self,
@@ -173,6 +287,13 @@ class HttpDriver(AbstractAuthDriver):
         default_timeout=5,
         cache_maxsize: int = 100,
         cache_ttl_seconds: int = 300,
+        introspection_cache_maxsize: int = 1024,
+        introspection_cache_ttl_seconds: int = 0,
+        unknown_kid_refetch_interval_seconds: int = 30,
+        verified_token_cache_maxsize: int = 0,
+        verified_token_cache_ttl_seconds: int = 300,
+        lean_verify: bool = False,
+        metrics_registry: tp.Optional[metrics.MetricsRegistry] = None,
     ):
         super().__init__()
         self._iam_endpoint = utils.lastslash(iam_endpoint)
@@ -180,22 +301,135 @@ class HttpDriver(AbstractAuthDriver):
         self._client = bazooka.Client(default_timeout=default_timeout)
         self._cache_ttl_seconds = cache_ttl_seconds
         self._hs256_jwks_decryption_key = hs256_jwks_decryption_key
+        self._unknown_kid_refetch_interval_seconds = (
+            unknown_kid_refetch_interval_seconds
+        )
+        self._lean_verify = lean_verify
+
+        # NOTE: `cache_maxsize` is kept for backward compatibility only, the
+        # key manager holds exactly one (current) key set.
+        self._jwks = jwks.JwksKeyManager(
+            fetch=self._get_algorithm_uncached,
+            ttl_seconds=cache_ttl_seconds,
+            on_update=self._on_key_set_update,
+        )
+
+        self._verified_token_cache: tp.Optional[caches.TTLCache] = None
+        if verified_token_cache_maxsize > 0:
+            self._verified_token_cache = caches.TTLCache(
+                maxsize=verified_token_cache_maxsize,
+                ttl_seconds=verified_token_cache_ttl_seconds,
+            )
 
-        self._get_algorithm_cached = functools.lru_cache(maxsize=cache_maxsize)(
-            self._get_algorithm_uncached,
+        # Introspection results are cached only when explicitly enabled since
+        # it delays permission changes and revocations up to the TTL.
+        self._introspection_cache: tp.Optional[caches.TTLCache] = None
+        if introspection_cache_ttl_seconds > 0:
+            self._introspection_cache = caches.TTLCache(
+                maxsize=introspection_cache_maxsize,
+                ttl_seconds=introspection_cache_ttl_seconds,
+            )
+
+        # Lookups of the current key set, a miss is a (re)fetch. Counted
+        # without a lock on the hot path, so they are approximate.
+        self._algorithm_hits = 0
+        self._algorithm_misses = 0
+
+        self._metric_labels = (audience,)
+        self._introspection_seconds = None
+        self._jwks_fetch_seconds = None
+        self._errors = None
+        if metrics_registry is not None:
+            self._register_metrics(metrics_registry)
+
+    def _register_metrics(self, registry: metrics.MetricsRegistry) -> None:
+        self._introspection_seconds = registry.histogram(
+            "gcl_iam_introspection_seconds",
+            "Duration of introspection calls to IAM",
+            ("audience",),
+        )
+        self._jwks_fetch_seconds = registry.histogram(
+            "gcl_iam_jwks_fetch_seconds",
+            "Duration of JWKS fetches from IAM",
+            ("audience",),
         )
+        self._errors = registry.counter(
+            "gcl_iam_driver_errors_total",
+            "Errors raised by driver calls",
+            ("audience", "call", "exception"),
+        )
+        _register_cache_metrics(registry, self)
 
-    def get_introspection_info(self, token_info, otp_code=None):
-        audience = token_info.audience_name
-        if audience != self._audience:
-            raise exceptions.TokenAudienceMismatchError(
-                token_audience=audience,
-                service_audience=self._audience,
+    def _cache_stats(self) -> tp.List[tp.Tuple[tp.Tuple[str, str], caches.CacheStats]]:
+        stats = [((self._audience, "algorithm"), self.algorithm_cache_stats)]
+        if self._introspection_cache is not None:
+            stats.append(
+                ((self._audience, "introspection"), self._introspection_cache.stats())
             )
+        if self._verified_token_cache is not None:
+            stats.append(
+                (
+                    (self._audience, "verified_token"),
+                    self._verified_token_cache.stats(),
+                )
+            )
+        return stats
+
+    def _count_error(self, call: str, error: Exception) -> None:
+        if self._errors is not None:
+            self._errors.inc(labels=(self._audience, call, type(error).__name__))
+
+    @property
+    def algorithm_cache_stats(self) -> caches.CacheStats:
+        return caches.CacheStats(
+            hits=self._algorithm_hits,
+            misses=self._algorithm_misses,
+            size=int(self._jwks.is_warm),
+            maxsize=1,
+        )
+
+    @property
+    def verified_token_cache_stats(self) -> tp.Optional[caches.CacheStats]:
+        if self._verified_token_cache is None:
+            return None
+        return self._verified_token_cache.stats()
+
+    @property
+    def introspection_cache_stats(self) -> tp.Optional[caches.CacheStats]:
+        if self._introspection_cache is None:
+            return None
+        return self._introspection_cache.stats()
+
+    def _get_introspection_cache_key(
+        self,
+        token_info,
+        otp_code=None,
+    ) -> tp.Optional[tp.Hashable]:
+        # Only verified tokens have a trustworthy `jti`, anything else
+        # could be forged to reuse somebody else's introspection result.
+        # OTP codes must reach IAM every time, a cached answer would let a
+        # used code be replayed.
+        if (
+            self._introspection_cache is None
+            or otp_code is not None
+            or not isinstance(token_info, tokens.VerifiedToken)
+        ):
+            return None
+        return token_info.token_info.get("jti") or None
+
+    def _get_introspection_cache_ttl(self, token_info) -> float:
+        ttl = self._introspection_cache.ttl_seconds
+        exp = token_info.token_info.get("exp")
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+        return ttl
+
+    def _get_introspection_info_uncached(self, token_info, otp_code=None):
         introspection_url = f"{self._iam_endpoint}actions/introspect"
         headers = {"Authorization": f"Bearer {token_info.token}"}
         if otp_code is not None:
             headers["X-OTP"] = otp_code
+        started = time.perf_counter()
         try:
             return self._client.get(
                 introspection_url,
@@ -203,10 +437,67 @@ class HttpDriver(AbstractAuthDriver):
             ).json()
         except bazooka.exceptions.BadRequestError:
             raise exceptions.InvalidAuthTokenError()
+        finally:
+            if self._introspection_seconds is not None:
+                self._introspection_seconds.observe(
+                    time.perf_counter() - started,
+                    labels=self._metric_labels,
+                )
+
+    def get_introspection_info(self, token_info, otp_code=None):
+        tracer = tracing.TRACER
+        try:
+            if not tracer.enabled:
+                return self._get_introspection_info(token_info, otp_code)
+            with tracer.start_span(
+                "gcl_iam.driver.introspect",
+                {"gcl_iam.audience": self._audience},
+            ):
+                return self._get_introspection_info(token_info, otp_code)
+        except Exception as e:
+            self._count_error("introspect", e)
+            raise
+
+    def _get_introspection_info(self, token_info, otp_code=None):
+        audience = token_info.audience_name
+        if audience != self._audience:
+            raise exceptions.TokenAudienceMismatchError(
+                token_audience=audience,
+                service_audience=self._audience,
+            )
+
+        cache_key = self._get_introspection_cache_key(token_info, otp_code)
+        if cache_key is None:
+            return self._get_introspection_info_uncached(token_info, otp_code)
+
+        info = self._introspection_cache.get(cache_key)
+        if info is None:
+            info = self._get_introspection_info_uncached(token_info, otp_code)
+            if info:
+                self._introspection_cache.set(
+                    cache_key,
+                    copy.deepcopy(info),
+                    ttl_seconds=self._get_introspection_cache_ttl(token_info),
+                )
+            return info
+
+        # Callers are free to modify the result (permissions included), so
+        # never share any part of the entry
+        return copy.deepcopy(info)
 
     def get_algorithm(
         self,
         token_info: tokens.UnverifiedToken,
+    ) -> algorithms.AbstractAlgorithm:
+        try:
+            return self._get_algorithm(token_info)
+        except Exception as e:
+            self._count_error("algorithm", e)
+            raise
+
+    def _get_algorithm(
+        self,
+        token_info: tokens.UnverifiedToken,
     ) -> algorithms.AbstractAlgorithm:
         audience = token_info.audience_name
         if audience != self._audience:
@@ -214,13 +505,60 @@ class HttpDriver(AbstractAuthDriver):
                 token_audience=audience,
                 service_audience=self._audience,
             )
-        time_bucket = int(time.time() // self._cache_ttl_seconds)
-        return self._get_algorithm_cached(time_bucket)
+        warm = self._jwks.is_warm
+        algorithm = self._jwks.get()
+
+        kid = token_info.key_id
+        if not isinstance(kid, str) or kid in algorithm.key_ids:
+            if warm:
+                self._algorithm_hits += 1
+            else:
+                self._algorithm_misses += 1
+            return algorithm
+
+        self._algorithm_misses += 1
+
+        # The token may be signed with a freshly rotated key, so refetch
+        # JWKS, but not more often than once per interval to not let
+        # garbage tokens hammer IAM.
+        try:
+            return self._jwks.refresh(
+                min_age_seconds=self._unknown_kid_refetch_interval_seconds,
+            )
+        except Exception:
+            LOG.exception("Unable to refetch JWKS for unknown key %r:", kid)
+            return algorithm
+
+    def _on_key_set_update(self, algorithm: algorithms.AbstractAlgorithm) -> None:
+        if self._verified_token_cache is None:
+            return
+        # Drop verifications made with superseded key sets
+        key_set_id = algorithm.key_set_id
+        self._verified_token_cache.evict(lambda k: k[0] != key_set_id)
+
+    def _get_algorithm_uncached(self) -> algorithms.AbstractAlgorithm:
+        # Called by the key manager, also for background refreshes
+        tracer = tracing.TRACER
+        started = time.perf_counter()
+        try:
+            if not tracer.enabled:
+                return self._fetch_algorithm()
+            with tracer.start_span(
+                "gcl_iam.driver.fetch_jwks",
+                {"gcl_iam.audience": self._audience},
+            ):
+                return self._fetch_algorithm()
+        except Exception as e:
+            self._count_error("jwks", e)
+            raise
+        finally:
+            if self._jwks_fetch_seconds is not None:
+                self._jwks_fetch_seconds.observe(
+                    time.perf_counter() - started,
+                    labels=self._metric_labels,
+                )
 
-    def _get_algorithm_uncached(
-        self,
-        time_bucket: int,
-    ) -> algorithms.AbstractAlgorithm:
+    def _fetch_algorithm(self) -> algorithms.AbstractAlgorithm:
         jwks_url = f"{self._iam_endpoint}actions/jwks"
 
         payload = self._client.get(
@@ -242,50 +580,53 @@ class HttpDriver(AbstractAuthDriver):
                     "HS256 payload keys list does not contain HS256 oct keys"
                 )
 
-            encrypted_key = hs256_keys[0]["k"]
-            encrypted_previous_key = None
-            if len(hs256_keys) > 1:
-                encrypted_previous_key = hs256_keys[1]["k"]
-
-            key = algorithms.decrypt_hs256_jwks_secret(
-                secret=encrypted_key,
-                decryption_key=self._hs256_jwks_decryption_key,
-            )
-            previous_key = None
-            if encrypted_previous_key is not None:
-                previous_key = algorithms.decrypt_hs256_jwks_secret(
-                    secret=encrypted_previous_key,
+            keys = {}
+            for jwk in hs256_keys:
+                key = algorithms.decrypt_hs256_jwks_secret(
+                    secret=jwk["k"],
                     decryption_key=self._hs256_jwks_decryption_key,
                 )
+                keys[jwk.get("kid") or algorithms.hs256_key_id(key)] = key
+            kid, key = next(iter(keys.items()))
+            del keys[kid]
 
             return algorithms.HS256(
                 key=key,
-                previous_key=previous_key,
+                kid=kid,
+                additional_keys=keys,
+                verified_cache=self._verified_token_cache,
+                lean_verify=self._lean_verify,
             )
 
-        elif algorithm == algorithms.ALGORITHM_RS256:
-            rs256_keys = [
+        elif algorithm in _ASYMMETRIC_JWKS:
+            kty, members, load_jwk, algorithm_cls = _ASYMMETRIC_JWKS[algorithm]
+            asymmetric_keys = [
                 k
                 for k in payload["keys"]
                 if isinstance(k, dict)
-                and k.get("alg") == algorithms.ALGORITHM_RS256
-                and k.get("kty") == "RSA"
-                and k.get("n") is not None
-                and k.get("e") is not None
+                and k.get("alg") == algorithm
+                and k.get("kty") == kty
+                and all(k.get(m) is not None for m in members)
             ]
-            if not rs256_keys:
+            if not asymmetric_keys:
                 raise ValueError(
-                    "RS256 payload keys list does not contain RS256 RSA keys"
+                    f"{algorithm} payload keys list does not contain "
+                    f"{algorithm} {kty} keys"
                 )
 
-            public_key = _rsa_jwk_to_public_key_pem(rs256_keys[0])
-            previous_public_key = None
-            if len(rs256_keys) > 1:
-                previous_public_key = _rsa_jwk_to_public_key_pem(rs256_keys[1])
+            public_keys = {
+                jwk.get("kid") or algorithms.jwk_thumbprint(jwk): load_jwk(jwk)
+                for jwk in asymmetric_keys
+            }
+            kid, public_key = next(iter(public_keys.items()))
+            del public_keys[kid]
 
-            return algorithms.RS256VerifyOnly(
+            return algorithm_cls(
                 public_key=public_key,
-                previous_public_key=previous_public_key,
+                kid=kid,
+                additional_public_keys=public_keys,
+                verified_cache=self._verified_token_cache,
+                lean_verify=self._lean_verify,
             )
 
         raise ValueError("Unsupported algorithm")
@@ -17,9 +17,17 @@
 import collections
 from enum import Enum
 import logging
+import math
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from gcl_iam import caches
 from gcl_iam import exceptions
 from gcl_iam import rules
+from gcl_iam import tracing
 
 LOG = logging.getLogger(__name__)
 
@@ -81,6 +89,103 @@ class BasicPermission(set):
         return Grant.DENY
 
 
+# Terminal marker of a `GlobTrie` node, never a character of a name
+_GLOB_END = ""
+
+
+def is_glob(name):
+    """Tell whether a segment is a prefix (`vm_*`) or suffix (`*_admin`) glob.
+
+    A bare "*" is a whole segment wildcard, not a glob.
+    """
+    return (
+        len(name) > 1 and name.count("*") == 1 and (name[0] == "*" or name[-1] == "*")
+    )
+
+
+class GlobTrie(object):
+    """Prefix and suffix globs of one level compiled into two tries.
+
+    Suffix globs are stored reversed, so matching walks the name once per
+    trie and costs O(len(name)) whatever the number of patterns is.
+    """
+
+    def __init__(self, patterns=()):
+        self._prefixes = {}
+        self._suffixes = {}
+        self._size = 0
+        for pattern in patterns:
+            self.add(pattern)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, pattern):
+        if pattern[-1] == "*":
+            node, chars = self._prefixes, pattern[:-1]
+        else:
+            node, chars = self._suffixes, reversed(pattern[1:])
+        for char in chars:
+            node = node.setdefault(char, {})
+        if _GLOB_END not in node:
+            self._size += 1
+        node[_GLOB_END] = pattern
+
+    @staticmethod
+    def _walk(node, chars, found):
+        for char in chars:
+            node = node.get(char)
+            if node is None:
+                return
+            if _GLOB_END in node:
+                found.append(node[_GLOB_END])
+
+    def match(self, name):
+        """Return the patterns matching the name."""
+        found = []
+        self._walk(self._prefixes, name, found)
+        self._walk(self._suffixes, reversed(name), found)
+        return found
+
+
+def _glob_match(pattern, name):
+    if pattern[-1] == "*":
+        return name.startswith(pattern[:-1])
+    return name.endswith(pattern[1:])
+
+
+class AllowedResources(
+    collections.namedtuple("AllowedResources", ("any_resource", "names", "globs"))
+):
+    """Resources of a service where an action is granted.
+
+    Either every resource (`any_resource`) or the exact resource `names`
+    plus the resource `globs`. Falsy when nothing is granted.
+    """
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.any_resource or self.names or self.globs)
+
+    def __contains__(self, res):
+        return (
+            self.any_resource
+            or res in self.names
+            or any(_glob_match(glob, res) for glob in self.globs)
+        )
+
+
+def _level_keys(level, globs, name):
+    # A "*" entry shadows every other key of the same level
+    if "*" in level:
+        return ("*",)
+    keys = globs.match(name) if globs else []
+    if name in level:
+        keys.append(name)
+    return keys
+
+
 class Enforcer(object):
     """
     A class to enforce permissions based on a list of predefined permissions.
@@ -94,7 +199,9 @@ class Enforcer(object):
                       represents a permission in the format
                       "service.resource.action".
                       Wildcards are supported, such as "*", which can be used
-                      to grant all actions for a resource.
+                      to grant all actions for a resource. Any segment may
+                      also be a prefix or suffix glob like "vm_*" or
+                      "*_admin".
 
     Examples:
         # Define permissions
@@ -115,6 +222,12 @@ class Enforcer(object):
         # Check if a wildcard permission applies to a resource
         result = enforcer.enforce("genesis_core.*.action")
         print(result)  # Output: Grant.ALLOW
+
+        # Globs match by prefix or suffix, a "*" of the same level still
+        # shadows them
+        enforcer = Enforcer(["compute.vm_*.read", "network.port.list*"])
+        result = enforcer.enforce_raw("compute.vm_disk.read")
+        print(result)  # Output: Grant.ALLOW
     """
 
     def __init__(
@@ -125,20 +238,138 @@ class Enforcer(object):
     ):
         self._perms = level_class(lambda: level_class(perm_class))
         self._load_perms(perms)
+        self._compile_globs()
+        # service -> reverse index, see `allowed_resources`
+        self._reverse_index = {}
+
+    def _compile_globs(self):
+        if not self._has_globs:
+            self._service_globs = None
+            self._res_globs = {}
+            self._perm_globs = {}
+            return
+        self._service_globs = GlobTrie(s for s in self._perms if is_glob(s))
+        self._res_globs = {}
+        self._perm_globs = {}
+        for service, resources in self._perms.items():
+            if globs := GlobTrie(r for r in resources if is_glob(r)):
+                self._res_globs[service] = globs
+            for res, perms in resources.items():
+                if globs := GlobTrie(p for p in perms if is_glob(p)):
+                    self._perm_globs[(service, res)] = globs
+        self._has_globs = bool(
+            self._service_globs or self._res_globs or self._perm_globs
+        )
+
+    @property
+    def has_globs(self):
+        return self._has_globs
 
     def _load_perms(self, perms):
+        self._has_globs = False
         for p in perms:
             service, res, perm = p.split(".", maxsplit=2)
             # Add the rule to a list of perms
             self._perms[service][res].add(perm)
+            if "*" in p and not self._has_globs:
+                self._has_globs = is_glob(service) or is_glob(res) or is_glob(perm)
 
     def enforce_raw(self, rule, do_raise=False, exc=None):
         rule_obj = rules.Rule.from_raw(rule)
         return self.enforce(rule_obj, do_raise, exc)
 
+    def enforce_many(self, rules):
+        """Return a grant per rule, rules may be `Rule` objects or strings.
+
+        Each distinct rule is evaluated once and nothing is raised on deny.
+        """
+        decisions = {}
+        result = []
+        for rule in rules:
+            key = rule if isinstance(rule, str) else (rule.service, rule.res, rule.perm)
+            grant = decisions.get(key)
+            if grant is None:
+                grant = decisions[key] = (
+                    self.enforce_raw(rule)
+                    if isinstance(rule, str)
+                    else self.enforce(rule)
+                )
+            result.append(grant)
+        return result
+
+    def _match_globs(self, service, res, perm):
+        # Every key matching a level is tried, exact or glob, unless the
+        # level holds a "*".
+        for s in _level_keys(self._perms, self._service_globs, service):
+            resources = self._perms[s]
+            for r in _level_keys(resources, self._res_globs.get(s), res):
+                if resources[r].get_grant_level(perm):
+                    return Grant.ALLOW
+                globs = self._perm_globs.get((s, r))
+                if globs and globs.match(perm):
+                    return Grant.ALLOW
+        return Grant.DENY
+
+    def _build_reverse_index(self, service):
+        # action -> resource keys, resources granting every action and
+        # actions given as globs -> resource keys
+        by_action = {}
+        any_action = []
+        glob_actions = {}
+        for s in _level_keys(self._perms, self._service_globs, service):
+            resources = self._perms[s]
+            for res in ("*",) if "*" in resources else resources:
+                for perm in resources[res]:
+                    if perm == "*":
+                        any_action.append(res)
+                    elif self._has_globs and is_glob(perm):
+                        glob_actions.setdefault(perm, []).append(res)
+                    else:
+                        by_action.setdefault(perm, []).append(res)
+        return by_action, any_action, glob_actions, GlobTrie(glob_actions)
+
+    def allowed_resources(self, service, perm):
+        """Return the resources of a service where an action is granted.
+
+        The answer comes from a reverse index (action -> resources) built
+        once per service, so a list endpoint may turn it into storage
+        filters instead of checking rows one by one.
+        """
+        index = self._reverse_index.get(service)
+        if index is None:
+            index = self._reverse_index[service] = self._build_reverse_index(service)
+        by_action, any_action, glob_actions, action_globs = index
+
+        keys = any_action + by_action.get(perm, [])
+        for glob in action_globs.match(perm):
+            keys.extend(glob_actions[glob])
+        if "*" in keys:
+            return AllowedResources(True, frozenset(), frozenset())
+        names = set()
+        globs = set()
+        for res in keys:
+            (globs if self._has_globs and is_glob(res) else names).add(res)
+        return AllowedResources(False, frozenset(names), frozenset(globs))
+
     def enforce(self, rule, do_raise=False, exc=None):
+        if tracing.TRACER.enabled:
+            return self._traced_enforce(rule, do_raise, exc)
+        return self._enforce(rule, do_raise, exc)
+
+    def _traced_enforce(self, rule, do_raise, exc):
+        with tracing.TRACER.start_span(
+            "gcl_iam.enforcer.enforce",
+            {"gcl_iam.rule": str(rule)},
+        ) as span:
+            result = self._enforce(rule, do_raise, exc)
+            span.set_attribute("gcl_iam.grant", bool(result))
+            return result
+
+    def _enforce(self, rule, do_raise, exc):
         result = Grant.DENY
-        if resource := self._perms.get(rule.service):
+        if self._has_globs:
+            result = self._match_globs(rule.service, rule.res, rule.perm)
+        elif resource := self._perms.get(rule.service):
             if permission := resource.get(rule.res):
                 result = permission.get_grant_level(rule.perm)
 
@@ -151,3 +382,169 @@ class Enforcer(object):
             )
 
         return result
+
+
+class CompiledEnforcer(Enforcer):
+    """Enforcer with permissions compiled into a flat hash table.
+
+    Permissions are parsed exactly like `Enforcer` does, then every
+    wildcard combination (`*.*.*`, `svc.*.*`, `svc.res.*`) is resolved once
+    so that a decision costs a fixed number of hash lookups. Globs are
+    matched with the tries of `Enforcer` instead. Decisions are
+    memoized per `(service, res, perm)` and per raw rule string; the memo is
+    reset when it reaches `memo_maxsize` entries.
+    """
+
+    # Marks a resource where every permission is granted
+    ANY = object()
+
+    def __init__(self, perms, memo_maxsize=4096):
+        super().__init__(perms)
+        self._memo_maxsize = memo_maxsize
+        self._memo = {}
+        self._raw_memo = {}
+        self._compile()
+
+    def _compile(self):
+        # `PermissionLevel` lets a "*" entry shadow every other key of the
+        # same level, mirror that here.
+        self._any_service = "*" in self._perms
+        self._any_res_services = set()
+        self._table = {}
+        for service, resources in self._perms.items():
+            if "*" in resources:
+                self._any_res_services.add(service)
+            for res, perms in resources.items():
+                self._table[(service, res)] = (
+                    self.ANY if "*" in perms else frozenset(perms)
+                )
+
+    def granted_perms(self, service, res):
+        """Return the granted permissions of a resource.
+
+        The result is a frozenset of permission names, `CompiledEnforcer.ANY`
+        if every permission is granted or None if nothing is. Globs can not
+        be expanded without names, check `has_globs` first.
+        """
+        if self._has_globs:
+            raise ValueError("Permissions with globs can not be listed")
+        if self._any_service:
+            service = "*"
+        if service in self._any_res_services:
+            res = "*"
+        return self._table.get((service, res))
+
+    def _decide(self, service, res, perm):
+        if self._has_globs:
+            return self._match_globs(service, res, perm)
+        perms = self.granted_perms(service, res)
+        if perms is self.ANY or (perms is not None and perm in perms):
+            return Grant.ALLOW
+        return Grant.DENY
+
+    def _remember(self, memo, key, result):
+        if len(memo) >= self._memo_maxsize:
+            memo.clear()
+        memo[key] = result
+
+    def enforce_raw(self, rule, do_raise=False, exc=None):
+        result = self._raw_memo.get(rule)
+        if result is None:
+            service, res, perm = rule.split(".", maxsplit=2)
+            result = self._decide(service, res, perm)
+            self._remember(self._raw_memo, rule, result)
+        if do_raise and not result:
+            return self.enforce(rules.Rule.from_raw(rule), do_raise, exc)
+        return result
+
+    def _enforce(self, rule, do_raise, exc):
+        key = (rule.service, rule.res, rule.perm)
+        result = self._memo.get(key)
+        if result is None:
+            result = self._decide(*key)
+            self._remember(self._memo, key, result)
+
+        if do_raise and not result:
+            if exc:
+                raise exc(rule=(".".join(key)))
+
+            raise exceptions.PolicyNotAuthorized(rule=(".".join(key)))
+
+        return result
+
+
+def _matrix_indexes(principals, batch):
+    """Deduplicate enforcers and rules of a matrix.
+
+    Returns the row of every enforcer and the column of every rule in the
+    lists of unique enforcers and rules.
+    """
+    unique_enforcers = {}
+    rows = [
+        unique_enforcers.setdefault(id(e), (len(unique_enforcers), e))[0]
+        for e in principals
+    ]
+    rule_index = {}
+    columns = []
+    unique_rules = []
+    for rule in batch:
+        key = rule if isinstance(rule, str) else (rule.service, rule.res, rule.perm)
+        if key not in rule_index:
+            rule_index[key] = len(unique_rules)
+            unique_rules.append(rule)
+        columns.append(rule_index[key])
+    return rows, [e for _, e in unique_enforcers.values()], columns, unique_rules
+
+
+def enforce_matrix(principals, batch):
+    """Evaluate every rule for every enforcer (row or user) in one call.
+
+    Returns a boolean NumPy array of shape `(len(principals), len(batch))`.
+    Each distinct enforcer and rule is evaluated once, which pays off with
+    enforcers shared through `EnforcerRegistry`. Requires NumPy.
+    """
+    if np is None:
+        raise ImportError("enforce_matrix requires NumPy to be installed")
+
+    rows, unique_enforcers, columns, unique_rules = _matrix_indexes(principals, batch)
+    table = np.array(
+        [[bool(g) for g in e.enforce_many(unique_rules)] for e in unique_enforcers],
+        dtype=bool,
+    ).reshape(len(unique_enforcers), len(unique_rules))
+    return table[np.ix_(rows, columns)]
+
+
+class EnforcerRegistry(object):
+    """Bounded pool of enforcers shared between identical permission sets.
+
+    Permission lists are keyed exactly as given: a "*" level shadows its
+    siblings depending on the order permissions are loaded in, so only the
+    same ordered list is guaranteed to give the same decisions. Users with
+    the same roles share one enforcer and memory grows with distinct
+    permission lists only. Shared enforcers must not be modified.
+    """
+
+    def __init__(self, maxsize=1024, enforcer_class=CompiledEnforcer):
+        self._enforcer_class = enforcer_class
+        self._enforcers = caches.TTLCache(maxsize=maxsize, ttl_seconds=math.inf)
+
+    def get(self, perms):
+        key = tuple(perms)
+        enforcer = self._enforcers.get(key)
+        if enforcer is None:
+            enforcer = self._enforcer_class(key)
+            self._enforcers.set(key, enforcer)
+        return enforcer
+
+    def stats(self):
+        return self._enforcers.stats()
+
+    def clear(self):
+        self._enforcers.clear()
+
+
+DEFAULT_REGISTRY = EnforcerRegistry()
+
+
+def get_shared_enforcer(perms):
+    return DEFAULT_REGISTRY.get(perms)
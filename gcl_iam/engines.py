@@ -14,16 +14,32 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import dataclasses
+import threading
 import uuid as sys_uuid
 
 from gcl_iam import enforcers
 from gcl_iam import exceptions
+from gcl_iam import timings
 from gcl_iam import tokens
+from gcl_iam import tracing
 
 
-class UserInfo:
+class _ImmutableView:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class UserInfo(_ImmutableView):
+    __slots__ = ("_info",)
+
     def __init__(self, info):
-        self._info = info
+        object.__setattr__(self, "_info", info)
 
     @property
     def uuid(self):
@@ -50,41 +66,140 @@ class UserInfo:
         return self._info["type"]
 
 
-class IntrospectionInfo:
+class IntrospectionInfo(_ImmutableView):
+    """Read-only view of an introspection result.
+
+    Values are copied out of the result at construction, so later changes
+    to the result dict do not show up here, and returned as is afterwards,
+    so repeated access allocates nothing. `permissions` is the same list on
+    every access and must not be modified.
+    """
+
+    __slots__ = ("_user_info", "_project_id", "_otp_verified", "_permissions")
+
     def __init__(self, info):
-        self._info = info
+        project_id = info["project_id"]
+        if project_id and not isinstance(project_id, sys_uuid.UUID):
+            project_id = sys_uuid.UUID(project_id)
+        object.__setattr__(self, "_user_info", UserInfo(dict(info["user_info"])))
+        object.__setattr__(self, "_project_id", project_id or None)
+        object.__setattr__(self, "_otp_verified", info["otp_verified"])
+        object.__setattr__(self, "_permissions", list(info["permissions"]))
 
     @property
     def user_info(self):
-        return UserInfo(info=self._info["user_info"])
+        return self._user_info
 
     @property
     def project_id(self):
-        value = self._info["project_id"]
-        return sys_uuid.UUID(value) if value else None
+        return self._project_id
 
     @property
     def otp_verified(self):
-        return self._info["otp_verified"]
+        return self._otp_verified
 
     @property
     def permissions(self):
-        return self._info["permissions"][:]
+        return self._permissions
+
+
+@dataclasses.dataclass(frozen=True)
+class LazyStats:
+    engines: int
+    introspections: int
+
+    @property
+    def avoided(self) -> int:
+        """Lazy engines which have not needed introspection (yet)."""
+        return self.engines - self.introspections
+
+    @property
+    def avoided_ratio(self) -> float:
+        return self.avoided / self.engines if self.engines else 0.0
+
+
+class _LazyCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._engines = 0
+            self._introspections = 0
+
+    def engine_created(self):
+        with self._lock:
+            self._engines += 1
+
+    def introspected(self):
+        with self._lock:
+            self._introspections += 1
+
+    def stats(self):
+        with self._lock:
+            return LazyStats(
+                engines=self._engines,
+                introspections=self._introspections,
+            )
+
+
+_LAZY_COUNTERS = _LazyCounters()
+
+
+def lazy_stats():
+    """How often lazy engines have avoided introspection."""
+    return _LAZY_COUNTERS.stats()
+
+
+def reset_lazy_stats():
+    _LAZY_COUNTERS.reset()
 
 
 class IamEngine:
-    def __init__(self, auth_token, algorithm, driver, enforcer=None, otp_code=None):
+    """Verified token of a request with its introspection and enforcer.
+
+    The token is always verified here. With `lazy=True` the introspection
+    call and the enforcer are deferred until `introspection_info()`,
+    `get_introspection_info()` or `enforcer` is used first, which raises
+    the errors the constructor would have raised otherwise. A
+    `timings.PhaseTimer` may be given to time the "verify", "introspect"
+    and "enforcer" phases.
+    """
+
+    def __init__(
+        self,
+        auth_token,
+        algorithm,
+        driver,
+        enforcer=None,
+        otp_code=None,
+        lazy=False,
+        timer=timings.NULL_TIMER,
+    ):
         super().__init__()
         self._driver = driver
+        self._otp_code = otp_code
+        self._timer = timer
+        self._enforcer = enforcer
+        self._introspection_info = None
+        self._introspection_view = None
+        self._introspection_error = None
+
+        tracer = tracing.TRACER
+        if not tracer.enabled:
+            self._load(auth_token, algorithm, lazy)
+        else:
+            with tracer.start_span("gcl_iam.engine.init", {"gcl_iam.lazy": lazy}):
+                self._load(auth_token, algorithm, lazy)
 
+    def _load(self, auth_token, algorithm, lazy):
+        timer = self._timer
         # Handle anonymous users (no auth token)
         if auth_token == "" and algorithm is None:
             self._token_info = tokens.AnonymousToken()
-            self._introspection_info = self._driver.get_introspection_info(
-                token_info=self._token_info,
-                otp_code=otp_code,
-            )
         else:
+            started = timer.start()
             self._token_info = tokens.AuthToken(
                 auth_token,
                 algorithm,
@@ -92,31 +207,66 @@ class IamEngine:
                 ignore_expiration=False,
                 verify=True,
             )
-            self._introspection_info = self._driver.get_introspection_info(
-                token_info=self._token_info,
-                otp_code=otp_code,
-            )
+            timer.stop("verify", started)
+
+        if lazy:
+            _LAZY_COUNTERS.engine_created()
+        else:
+            self._introspect()
+
+    def _introspect(self):
+        started = self._timer.start()
+        introspection_info = self._driver.get_introspection_info(
+            token_info=self._token_info,
+            otp_code=self._otp_code,
+        )
+        self._timer.stop("introspect", started)
 
         # Forbid requests without auth or without project scope
-        if not self._introspection_info:
+        if not introspection_info:
             raise exceptions.Unauthorized()
 
-        self._enforcer = enforcer or enforcers.Enforcer(
-            self._introspection_info["permissions"]
+        started = self._timer.start()
+        self._enforcer = self._enforcer or enforcers.get_shared_enforcer(
+            introspection_info["permissions"]
         )
+        self._timer.stop("enforcer", started)
+
+        introspection_info["otp_enabled"] = self._token_info.otp_enabled
+        self._introspection_info = introspection_info
 
-        self._introspection_info["otp_enabled"] = self._token_info.otp_enabled
+    def _get_introspection_info(self):
+        if self._introspection_info is None:
+            # A failed lazy introspection is not retried on every access
+            if self._introspection_error is not None:
+                raise self._introspection_error
+            _LAZY_COUNTERS.introspected()
+            try:
+                self._introspect()
+            except Exception as e:
+                self._introspection_error = e
+                raise
+        return self._introspection_info
+
+    @property
+    def introspected(self):
+        return self._introspection_info is not None
 
     @property
     def token_info(self):
         return self._token_info
 
     def introspection_info(self):
-        return self._introspection_info
+        return self._get_introspection_info()
 
     def get_introspection_info(self):
-        return IntrospectionInfo(info=self._introspection_info)
+        if self._introspection_view is None:
+            self._introspection_view = IntrospectionInfo(
+                info=self._get_introspection_info()
+            )
+        return self._introspection_view
 
     @property
     def enforcer(self):
+        self._get_introspection_info()
         return self._enforcer
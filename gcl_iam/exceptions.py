@@ -48,6 +48,10 @@ class CredentialsAreInvalidError(GenesisCoreLibraryIamError):
     __template__ = "The provided credentials are invalid"
 
 
+class UnknownKeyIdError(CredentialsAreInvalidError):
+    __template__ = "Token is signed with unknown key {kid!r}"
+
+
 class OTPAlreadyEnabledError(CredentialsAreInvalidError):
     __template__ = "OTP is already enabled for this account"
 
@@ -93,3 +97,9 @@ class TokenAudienceMismatchError(ClientAuthenticationError):
         "Token audience {token_audience!r} does not match service"
         " audience {service_audience!r}."
     )
+
+
+class TokenRejectedError(InvalidAuthTokenError):
+    __template__ = "Auth token is rejected: {reason}"
+
+    reason: str
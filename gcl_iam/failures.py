@@ -0,0 +1,203 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Aggregated, rate limited reporting of authentication failures.
+
+Bad tokens are cheap to send, so logging every failure in full lets a
+broken client or an attacker flood the logs. `FailureReporter` counts
+failures by reason, audience and issuer instead, logs a few of them per
+second and summarizes the rest periodically. Tracebacks are kept for
+unexpected exception types only.
+"""
+
+import logging
+import threading
+import time
+import typing as tp
+
+import jwt
+
+from gcl_iam import exceptions
+
+LOG = logging.getLogger(__name__)
+
+# Failures of tokens themselves, anything else is worth a traceback
+EXPECTED_ERRORS: tp.Tuple[tp.Type[BaseException], ...] = (
+    exceptions.GenesisCoreLibraryIamError,
+    jwt.exceptions.PyJWTError,
+)
+
+# Audience and issuer come from unverified claims, cap what is kept of them
+_MAX_LABEL_LENGTH = 64
+_OTHER = "<other>"
+
+FailureKey = tp.Tuple[str, str, str]
+
+
+def _label(value: tp.Any) -> str:
+    if value is None:
+        return "-"
+    if not isinstance(value, str):
+        value = ",".join(map(str, value)) if isinstance(value, list) else str(value)
+    return value[:_MAX_LABEL_LENGTH]
+
+
+def failure_reason(error: BaseException) -> str:
+    """Name of the error, refined by an explicitly chained cause."""
+    if isinstance(error, exceptions.TokenRejectedError):
+        return f"{type(error).__name__}:{error.reason}"
+    cause = error.__cause__
+    if cause is not None:
+        return f"{type(error).__name__}:{type(cause).__name__}"
+    return type(error).__name__
+
+
+class FailureReporter:
+    """Counts authentication failures and logs a sample of them.
+
+    At most `burst` lines are logged at once and `rate_per_second` on
+    average afterwards (a token bucket), suppressed failures are only
+    counted. Once per `summary_interval_seconds` the next failure logs a
+    summary of the interval with the most frequent (reason, audience,
+    issuer) keys. At most `max_keys` distinct keys are counted per
+    interval, the rest is counted under "<other>". Audience and issuer
+    come from the client, so totals since start are kept by reason only.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger = LOG,
+        rate_per_second: float = 1.0,
+        burst: int = 10,
+        summary_interval_seconds: float = 60,
+        max_keys: int = 1000,
+        summary_top: int = 5,
+        expected_errors: tp.Tuple[tp.Type[BaseException], ...] = EXPECTED_ERRORS,
+        clock: tp.Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self._logger = logger
+        self._rate_per_second = rate_per_second
+        self._burst = burst
+        self._summary_interval_seconds = summary_interval_seconds
+        self._max_keys = max_keys
+        self._summary_top = summary_top
+        self._expected_errors = expected_errors
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._totals: tp.Dict[str, int] = {}
+        self._window: tp.Dict[FailureKey, int] = {}
+        self._suppressed = 0
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._window_started_at = self._updated_at
+
+    def stats(self) -> tp.Dict[str, int]:
+        """Failures counted since start by reason."""
+        with self._lock:
+            return dict(self._totals)
+
+    def _count(self, key: FailureKey) -> None:
+        reason = key[0]
+        self._totals[reason] = self._totals.get(reason, 0) + 1
+        if key not in self._window and len(self._window) >= self._max_keys:
+            key = (_OTHER, _OTHER, _OTHER)
+        self._window[key] = self._window.get(key, 0) + 1
+
+    def _take_token(self, now: float) -> bool:
+        self._tokens = min(
+            self._burst,
+            self._tokens + (now - self._updated_at) * self._rate_per_second,
+        )
+        self._updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        self._suppressed += 1
+        return False
+
+    def _pop_summary(self, now: float, force: bool = False):
+        if not force and now - self._window_started_at < self._summary_interval_seconds:
+            return None
+        window, suppressed = self._window, self._suppressed
+        elapsed = now - self._window_started_at
+        self._window = {}
+        self._suppressed = 0
+        self._window_started_at = now
+        if not suppressed:
+            # Every failure of the window has been logged already
+            return None
+        return window, suppressed, elapsed
+
+    def report(
+        self,
+        error: BaseException,
+        audience: tp.Any = None,
+        issuer: tp.Any = None,
+    ) -> None:
+        reason = failure_reason(error)
+        key = (reason, _label(audience), _label(issuer))
+        with self._lock:
+            now = self._clock()
+            summary = self._pop_summary(now)
+            self._count(key)
+            log = self._take_token(now)
+
+        if summary is not None:
+            self._log_summary(*summary)
+        if not log:
+            return
+        if isinstance(error, self._expected_errors):
+            self._logger.warning(
+                "Invalid auth token (reason=%s, audience=%s, issuer=%s): %s",
+                *key,
+                error,
+            )
+        else:
+            self._logger.error(
+                "Auth failed unexpectedly (audience=%s, issuer=%s):",
+                key[1],
+                key[2],
+                exc_info=error,
+            )
+
+    def _log_summary(
+        self,
+        window: tp.Dict[FailureKey, int],
+        suppressed: int,
+        elapsed: float,
+    ) -> None:
+        top = sorted(window.items(), key=lambda item: item[1], reverse=True)
+        self._logger.warning(
+            "%d auth failures in the last %.0fs, %d not logged, top: %s",
+            sum(window.values()),
+            elapsed,
+            suppressed,
+            "; ".join(
+                f"reason={reason} audience={audience} issuer={issuer}: {count}"
+                for (reason, audience, issuer), count in top[: self._summary_top]
+            ),
+        )
+
+    def flush(self) -> None:
+        """Log the summary of the current interval right away."""
+        with self._lock:
+            summary = self._pop_summary(self._clock(), force=True)
+        if summary is not None:
+            self._log_summary(*summary)
+
+
+DEFAULT_REPORTER = FailureReporter()
@@ -0,0 +1,91 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import typing as tp
+from concurrent import futures
+
+import gcl_iam.algorithms as algorithms
+
+
+class TokenIssuer:
+    """Signs tokens with one algorithm on a shared worker pool.
+
+    The algorithm loads its private key once, the pool only spreads the
+    signing itself. A thread pool is created unless an executor is given
+    or `processes` is set for CPU bound RSA signing. With processes the
+    signing key leaves this process: it is pickled to every worker once
+    when the issuer creates the pool (an `AlgorithmProcessPool`), and with
+    every task on any other process pool passed in. Only an executor
+    created here is shut down by `shutdown()`.
+    """
+
+    def __init__(
+        self,
+        algorithm: algorithms.BaseJwtAlgorithm,
+        executor: tp.Optional[futures.Executor] = None,
+        max_workers: tp.Optional[int] = None,
+        chunk_size: int = 64,
+        processes: bool = False,
+    ):
+        super().__init__()
+        self._algorithm = algorithm
+        self._owns_executor = executor is None
+        if executor is None:
+            if processes:
+                executor = algorithms.AlgorithmProcessPool(
+                    algorithm,
+                    max_workers=max_workers,
+                )
+            else:
+                executor = futures.ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="gcl-iam-issuer",
+                )
+        self._executor = executor
+        self._target = algorithm._executor_target(executor)
+        self._chunk_size = chunk_size
+
+    @property
+    def algorithm(self) -> algorithms.BaseJwtAlgorithm:
+        return self._algorithm
+
+    def encode(self, data: tp.Dict[str, tp.Any]) -> str:
+        return self._algorithm.encode(data)
+
+    def submit(self, data: tp.Dict[str, tp.Any]) -> "futures.Future[str]":
+        return self._executor.submit(
+            algorithms._run_in_worker,
+            self._target,
+            "encode",
+            data,
+        )
+
+    def encode_many(self, data: tp.Iterable[tp.Dict[str, tp.Any]]) -> tp.List[str]:
+        return self._algorithm.encode_many(
+            data,
+            executor=self._executor,
+            chunk_size=self._chunk_size,
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "TokenIssuer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
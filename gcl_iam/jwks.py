@@ -0,0 +1,160 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import dataclasses
+import logging
+import math
+import random
+import threading
+import time
+import typing as tp
+
+LOG = logging.getLogger(__name__)
+
+
+def _spawn_thread(target: tp.Callable[[], None]) -> None:
+    threading.Thread(target=target, name="gcl-iam-jwks-refresh", daemon=True).start()
+
+
+@dataclasses.dataclass(frozen=True)
+class _KeySetEntry:
+    value: tp.Any
+    fetched_at: float
+    expires_at: float
+    fetch_duration: float
+
+
+class JwksKeyManager:
+    """Keeps the last good key set and refreshes it in the background.
+
+    Only the very first `get()` blocks on `fetch`. Afterwards the current key
+    set is always returned immediately, and a single background refresh is
+    started once the entry is close to its (jittered) expiration. The point of
+    refresh is chosen probabilistically ("XFetch"): the longer the fetch takes
+    and the closer the expiration is, the more likely a refresh is started,
+    so workers do not all hit IAM at the same instant. Failed refreshes are
+    logged and retried later while the stale key set keeps being served.
+    """
+
+    def __init__(
+        self,
+        fetch: tp.Callable[[], tp.Any],
+        ttl_seconds: float = 300,
+        jitter: float = 0.1,
+        early_refresh_beta: float = 1.0,
+        retry_interval_seconds: float = 10,
+        timer: tp.Callable[[], float] = time.monotonic,
+        rand: tp.Callable[[], float] = random.random,
+        spawn: tp.Callable[[tp.Callable[[], None]], tp.Any] = _spawn_thread,
+        on_update: tp.Optional[tp.Callable[[tp.Any], None]] = None,
+    ):
+        super().__init__()
+        self._fetch = fetch
+        self._ttl_seconds = ttl_seconds
+        self._jitter = jitter
+        self._early_refresh_beta = early_refresh_beta
+        self._retry_interval_seconds = retry_interval_seconds
+        self._timer = timer
+        self._rand = rand
+        self._spawn = spawn
+        self._on_update = on_update
+        self._entry: tp.Optional[_KeySetEntry] = None
+        self._retry_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    @property
+    def is_warm(self) -> bool:
+        return self._entry is not None
+
+    def get(self) -> tp.Any:
+        entry = self._entry
+        if entry is None:
+            return self._refresh_cold()
+
+        if self._should_refresh(entry, self._timer()):
+            self._refresh_in_background()
+        return entry.value
+
+    def refresh(self, min_age_seconds: float = 0) -> tp.Any:
+        """Fetch the key set synchronously and make it current.
+
+        The fetch is skipped if the current key set is younger than
+        `min_age_seconds`, concurrent callers share a single fetch.
+        """
+        with self._fetch_lock:
+            entry = self._entry
+            if entry is not None and self._timer() - entry.fetched_at < min_age_seconds:
+                return entry.value
+            return self._fetch_locked()
+
+    def _refresh_cold(self) -> tp.Any:
+        # Concurrent first requests wait for the one fetch started first
+        with self._fetch_lock:
+            entry = self._entry
+            if entry is not None:
+                return entry.value
+            return self._fetch_locked()
+
+    def _fetch_locked(self) -> tp.Any:
+        started_at = self._timer()
+        value = self._fetch()
+        fetched_at = self._timer()
+        ttl = self._ttl_seconds * (1 - self._jitter * self._rand())
+        self._entry = _KeySetEntry(
+            value=value,
+            fetched_at=fetched_at,
+            expires_at=fetched_at + ttl,
+            fetch_duration=fetched_at - started_at,
+        )
+        if self._on_update is not None:
+            self._on_update(value)
+        return value
+
+    def _should_refresh(self, entry: _KeySetEntry, now: float) -> bool:
+        if self._refreshing or now < self._retry_at:
+            return False
+        if now >= entry.expires_at:
+            return True
+        # XFetch: -log(rand) is exponentially distributed, so the refresh
+        # moment spreads out ahead of the expiration proportionally to the
+        # cost of the fetch.
+        delta = max(entry.fetch_duration, 1e-3)
+        gap = -delta * self._early_refresh_beta * math.log(1 - self._rand())
+        return now + gap >= entry.expires_at
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        try:
+            self._spawn(self._background_refresh)
+        except Exception:
+            self._refreshing = False
+            raise
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            LOG.exception(
+                "Unable to refresh JWKS, keep using the current key set:",
+            )
+            self._retry_at = self._timer() + self._retry_interval_seconds
+        finally:
+            self._refreshing = False
@@ -0,0 +1,312 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process metrics rendered in the Prometheus text format.
+
+Only counters and fixed-bucket histograms are kept, values of other
+components (e.g. cache statistics) are read by collectors at render time.
+"""
+
+import bisect
+import math
+import threading
+import typing as tp
+
+from gcl_iam import timings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tp.Tuple[str, ...]
+# (name suffix, label names, label values, value)
+Sample = tp.Tuple[str, Labels, Labels, float]
+
+
+class MetricFamily(tp.NamedTuple):
+    name: str
+    type: str
+    documentation: str
+    samples: tp.List[Sample]
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Labels, values: Labels) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(str(value))}"'
+        for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}"
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tp.Iterable[str] = (),
+    ):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _check_labels(self, labels: Labels) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labels}"
+            )
+
+    def collect(self) -> MetricFamily:
+        raise NotImplementedError("Not implemented")
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: tp.Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        self._check_labels(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            values = list(self._values.items())
+        return MetricFamily(
+            self.name,
+            self.type,
+            self.documentation,
+            [("", self.labelnames, labels, value) for labels, value in values],
+        )
+
+
+class Histogram(_Metric):
+    """Histogram with fixed upper bounds, "+Inf" is always added."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        buckets: tp.Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if not self.buckets or self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        # labels -> [bucket counts..., sum]
+        self._values: tp.Dict[Labels, tp.List[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        self._check_labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * len(self.buckets) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        counts = self._values.get(labels)
+        return sum(counts[:-1]) if counts else 0
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            values = [(labels, counts[:]) for labels, counts in self._values.items()]
+        samples = []
+        bucket_names = self.labelnames + ("le",)
+        for labels, counts in values:
+            total = 0
+            for bound, count in zip(self.buckets, counts):
+                total += count
+                samples.append(
+                    ("_bucket", bucket_names, labels + (_format_value(bound),), total)
+                )
+            samples.append(("_sum", self.labelnames, labels, counts[-1]))
+            samples.append(("_count", self.labelnames, labels, total))
+        return MetricFamily(self.name, self.type, self.documentation, samples)
+
+
+Collector = tp.Callable[[], tp.Optional[tp.Iterable[MetricFamily]]]
+
+
+class MetricsRegistry:
+    """Metrics of a process.
+
+    Metrics are created once by name and shared. Collectors are called at
+    render time, a collector returning None is dropped (e.g. its owner has
+    been garbage collected).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._metrics: tp.Dict[str, _Metric] = {}
+        self._collectors: tp.List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif type(metric) is not metric_class:
+                raise ValueError(f"Metric {name} is a {metric.type}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        buckets=DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram,
+            name,
+            documentation,
+            labelnames,
+            buckets=buckets,
+        )
+
+    def register_collector(self, collector: Collector) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self) -> tp.List[MetricFamily]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        families = [metric.collect() for metric in metrics]
+        dead = []
+        for collector in collectors:
+            collected = collector()
+            if collected is None:
+                dead.append(collector)
+            else:
+                families.extend(collected)
+        if dead:
+            with self._lock:
+                self._collectors = [c for c in self._collectors if c not in dead]
+        return families
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        # Families of the same name (e.g. of several drivers) are merged
+        merged: tp.Dict[str, MetricFamily] = {}
+        for family in self.collect():
+            if family.name in merged:
+                merged[family.name].samples.extend(family.samples)
+            else:
+                merged[family.name] = family._replace(samples=list(family.samples))
+
+        lines = []
+        for family in merged.values():
+            if not family.samples:
+                continue
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for suffix, names, values, value in family.samples:
+                lines.append(
+                    f"{family.name}{suffix}{_format_labels(names, values)}"
+                    f" {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+DEFAULT_REGISTRY = MetricsRegistry()
+
+
+def make_wsgi_app(registry: MetricsRegistry = DEFAULT_REGISTRY):
+    """WSGI application serving the metrics of a registry."""
+
+    def metrics_app(environ, start_response):
+        body = registry.render().encode("utf-8")
+        start_response(
+            "200 OK",
+            [("Content-Type", CONTENT_TYPE), ("Content-Length", str(len(body)))],
+        )
+        return [body]
+
+    return metrics_app
+
+
+class HistogramSink(timings.StatsSink):
+    """Auth phase timings of the middleware as a histogram per phase."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = DEFAULT_REGISTRY,
+        name: str = "gcl_iam_auth_phase_seconds",
+    ):
+        super().__init__()
+        self._histogram = registry.histogram(
+            name,
+            "Duration of the authentication phases of requests",
+            ("phase",),
+        )
+
+    def record(self, phase: str, seconds: float) -> None:
+        self._histogram.observe(seconds, labels=(phase,))
+
+
+def cache_families(
+    labelnames: Labels,
+    stats: tp.Iterable[tp.Tuple[Labels, tp.Any]],
+) -> tp.List[MetricFamily]:
+    """Families of `caches.CacheStats` given as (label values, stats)."""
+    hits, misses, size, ratio = [], [], [], []
+    for labels, cache_stats in stats:
+        hits.append(("", labelnames, labels, cache_stats.hits))
+        misses.append(("", labelnames, labels, cache_stats.misses))
+        size.append(("", labelnames, labels, cache_stats.size))
+        ratio.append(("", labelnames, labels, cache_stats.hit_ratio))
+    return [
+        MetricFamily("gcl_iam_cache_hits_total", "counter", "Cache hits", hits),
+        MetricFamily("gcl_iam_cache_misses_total", "counter", "Cache misses", misses),
+        MetricFamily("gcl_iam_cache_size", "gauge", "Cache entries", size),
+        MetricFamily(
+            "gcl_iam_cache_hit_ratio", "gauge", "Cache hits of all lookups", ratio
+        ),
+    ]
@@ -17,8 +17,11 @@
 #    under the License.
 
 import abc
+import contextlib
+import functools
 import logging
 import re
+import typing as tp
 from http import client as http_client
 
 from restalchemy.api.middlewares import contexts as contexts_mw
@@ -28,11 +31,47 @@ from gcl_iam import contexts
 from gcl_iam import drivers
 from gcl_iam import engines
 from gcl_iam import exceptions as exc
+from gcl_iam import failures
+from gcl_iam import timings
 from gcl_iam import tokens
 
 LOG = logging.getLogger(__name__)
 
 
+@contextlib.contextmanager
+def _invalid_auth_token_errors(reporter, token_info=None):
+    try:
+        yield
+    except exc.OTPInvalidCodeError:
+        raise
+    except Exception as e:
+        # Claims of the (possibly unverified) token only label the failure
+        claims = token_info.token_info if token_info is not None else None
+        reporter.report(
+            e,
+            audience=claims.get("aud") if claims else None,
+            issuer=claims.get("iss") if claims else None,
+        )
+        raise exc.InvalidAuthTokenError()
+
+
+class _LazyIamEngine(engines.IamEngine):
+    """Lazy engine failing like the middleware does for eager ones."""
+
+    def __init__(
+        self,
+        *args,
+        failure_reporter=failures.DEFAULT_REPORTER,
+        **kwargs,
+    ):
+        self._failure_reporter = failure_reporter
+        super().__init__(*args, lazy=True, **kwargs)
+
+    def _introspect(self):
+        with _invalid_auth_token_errors(self._failure_reporter, self._token_info):
+            super()._introspect()
+
+
 class AbstactEndpointComparator(metaclass=abc.ABCMeta):
     def _build_full_path(self, path):
         return re.compile(path)
@@ -46,10 +85,81 @@ class EndpointComparator(AbstactEndpointComparator):
     def __init__(self, path, methods=None):
         self._path = path
         self._methods = methods or ["GET"]
+        self._full_path = self._build_full_path(path)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def methods(self):
+        return self._methods
+
+    @property
+    def full_path(self):
+        return self._full_path
 
     def compare(self, req):
-        full_path = self._build_full_path(self._path)
-        return full_path.fullmatch(req.path) and req.method in self._methods
+        return self._full_path.fullmatch(req.path) and req.method in self._methods
+
+
+# Characters making a path a regular expression rather than a literal
+_REGEX_CHARS = frozenset(".^$*+?{}[]\\|()")
+_DEFAULT_REGEX_FLAGS = re.compile("").flags
+# Inline flags apply to a whole expression, such paths are never joined
+_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+class SkipAuthRouter:
+    """Skip auth endpoints compiled into a per method dispatch table.
+
+    Literal paths of `EndpointComparator`s are a set lookup, the other
+    paths of a method are joined into one regular expression. Patterns
+    with capturing groups or flags keep their own expression (joining
+    would renumber backreferences or spread flags) and other comparators
+    are asked one by one.
+    """
+
+    def __init__(self, endpoints):
+        super().__init__()
+        self._literals = {}
+        self._patterns = {}
+        self._comparators = []
+
+        regexes = {}
+        for endpoint in endpoints:
+            if type(endpoint).compare is not EndpointComparator.compare:
+                self._comparators.append(endpoint)
+                continue
+            full_path = endpoint.full_path
+            for method in endpoint.methods:
+                if (
+                    full_path.groups
+                    or full_path.flags != _DEFAULT_REGEX_FLAGS
+                    or _INLINE_FLAGS.search(full_path.pattern)
+                ):
+                    self._patterns.setdefault(method, []).append(full_path)
+                elif _REGEX_CHARS.isdisjoint(full_path.pattern):
+                    self._literals.setdefault(method, set()).add(full_path.pattern)
+                else:
+                    regexes.setdefault(method, []).append(full_path.pattern)
+
+        for method, patterns in regexes.items():
+            combined = re.compile("|".join(f"(?:{p})" for p in patterns))
+            self._patterns.setdefault(method, []).insert(0, combined)
+
+    def match(self, req):
+        path = req.path
+        method = req.method
+        if path in self._literals.get(method, ()):
+            return True
+        for pattern in self._patterns.get(method, ()):
+            if pattern.fullmatch(path):
+                return True
+        for endpoint in self._comparators:
+            if endpoint.compare(req):
+                return True
+        return False
 
 
 class GenesisCoreAuthMiddleware(contexts_mw.ContextMiddleware):
@@ -60,6 +170,12 @@ class GenesisCoreAuthMiddleware(contexts_mw.ContextMiddleware):
         context_class=contexts.GenesisCoreAuthContext,
         context_kwargs=None,
         skip_auth_endpoints: list = None,
+        lazy_introspection: bool = False,
+        skip_auth_log_level: tp.Optional[int] = logging.INFO,
+        server_timing: bool = False,
+        timing_sink: tp.Optional[timings.StatsSink] = None,
+        failure_reporter: tp.Optional[failures.FailureReporter] = None,
+        token_prefilter: tp.Optional[tokens.TokenPrefilter] = tokens.DEFAULT_PREFILTER,
     ):
         super().__init__(
             application=application,
@@ -68,16 +184,34 @@ class GenesisCoreAuthMiddleware(contexts_mw.ContextMiddleware):
         )
         self._iam_engine_driver = iam_engine_driver
         self._skip_auth_endpoints = skip_auth_endpoints or []
+        self._skip_auth_router = SkipAuthRouter(self._skip_auth_endpoints)
+        # None disables the "Skip auth" messages of frequently polled
+        # endpoints (health checks, metrics)
+        self._skip_auth_log_level = skip_auth_log_level
+        # Per phase auth timings, as a "Server-Timing" response header
+        # and/or reported to a sink
+        self._server_timing = server_timing
+        self._timing_sink = timing_sink
+        self._timing = server_timing or timing_sink is not None
         self._anon_driver = drivers.AnonDriver()
+        # Junk and expired tokens are rejected before any key lookup or
+        # verification, None disables it
+        self._token_prefilter = token_prefilter
+        # Invalid tokens are counted and logged sampled, see `FailureReporter`
+        self._failure_reporter = failure_reporter or failures.DEFAULT_REPORTER
+        # Introspect tokens only when the request needs it, see `IamEngine`
+        self._engine_class = engines.IamEngine
+        if lazy_introspection:
+            self._engine_class = functools.partial(
+                _LazyIamEngine,
+                failure_reporter=self._failure_reporter,
+            )
 
     def _construct_context(self, req):
         return self._context_class(req=req, **self._context_kwargs)
 
     def _should_skip_auth(self, req):
-        for endpoint in self._skip_auth_endpoints:
-            if endpoint.compare(req):
-                return True
-        return False
+        return self._skip_auth_router.match(req)
 
     def _get_auth_token(self, req):
         header_value = req.headers.get("Authorization", "")
@@ -96,38 +230,61 @@ class GenesisCoreAuthMiddleware(contexts_mw.ContextMiddleware):
     def _get_response(self, ctx, req):
         with ctx.context_manager():
             if self._should_skip_auth(req):
-                LOG.info("Skip auth for %s", req.path)
+                level = self._skip_auth_log_level
+                if level is not None and LOG.isEnabledFor(level):
+                    LOG.log(level, "Skip auth for %s", req.path)
                 return super()._get_response(ctx, req)
             else:
-                auth_token = self._get_auth_token(req)
-                if auth_token is None:
-                    # Create IamEngine with anonymous user data using AnonDriver
-                    iam_context = engines.IamEngine(
-                        auth_token="",
-                        algorithm=None,
-                        driver=self._anon_driver,
-                        otp_code=None,
-                    )
-                else:
-                    try:
-                        token_info = self._get_unverified_token_info(auth_token)
-
-                        algorithm = self._iam_engine_driver.get_algorithm(token_info)
-                        iam_context = engines.IamEngine(
-                            auth_token=auth_token,
-                            algorithm=algorithm,
-                            driver=self._iam_engine_driver,
-                            otp_code=self._get_otp_code(req),
-                        )
-                    except exc.OTPInvalidCodeError:
-                        raise
-                    except Exception:
-                        LOG.exception("Invalid auth token by reason:")
-                        raise exc.InvalidAuthTokenError()
-
-                with ctx.iam_session(iam_context):
-                    req.iam_engine = iam_context
-                    return super()._get_response(ctx, req)
+                timer = timings.PhaseTimer() if self._timing else timings.NULL_TIMER
+                try:
+                    iam_context = self._authenticate(req, timer)
+                    with ctx.iam_session(iam_context):
+                        req.iam_engine = iam_context
+                        response = super()._get_response(ctx, req)
+                finally:
+                    if self._timing_sink is not None:
+                        timer.report(self._timing_sink)
+
+                if self._server_timing and response is not None and timer.phases:
+                    response.headers.add("Server-Timing", timer.server_timing())
+                return response
+
+    def _authenticate(self, req, timer):
+        auth_token = self._get_auth_token(req)
+        if auth_token is None:
+            # Create IamEngine with anonymous user data using AnonDriver
+            return engines.IamEngine(
+                auth_token="",
+                algorithm=None,
+                driver=self._anon_driver,
+                otp_code=None,
+                timer=timer,
+            )
+
+        prefilter = self._token_prefilter
+        with _invalid_auth_token_errors(self._failure_reporter):
+            started = timer.start()
+            if prefilter is not None:
+                prefilter.check_raw(req.headers.get("Authorization", ""), auth_token)
+            token_info = self._get_unverified_token_info(auth_token)
+            timer.stop("parse", started)
+
+        with _invalid_auth_token_errors(self._failure_reporter, token_info):
+            if prefilter is not None:
+                # Unverified claims may only ever reject a token
+                prefilter.check_parsed(token_info)
+
+            started = timer.start()
+            algorithm = self._iam_engine_driver.get_algorithm(token_info)
+            timer.stop("algorithm", started)
+
+            return self._engine_class(
+                auth_token=token_info.parsed_token,
+                algorithm=algorithm,
+                driver=self._iam_engine_driver,
+                otp_code=self._get_otp_code(req),
+                timer=timer,
+            )
 
 
 class ErrorsHandlerMiddleware(errors_mw.ErrorsHandlerMiddleware):
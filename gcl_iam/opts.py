@@ -48,6 +48,47 @@ def register_iam_cli_opts(conf):
             secret=True,
             help="HS256 JWKS decryption key (A256GCM key, base64 or utf-8)",
         ),
+        cfg.IntOpt(
+            "introspection_cache_maxsize",
+            default=1024,
+            min=1,
+            help="Maximum number of cached token introspection results",
+        ),
+        cfg.IntOpt(
+            "introspection_cache_ttl_seconds",
+            default=0,
+            min=0,
+            help=(
+                "Maximum age of a cached token introspection result, it is"
+                " never kept longer than the token itself. 0 disables the cache"
+            ),
+        ),
+        cfg.BoolOpt(
+            "lean_verify",
+            default=False,
+            help=(
+                "Verify token signatures and claims directly"
+                " instead of the generic PyJWT pipeline"
+            ),
+        ),
+        cfg.IntOpt(
+            "verified_token_cache_maxsize",
+            default=0,
+            min=0,
+            help=(
+                "Maximum number of cached successful token signature"
+                " verifications. 0 disables the cache"
+            ),
+        ),
+        cfg.IntOpt(
+            "verified_token_cache_ttl_seconds",
+            default=300,
+            min=1,
+            help=(
+                "Maximum age of a cached token verification, it is never kept"
+                " longer than the token itself"
+            ),
+        ),
     ]
 
     conf.register_cli_opts(iam_cli_opts, DOMAIN_IAM)
@@ -15,17 +15,59 @@
 #    under the License.
 
 
+import functools
+
+
 class Rule:
+    """Immutable `service.resource.permission` rule.
+
+    Rules are hashable and compare by value, so they may be used as keys of
+    decision caches.
+    """
+
+    __slots__ = ("service", "res", "perm", "_hash")
+
     def __init__(self, service, res, perm):
-        self.service = service
-        self.res = res
-        self.perm = perm
+        object.__setattr__(self, "service", service)
+        object.__setattr__(self, "res", res)
+        object.__setattr__(self, "perm", perm)
+        object.__setattr__(self, "_hash", hash((service, res, perm)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (self.__class__, (self.service, self.res, self.perm))
+
+    def __eq__(self, other):
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return (self.service, self.res, self.perm) == (
+            other.service,
+            other.res,
+            other.perm,
+        )
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.service!r}, {self.res!r}, {self.perm!r})"
 
     def __str__(self):
         return f"{self.service}.{self.res}.{self.perm}"
 
     @classmethod
     def from_raw(cls, rule):
-        service, res, perm = rule.split(".", maxsplit=2)
+        """Parse a raw rule, equal raw rules give the same interned object."""
+        return _from_raw(cls, rule)
+
+
+@functools.lru_cache(maxsize=4096)
+def _from_raw(cls, rule):
+    service, res, perm = rule.split(".", maxsplit=2)
 
-        return cls(service, res, perm)
+    return cls(service, res, perm)
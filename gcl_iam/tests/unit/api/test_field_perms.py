@@ -14,10 +14,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+from concurrent import futures
+
 import pytest
 from unittest.mock import Mock, patch
 
 from restalchemy.api import constants
+from gcl_iam import enforcers
 from gcl_iam import rules
 from gcl_iam.api.field_perms import FieldsIamPermissions, Permissions
 
@@ -176,3 +180,71 @@ def test_meets_field_permission_no_permission():
 
         result = permissions.meets_field_permission("field1", mock_req, Permissions.RW)
         assert result is True
+
+
+def test_rule_permissions_are_enforced_once_per_enforcer_and_method():
+    """Test rule based permissions are resolved in bulk and reused"""
+    enforcer = enforcers.Enforcer(["service.resource.read"])
+    mock_context = Mock()
+    mock_context.iam_context.enforcer = enforcer
+
+    fields = {
+        "field1": {constants.ALL: rules.Rule("service", "resource", "read")},
+        "field2": {
+            constants.GET: rules.Rule("service", "resource", "secret"),
+            constants.ALL: Permissions.RO,
+        },
+        "field3": {constants.ALL: Permissions.RW},
+    }
+
+    mock_req = Mock()
+    mock_req.api_context.get_active_method.return_value = constants.GET
+
+    with patch("gcl_iam.api.field_perms.contexts.get_context") as mock_get_context:
+        mock_get_context.return_value = mock_context
+
+        permissions = FieldsIamPermissions(fields=fields)
+        with patch.object(
+            enforcer, "enforce_many", wraps=enforcer.enforce_many
+        ) as enforce_many:
+            for _ in range(3):
+                assert permissions.meets_field_permission(
+                    "field1", mock_req, Permissions.RW
+                )
+                assert not permissions.meets_field_permission(
+                    "field1", mock_req, Permissions.RO
+                )
+                assert permissions.meets_field_permission(
+                    "field2", mock_req, Permissions.HIDDEN
+                )
+
+    assert enforce_many.call_count == 1
+    assert permissions.get_rule_permissions(constants.GET, enforcer) == {
+        "field1": Permissions.RW,
+        "field2": Permissions.HIDDEN,
+    }
+    assert permissions.get_rule_permissions(constants.CREATE, enforcer) == {
+        "field1": Permissions.RW,
+    }
+
+
+def test_rule_permissions_from_many_threads():
+    """Test concurrent requests share one resolved dict per enforcer"""
+    fields = {"field1": {constants.ALL: rules.Rule("service", "resource", "read")}}
+    permissions = FieldsIamPermissions(fields=fields)
+    shared = [
+        enforcers.Enforcer(["service.resource.read"] if i % 2 else []) for i in range(8)
+    ]
+    barrier = threading.Barrier(16)
+
+    def resolve(i):
+        barrier.wait()
+        return permissions.get_rule_permissions(constants.GET, shared[i % 8])
+
+    with futures.ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(resolve, range(16)))
+
+    for i, result in enumerate(results):
+        expected = Permissions.RW if i % 2 else Permissions.HIDDEN
+        assert result == {"field1": expected}
+        assert result is permissions.get_rule_permissions(constants.GET, shared[i % 8])
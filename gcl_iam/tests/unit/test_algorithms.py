@@ -16,12 +16,21 @@
 
 import base64
 import os
+import pickle
+import time
 import unittest.mock as mock
+from concurrent import futures
 
+from cryptography.hazmat.primitives.asymmetric import ec as crypto_ec
+from cryptography.hazmat.primitives.asymmetric import rsa as crypto_rsa
+from cryptography.hazmat.primitives import (
+    serialization as crypto_serialization,
+)
 import jwt
 import pytest
 
 import gcl_iam.algorithms as algorithms
+import gcl_iam.caches as caches
 import gcl_iam.constants as constants
 import gcl_iam.drivers as drivers
 import gcl_iam.exceptions as exceptions
@@ -291,3 +300,661 @@ def test_http_driver_get_introspection_info_audience_mismatch_raises() -> None:
         driver.get_introspection_info(token_info)
 
     assert not driver._client.get.called
+
+
+def test_jwk_thumbprint_rfc7638_example() -> None:
+    jwk = {
+        "kty": "RSA",
+        "n": (
+            "0vx7agoebGcQSuuPiLJXZptN9nndrQmbXEps2aiAFbWhM78LhWx4cbbfAAtVT86zwu1R"
+            "K7aPFFxuhDR1L6tSoc_BJECPebWKRXjBZCiFV4n3oknjhMstn64tZ_2W-5JsGY4Hc5n9"
+            "yBXArwl93lqt7_RN5w6Cf0h4QyQ5v-65YGjQR0_FDW2QvzqY368QQMicAtaSqzs8KJZg"
+            "nYb9c7d0zgdAZHzu6qMQvRL5hajrn1n91CbOpbISD08qNLyrdkt-bFTWhAI4vMQFh6WeZ"
+            "u0fM4lFd2NcRwr3XPksINHaQ-G_xBniIqbw0Ls1jF44-csFCur-kEgU8awapJzKnqDKgw"
+        ),
+        "e": "AQAB",
+        "alg": "RS256",
+        "kid": "2011-04-29",
+    }
+
+    thumbprint = algorithms.jwk_thumbprint(jwk)
+
+    assert thumbprint == "NzbLsXh8uDCcd-6MNwXF4W_7noWXFZAfHkxZsRGC9Xs"
+
+
+def test_public_pem_to_jwk_kid_is_thumbprint() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+
+    jwk = algorithms.public_pem_to_jwk(public_key_pem)
+
+    assert jwk["kid"] == algorithms.jwk_thumbprint(jwk)
+
+
+def test_hs256_encode_sets_kid_header() -> None:
+    algo = algorithms.HS256(key="current")
+
+    token = algo.encode({"sub": "user"})
+
+    assert jwt.get_unverified_header(token)["kid"] == algorithms.hs256_key_id("current")
+
+
+def test_hs256_decode_with_kid_verifies_exactly_one_key() -> None:
+    previous = algorithms.HS256(key="previous")
+    algo = algorithms.HS256(key="current", previous_key="previous")
+    token = previous.encode({"sub": "user"})
+
+    with mock.patch.object(jwt, "decode", wraps=jwt.decode) as jwt_decode:
+        decoded = algo.decode(token)
+
+    assert decoded["sub"] == "user"
+    assert jwt_decode.call_count == 1
+    assert jwt_decode.call_args.kwargs["key"] == "previous"
+
+
+def test_hs256_decode_more_than_two_keys() -> None:
+    algo = algorithms.HS256(
+        key="current",
+        previous_key="previous",
+        additional_keys={"old-1": "older", "old-2": "oldest"},
+    )
+    token = jwt.encode(
+        {"sub": "user"},
+        key="oldest",
+        algorithm=constants.ALGORITHM_HS256,
+        headers={"kid": "old-2"},
+    )
+
+    assert algo.decode(token)["sub"] == "user"
+    assert {"old-1", "old-2"} <= set(algo.key_ids)
+
+
+def test_hs256_decode_unknown_kid_raises() -> None:
+    algo = algorithms.HS256(key="current")
+    token = jwt.encode(
+        {"sub": "user"},
+        key="current",
+        algorithm=constants.ALGORITHM_HS256,
+        headers={"kid": "unknown"},
+    )
+
+    with pytest.raises(exceptions.UnknownKeyIdError):
+        algo.decode(token)
+
+
+def test_hs256_decode_kid_of_wrong_key_raises() -> None:
+    algo = algorithms.HS256(key="current", previous_key="previous")
+    token = jwt.encode(
+        {"sub": "user"},
+        key="current",
+        algorithm=constants.ALGORITHM_HS256,
+        headers={"kid": algorithms.hs256_key_id("previous")},
+    )
+
+    with pytest.raises(exceptions.CredentialsAreInvalidError):
+        algo.decode(token)
+
+
+def test_rs256_encode_sets_kid_from_thumbprint() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(private_key=private_key_pem, public_key=public_key_pem)
+
+    token = algo.encode({"sub": "user"})
+
+    assert (
+        jwt.get_unverified_header(token)["kid"]
+        == algorithms.public_pem_to_jwk(public_key_pem)["kid"]
+    )
+
+
+def _make_rs256_jwks_driver(jwks_payloads) -> drivers.HttpDriver:
+    aes_key_b64 = base64.urlsafe_b64encode(os.urandom(32)).decode().rstrip("=")
+    driver = drivers.HttpDriver(
+        "http://iam.example/",
+        audience="client-1",
+        hs256_jwks_decryption_key=aes_key_b64,
+    )
+    driver._client = mock.Mock()
+    driver._client.get.return_value.json.side_effect = jwks_payloads
+    return driver
+
+
+def test_http_driver_get_algorithm_rs256_indexes_jwks_by_kid() -> None:
+    keys = []
+    for kid in ("key-1", "key-2", "key-3"):
+        private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+        public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+        jwk = algorithms.public_pem_to_jwk(public_key_pem)
+        jwk["kid"] = kid
+        keys.append((private_key_pem, jwk))
+
+    driver = _make_rs256_jwks_driver(
+        [{"algorithm": algorithms.ALGORITHM_RS256, "keys": [k for _, k in keys]}]
+    )
+    token = jwt.encode(
+        {"sub": "user", "aud": "client-1"},
+        key=keys[2][0],
+        algorithm="RS256",
+        headers={"kid": "key-3"},
+    )
+
+    algo = driver.get_algorithm(tokens.UnverifiedToken(token))
+
+    assert {"key-1", "key-2", "key-3"} <= set(algo.key_ids)
+    assert algo.decode(token, ignore_audience=True)["sub"] == "user"
+
+
+def test_http_driver_get_algorithm_unknown_kid_refetches_jwks() -> None:
+    old_private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    old_jwk = algorithms.public_pem_to_jwk(
+        algorithms.generate_rsa_public_key_pem(old_private_key_pem)
+    )
+    new_private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    new_jwk = algorithms.public_pem_to_jwk(
+        algorithms.generate_rsa_public_key_pem(new_private_key_pem)
+    )
+    driver = _make_rs256_jwks_driver(
+        [
+            {"algorithm": algorithms.ALGORITHM_RS256, "keys": [old_jwk]},
+            {"algorithm": algorithms.ALGORITHM_RS256, "keys": [new_jwk, old_jwk]},
+        ]
+    )
+    driver._unknown_kid_refetch_interval_seconds = 0
+    old_token = jwt.encode(
+        {"aud": "client-1"},
+        key=old_private_key_pem,
+        algorithm="RS256",
+        headers={"kid": old_jwk["kid"]},
+    )
+    new_token = jwt.encode(
+        {"aud": "client-1"},
+        key=new_private_key_pem,
+        algorithm="RS256",
+        headers={"kid": new_jwk["kid"]},
+    )
+
+    driver.get_algorithm(tokens.UnverifiedToken(old_token))
+    algo = driver.get_algorithm(tokens.UnverifiedToken(new_token))
+
+    assert driver._client.get.call_count == 2
+    assert new_jwk["kid"] in algo.key_ids
+
+
+def test_http_driver_get_algorithm_unknown_kid_refetch_is_rate_limited() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    jwk = algorithms.public_pem_to_jwk(
+        algorithms.generate_rsa_public_key_pem(private_key_pem)
+    )
+    driver = _make_rs256_jwks_driver(
+        lambda: {"algorithm": algorithms.ALGORITHM_RS256, "keys": [jwk]}
+    )
+    token = jwt.encode(
+        {"aud": "client-1"},
+        key=private_key_pem,
+        algorithm="RS256",
+        headers={"kid": "garbage"},
+    )
+
+    for _ in range(5):
+        driver.get_algorithm(tokens.UnverifiedToken(token))
+
+    assert driver._client.get.call_count == 1
+
+
+def test_rs256_keys_are_loaded_once() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(private_key=private_key_pem, public_key=public_key_pem)
+    token = algo.encode({"sub": "user"})
+
+    with mock.patch.object(jwt, "decode", wraps=jwt.decode) as jwt_decode:
+        with mock.patch.object(jwt, "encode", wraps=jwt.encode) as jwt_encode:
+            algo.encode({"sub": "user"})
+            algo.decode(token)
+
+    assert isinstance(jwt_encode.call_args.kwargs["key"], crypto_rsa.RSAPrivateKey)
+    assert isinstance(jwt_decode.call_args.kwargs["key"], crypto_rsa.RSAPublicKey)
+
+
+def test_rs256_verify_only_accepts_key_object() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    public_key = crypto_serialization.load_pem_public_key(public_key_pem.encode())
+    token = algorithms.RS256(
+        private_key=private_key_pem,
+        public_key=public_key_pem,
+    ).encode({"sub": "user"})
+
+    algo = algorithms.RS256VerifyOnly(public_key=public_key)
+
+    assert algo.decode(token)["sub"] == "user"
+    assert algo.key_ids == algorithms.RS256VerifyOnly(public_key_pem).key_ids
+
+
+def test_hs256_verified_cache_skips_second_verification() -> None:
+    cache = caches.TTLCache(maxsize=10, ttl_seconds=60)
+    algo = algorithms.HS256(key="current", verified_cache=cache)
+    token = algo.encode({"sub": "user", "exp": int(time.time()) + 3600})
+
+    first = algo.decode(token)
+    first["sub"] = "changed"
+    with mock.patch.object(jwt, "decode", wraps=jwt.decode) as jwt_decode:
+        second = algo.decode(token)
+
+    assert second["sub"] == "user"
+    assert not jwt_decode.called
+    assert cache.stats().hits == 1
+
+
+def test_hs256_verified_cache_is_scoped_to_key_set() -> None:
+    cache = caches.TTLCache(maxsize=10, ttl_seconds=60)
+    algo = algorithms.HS256(key="current", verified_cache=cache)
+    token = algo.encode({"sub": "user", "exp": int(time.time()) + 3600})
+    algo.decode(token)
+
+    rotated = algorithms.HS256(key="new", verified_cache=cache)
+
+    with pytest.raises(exceptions.UnknownKeyIdError):
+        rotated.decode(token)
+
+
+def test_hs256_verified_cache_skips_tokens_without_exp() -> None:
+    cache = caches.TTLCache(maxsize=10, ttl_seconds=60)
+    algo = algorithms.HS256(key="current", verified_cache=cache)
+
+    algo.decode(algo.encode({"sub": "user"}))
+
+    assert len(cache) == 0
+
+
+def test_hs256_verified_cache_ttl_capped_by_exp() -> None:
+    cache = caches.TTLCache(maxsize=10, ttl_seconds=60)
+    algo = algorithms.HS256(key="current", verified_cache=cache)
+    token = algo.encode({"sub": "user", "exp": int(time.time()) + 5})
+
+    with mock.patch.object(cache, "set") as cache_set:
+        algo.decode(token)
+
+    assert cache_set.call_args.kwargs["ttl_seconds"] == pytest.approx(5, abs=1)
+
+
+def test_http_driver_key_rotation_evicts_verified_tokens() -> None:
+    first_private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    first_jwk = algorithms.public_pem_to_jwk(
+        algorithms.generate_rsa_public_key_pem(first_private_key_pem)
+    )
+    second_private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    second_jwk = algorithms.public_pem_to_jwk(
+        algorithms.generate_rsa_public_key_pem(second_private_key_pem)
+    )
+    aes_key_b64 = base64.urlsafe_b64encode(os.urandom(32)).decode().rstrip("=")
+    driver = drivers.HttpDriver(
+        "http://iam.example/",
+        audience="client-1",
+        hs256_jwks_decryption_key=aes_key_b64,
+        verified_token_cache_maxsize=10,
+    )
+    driver._client = mock.Mock()
+    driver._client.get.return_value.json.side_effect = [
+        {"algorithm": algorithms.ALGORITHM_RS256, "keys": [first_jwk]},
+        {"algorithm": algorithms.ALGORITHM_RS256, "keys": [second_jwk]},
+    ]
+    token = jwt.encode(
+        {"aud": "client-1", "exp": int(time.time()) + 3600},
+        key=first_private_key_pem,
+        algorithm="RS256",
+        headers={"kid": first_jwk["kid"]},
+    )
+    algo = driver.get_algorithm(tokens.UnverifiedToken(token))
+    algo.decode(token, ignore_audience=True)
+    assert driver.verified_token_cache_stats.size == 1
+
+    driver._jwks.refresh()
+
+    assert driver.verified_token_cache_stats.size == 0
+
+
+@pytest.mark.parametrize(
+    "payload, decode_kwargs",
+    [
+        ({"sub": "user"}, {}),
+        ({"sub": "user", "exp": 1}, {}),
+        ({"sub": "user", "exp": 1}, {"ignore_expiration": True}),
+        ({"sub": "user", "exp": "soon"}, {}),
+        ({"sub": "user", "nbf": 2**40}, {}),
+        ({"sub": "user", "aud": "client"}, {}),
+        ({"sub": "user", "aud": "client"}, {"ignore_audience": True}),
+        ({"sub": "user", "aud": "client"}, {"audience": "client"}),
+        ({"sub": "user", "aud": "client"}, {"audience": "other"}),
+        ({"sub": "user", "exp": 1}, {"verify": False}),
+    ],
+)
+@pytest.mark.parametrize(
+    "signing_key, headers",
+    [
+        ("current", None),
+        ("previous", None),
+        ("unknown", None),
+        ("current", {"alg": "HS512"}),
+    ],
+)
+def test_hs256_decode_parsed_token_same_as_string(
+    payload, decode_kwargs, signing_key, headers
+) -> None:
+    algo = algorithms.HS256(key="current", previous_key="previous")
+    algorithm = (headers or {}).pop("alg", "HS256")
+    token = jwt.encode(payload, key=signing_key, algorithm=algorithm)
+
+    def _decode(data):
+        try:
+            return algo.decode(data, **decode_kwargs)
+        except Exception as e:
+            return type(e)
+
+    assert _decode(tokens.ParsedToken(token)) == _decode(token)
+
+
+def test_rs256_decode_parsed_token() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(private_key=private_key_pem, public_key=public_key_pem)
+    token = algo.encode({"sub": "user"})
+
+    with mock.patch.object(jwt, "decode") as jwt_decode:
+        decoded = algo.decode(tokens.ParsedToken(token))
+
+    assert decoded["sub"] == "user"
+    assert not jwt_decode.called
+
+
+def test_hs256_decode_many_returns_result_per_token() -> None:
+    algo = algorithms.HS256(key="current", kid="current-kid", previous_key="previous")
+    previous_algo = algorithms.HS256(key="previous")
+    batch = [
+        algo.encode({"sub": "a"}),
+        "not-a-token",
+        previous_algo.encode({"sub": "b"}),
+        algorithms.HS256(key="unknown").encode({"sub": "c"}),
+        tokens.ParsedToken(algo.encode({"sub": "d"})),
+        algo.encode({"sub": "e", "exp": 1}),
+    ]
+
+    results = algo.decode_many(batch, chunk_size=1)
+
+    assert [r.ok for r in results] == [True, False, True, False, True, False]
+    assert [r.token_info["sub"] for r in results if r.ok] == ["a", "b", "d"]
+    assert isinstance(results[1].error, exceptions.CredentialsAreInvalidError)
+    assert isinstance(results[3].error, exceptions.UnknownKeyIdError)
+    assert isinstance(results[5].error, jwt.exceptions.ExpiredSignatureError)
+
+
+def test_hs256_decode_many_groups_tokens_by_kid() -> None:
+    first = algorithms.HS256(key="first")
+    second = algorithms.HS256(key="second")
+    algo = algorithms.HS256(key="first", previous_key="second")
+    batch = [
+        first.encode({"n": i}) if i % 2 else second.encode({"n": i}) for i in range(6)
+    ]
+
+    with mock.patch.object(
+        algo, "_decode_chunk", wraps=algo._decode_chunk
+    ) as decode_chunk:
+        results = algo.decode_many(batch)
+
+    assert [r.token_info["n"] for r in results] == list(range(6))
+    assert decode_chunk.call_count == 2
+    for chunk, _ in (c.args for c in decode_chunk.call_args_list):
+        assert len({p.header["kid"] for p in chunk}) == 1
+
+
+def test_rs256_decode_many_thread_pool_same_as_serial() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(private_key=private_key_pem, public_key=public_key_pem)
+    batch = [algo.encode({"n": i}) for i in range(10)] + ["broken"]
+
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = algo.decode_many(batch, executor=executor, chunk_size=3)
+
+    assert [(r.token_info, type(r.error)) for r in results] == [
+        (r.token_info, type(r.error)) for r in algo.decode_many(batch)
+    ]
+    assert [r.token_info["n"] for r in results[:10]] == list(range(10))
+
+
+def test_rs256_pickle_roundtrip() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(
+        private_key=private_key_pem,
+        public_key=public_key_pem,
+        kid="advertised",
+        verified_cache=caches.TTLCache(),
+        lean_verify=True,
+    )
+    token = algo.encode({"sub": "user"})
+    algo.decode(token)
+
+    restored = pickle.loads(pickle.dumps(algo))
+
+    assert restored.decode(token)["sub"] == "user"
+    assert restored.key_ids == algo.key_ids
+    assert len(restored.candidate_keys) == 1
+    assert restored._verified_cache is None
+    assert algo.decode(restored.encode({"sub": "other"}))["sub"] == "other"
+
+
+def test_hs256_decode_many_process_pool() -> None:
+    algo = algorithms.HS256(key="current")
+    batch = [algo.encode({"n": i}) for i in range(4)] + ["broken"]
+
+    with futures.ProcessPoolExecutor(max_workers=2) as executor:
+        results = algo.decode_many(batch, executor=executor, chunk_size=2)
+
+    assert [r.token_info["n"] for r in results[:4]] == list(range(4))
+    assert isinstance(results[4].error, exceptions.CredentialsAreInvalidError)
+
+
+class _PicklingExecutor(futures.Executor):
+    """Runs tasks inline on pickled copies, as a process pool would."""
+
+    def __init__(self):
+        self.pickled = []
+
+    def map(self, fn, *iterables, **kwargs):
+        tasks = [pickle.dumps((fn, args)) for args in zip(*iterables)]
+        self.pickled.extend(tasks)
+        return [fn(*args) for fn, args in map(pickle.loads, tasks)]
+
+
+def test_rs256_decode_many_sends_only_public_keys() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(private_key=private_key_pem, public_key=public_key_pem)
+    batch = [algo.encode({"n": i}) for i in range(4)]
+    private_der = algo._private_key.private_bytes(
+        encoding=crypto_serialization.Encoding.DER,
+        format=crypto_serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=crypto_serialization.NoEncryption(),
+    )
+    executor = _PicklingExecutor()
+
+    results = algo.decode_many(batch, executor=executor, chunk_size=2)
+
+    assert [r.token_info["n"] for r in results] == list(range(4))
+    assert len(executor.pickled) == 2
+    assert all(private_der not in task for task in executor.pickled)
+
+
+def test_rs256_verify_only() -> None:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    algo = algorithms.RS256(
+        private_key=private_key_pem, public_key=public_key_pem, kid="advertised"
+    )
+
+    verifier = algo.verify_only()
+
+    assert type(verifier) is algorithms.RS256VerifyOnly
+    assert not hasattr(verifier, "_private_key")
+    assert verifier.key_set_id == algo.key_set_id
+    assert verifier.decode(algo.encode({"sub": "user"}))["sub"] == "user"
+    with pytest.raises(NotImplementedError):
+        verifier.encode({"sub": "user"})
+    assert verifier.verify_only() is verifier
+
+
+def test_hs256_decode_many_algorithm_process_pool() -> None:
+    algo = algorithms.HS256(key="current")
+    other = algorithms.HS256(key="other")
+    batch = [algo.encode({"n": i}) for i in range(4)] + ["broken"]
+
+    with algorithms.AlgorithmProcessPool(algo, max_workers=2) as executor:
+        # Only a reference is sent along with the chunks, not the secret
+        assert executor.holds(algo)
+        assert not executor.holds(other)
+        assert isinstance(
+            algo._executor_target(executor, verify=True),
+            algorithms._WorkerAlgorithm,
+        )
+        results = algo.decode_many(batch, executor=executor, chunk_size=2)
+        other_results = other.decode_many(batch[:1], executor=executor)
+
+    assert [r.token_info["n"] for r in results[:4]] == list(range(4))
+    assert isinstance(results[4].error, exceptions.CredentialsAreInvalidError)
+    assert isinstance(other_results[0].error, exceptions.CredentialsAreInvalidError)
+
+
+ASYMMETRIC_ALGORITHMS = [
+    pytest.param(
+        algorithms.ES256,
+        algorithms.ES256VerifyOnly,
+        algorithms.generate_es256_private_key_pem,
+        id="ES256",
+    ),
+    pytest.param(
+        algorithms.EdDSA,
+        algorithms.EdDSAVerifyOnly,
+        algorithms.generate_eddsa_private_key_pem,
+        id="EdDSA",
+    ),
+]
+
+
+def _generate_key_pair(generate_private_key_pem):
+    private_key_pem = generate_private_key_pem()
+    return private_key_pem, algorithms.generate_public_key_pem(private_key_pem)
+
+
+@pytest.mark.parametrize(
+    "algorithm_cls, verify_only_cls, generate_private_key_pem",
+    ASYMMETRIC_ALGORITHMS,
+)
+def test_asymmetric_encode_decode_previous_key(
+    algorithm_cls, verify_only_cls, generate_private_key_pem
+) -> None:
+    private_key_pem, public_key_pem = _generate_key_pair(generate_private_key_pem)
+    old_private_key_pem, old_public_key_pem = _generate_key_pair(
+        generate_private_key_pem
+    )
+    old_algo = algorithm_cls(
+        private_key=old_private_key_pem,
+        public_key=old_public_key_pem,
+    )
+    verify_only = verify_only_cls(
+        public_key=public_key_pem,
+        previous_public_key=old_public_key_pem,
+    )
+    algo = algorithm_cls(private_key=private_key_pem, public_key=public_key_pem)
+
+    token = algo.encode({"sub": "user"})
+    old_token = old_algo.encode({"sub": "old"})
+
+    assert jwt.get_unverified_header(token)["alg"] == algo.algorithm
+    assert verify_only.decode(token)["sub"] == "user"
+    assert verify_only.decode(old_token)["sub"] == "old"
+    with pytest.raises(exceptions.UnknownKeyIdError):
+        algo.decode(old_token)
+    with pytest.raises(NotImplementedError):
+        verify_only.encode({"sub": "user"})
+
+
+@pytest.mark.parametrize(
+    "algorithm_cls, verify_only_cls, generate_private_key_pem",
+    ASYMMETRIC_ALGORITHMS,
+)
+def test_asymmetric_public_pem_to_jwk(
+    algorithm_cls, verify_only_cls, generate_private_key_pem
+) -> None:
+    private_key_pem, public_key_pem = _generate_key_pair(generate_private_key_pem)
+    algo = algorithm_cls(private_key=private_key_pem, public_key=public_key_pem)
+
+    jwk = algorithms.public_pem_to_jwk(public_key_pem)
+
+    assert jwk["alg"] == algo.algorithm
+    assert jwk["kid"] == algorithms.public_key_id(public_key_pem)
+    assert jwk["kid"] == jwt.get_unverified_header(algo.encode({}))["kid"]
+    key = jwt.PyJWK(jwk).key
+    assert jwt.decode(algo.encode({"sub": "user"}), key=key, algorithms=[jwk["alg"]])
+
+
+def test_es256_rejects_other_curves() -> None:
+    private_key = crypto_ec.generate_private_key(crypto_ec.SECP384R1())
+    public_key_pem = algorithms.generate_public_key_pem(
+        algorithms._private_key_to_pem(private_key)
+    )
+
+    with pytest.raises(ValueError):
+        algorithms.ES256VerifyOnly(public_key=public_key_pem)
+    with pytest.raises(ValueError):
+        algorithms.public_pem_to_jwk(public_key_pem)
+
+
+def test_asymmetric_rejects_key_of_other_type() -> None:
+    rsa_public_key_pem = algorithms.generate_rsa_public_key_pem(
+        algorithms.generate_rsa_private_key_pem(bitness=2048)
+    )
+
+    with pytest.raises(ValueError):
+        algorithms.EdDSAVerifyOnly(public_key=rsa_public_key_pem)
+
+
+@pytest.mark.parametrize(
+    "algorithm_cls, verify_only_cls, generate_private_key_pem",
+    ASYMMETRIC_ALGORITHMS,
+)
+def test_http_driver_get_algorithm_asymmetric_jwks_payload_ok(
+    algorithm_cls, verify_only_cls, generate_private_key_pem
+) -> None:
+    keys = [_generate_key_pair(generate_private_key_pem) for _ in range(2)]
+    jwks = [algorithms.public_pem_to_jwk(public_key) for _, public_key in keys]
+    driver = _make_rs256_jwks_driver(
+        [{"algorithm": verify_only_cls(keys[0][1]).algorithm, "keys": jwks}]
+    )
+    token_info = mock.Mock(spec=tokens.UnverifiedToken)
+    token_info.audience_name = "client-1"
+    token_info.key_id = None
+
+    algo = driver.get_algorithm(token_info)
+
+    assert isinstance(algo, verify_only_cls)
+    assert algo.key_ids == {jwk["kid"] for jwk in jwks}
+    for private_key, public_key in keys:
+        signer = algorithm_cls(private_key=private_key, public_key=public_key)
+        assert algo.decode(signer.encode({"sub": "user"}))["sub"] == "user"
+
+
+@pytest.mark.parametrize(
+    "algorithm_cls, verify_only_cls, generate_private_key_pem",
+    ASYMMETRIC_ALGORITHMS,
+)
+def test_asymmetric_pickle_roundtrip(
+    algorithm_cls, verify_only_cls, generate_private_key_pem
+) -> None:
+    private_key_pem, public_key_pem = _generate_key_pair(generate_private_key_pem)
+    algo = algorithm_cls(private_key=private_key_pem, public_key=public_key_pem)
+
+    restored = pickle.loads(pickle.dumps(algo))
+
+    assert algo.decode(restored.encode({"sub": "user"}))["sub"] == "user"
@@ -0,0 +1,214 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Differential tests: lean verification must decide exactly like PyJWT."""
+
+import random
+import time
+import unittest.mock as mock
+
+import jwt
+import pytest
+
+import gcl_iam.algorithms as algorithms
+import gcl_iam.tokens as tokens
+
+HS256_KEY = "current-secret-key-of-at-least-32-bytes"
+HS256_PREVIOUS_KEY = "previous-secret-key-of-at-least-32-bytes"
+HS256_WRONG_KEY = "unknown-secret-key-of-at-least-32-bytes"
+
+_MISSING = object()
+_NOW = int(time.time())
+CLAIM_VALUES = {
+    "exp": [_MISSING, _NOW + 600, _NOW - 600, _NOW + 600.5, _NOW - 0.5, "x", None],
+    "iat": [_MISSING, _NOW - 60, _NOW + 600, _NOW - 60.5, "x"],
+    "nbf": [_MISSING, _NOW - 60, _NOW + 600, "x"],
+    "aud": [_MISSING, "client", "other", ["client"], ["other", 1], "", None],
+    "sub": [_MISSING, "user", 5],
+    "jti": [_MISSING, "jti", 5],
+}
+DECODE_KWARGS = [
+    {},
+    {"ignore_audience": True},
+    {"ignore_expiration": True},
+    {"ignore_audience": True, "ignore_expiration": True},
+    {"audience": "client"},
+    {"audience": "client", "ignore_expiration": True},
+    {"verify": False},
+    {"verify": False, "ignore_audience": True, "ignore_expiration": True},
+]
+
+
+def _random_payload(rnd: random.Random) -> dict:
+    payload = {}
+    for claim, values in CLAIM_VALUES.items():
+        value = rnd.choice(values)
+        if value is not _MISSING:
+            payload[claim] = value
+    return payload
+
+
+def _outcome(algo, data, kwargs):
+    try:
+        return algo.decode(data, **kwargs)
+    except Exception as e:
+        return type(e)
+
+
+def _assert_same_decisions(reference, lean, token, kwargs) -> None:
+    expected = _outcome(reference, token, kwargs)
+
+    assert _outcome(lean, token, kwargs) == expected
+    assert _outcome(lean, tokens.ParsedToken(token), kwargs) == expected
+
+
+def _hs256_tokens(rnd: random.Random):
+    current = algorithms.HS256(key=HS256_KEY)
+    for _ in range(1500):
+        payload = _random_payload(rnd)
+        variant = rnd.randrange(6)
+        if variant == 0:
+            yield current.encode(payload)
+        elif variant == 1:
+            yield jwt.encode(payload, key=HS256_PREVIOUS_KEY, algorithm="HS256")
+        elif variant == 2:
+            yield jwt.encode(payload, key=HS256_WRONG_KEY, algorithm="HS256")
+        elif variant == 3:
+            yield jwt.encode(payload, key=HS256_KEY, algorithm="HS512")
+        elif variant == 4:
+            yield jwt.encode(
+                payload,
+                key=HS256_WRONG_KEY,
+                algorithm="HS256",
+                headers={"kid": "unknown"},
+            )
+        else:
+            token = current.encode(payload)
+            yield token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+
+
+def test_hs256_lean_verify_same_decisions_as_pyjwt() -> None:
+    rnd = random.Random(7)
+    reference = algorithms.HS256(key=HS256_KEY, previous_key=HS256_PREVIOUS_KEY)
+    lean = algorithms.HS256(
+        key=HS256_KEY,
+        previous_key=HS256_PREVIOUS_KEY,
+        lean_verify=True,
+    )
+
+    for token in _hs256_tokens(rnd):
+        _assert_same_decisions(reference, lean, token, rnd.choice(DECODE_KWARGS))
+
+
+@pytest.fixture(scope="module")
+def rsa_keys():
+    keys = []
+    for _ in range(3):
+        private_key = algorithms.generate_rsa_private_key_pem(bitness=2048)
+        keys.append((private_key, algorithms.generate_rsa_public_key_pem(private_key)))
+    return keys
+
+
+def test_rs256_lean_verify_same_decisions_as_pyjwt(rsa_keys) -> None:
+    rnd = random.Random(11)
+    (current_private, current_public), (previous_private, previous_public) = rsa_keys[
+        :2
+    ]
+    wrong_private = rsa_keys[2][0]
+    signing_keys = [
+        algorithms._load_rsa_private_key(k)
+        for k in (current_private, previous_private, wrong_private)
+    ]
+    reference = algorithms.RS256(
+        private_key=current_private,
+        public_key=current_public,
+        previous_public_key=previous_public,
+    )
+    lean = algorithms.RS256(
+        private_key=current_private,
+        public_key=current_public,
+        previous_public_key=previous_public,
+        lean_verify=True,
+    )
+
+    for _ in range(300):
+        payload = _random_payload(rnd)
+        signing_key = rnd.choice(signing_keys)
+        token = jwt.encode(payload, key=signing_key, algorithm="RS256")
+        _assert_same_decisions(reference, lean, token, rnd.choice(DECODE_KWARGS))
+
+        token = reference.encode(payload)
+        _assert_same_decisions(reference, lean, token, rnd.choice(DECODE_KWARGS))
+
+
+@pytest.mark.parametrize(
+    "algorithm_cls, generate_private_key_pem",
+    [
+        (algorithms.ES256, algorithms.generate_es256_private_key_pem),
+        (algorithms.EdDSA, algorithms.generate_eddsa_private_key_pem),
+    ],
+)
+def test_asymmetric_lean_verify_same_decisions_as_pyjwt(
+    algorithm_cls, generate_private_key_pem
+) -> None:
+    rnd = random.Random(13)
+    keys = []
+    for _ in range(3):
+        private_key = generate_private_key_pem()
+        keys.append((private_key, algorithms.generate_public_key_pem(private_key)))
+    (current_private, current_public), (_, previous_public) = keys[:2]
+    reference = algorithm_cls(
+        private_key=current_private,
+        public_key=current_public,
+        previous_public_key=previous_public,
+    )
+    lean = algorithm_cls(
+        private_key=current_private,
+        public_key=current_public,
+        previous_public_key=previous_public,
+        lean_verify=True,
+    )
+    signers = [
+        algorithm_cls(private_key=private_key, public_key=public_key)
+        for private_key, public_key in keys
+    ]
+
+    for _ in range(300):
+        payload = _random_payload(rnd)
+        token = rnd.choice(signers).encode(payload)
+        if rnd.random() < 0.2:
+            token = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+        _assert_same_decisions(reference, lean, token, rnd.choice(DECODE_KWARGS))
+
+
+def test_lean_verify_does_not_call_pyjwt() -> None:
+    algo = algorithms.HS256(key=HS256_KEY, lean_verify=True)
+    token = algo.encode({"sub": "user", "aud": "client", "exp": _NOW + 600})
+
+    with mock.patch.object(jwt, "decode") as jwt_decode:
+        decoded = algo.decode(token, audience="client")
+
+    assert decoded["sub"] == "user"
+    assert not jwt_decode.called
+
+
+def test_lean_verify_rejects_asymmetric_key_as_hmac_secret(rsa_keys) -> None:
+    public_key = rsa_keys[0][1]
+    algo = algorithms.HS256(key=public_key, lean_verify=True)
+    token = jwt.encode({"sub": "user"}, key="secret", algorithm="HS256")
+
+    with pytest.raises(jwt.exceptions.InvalidKeyError):
+        algo.decode(token)
@@ -0,0 +1,89 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import pytest
+
+import gcl_iam.caches as caches
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_get_set_counts_hits_and_misses() -> None:
+    cache = caches.TTLCache(maxsize=2, ttl_seconds=10)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+    assert stats.hit_ratio == 0.5
+
+
+def test_ttl_cache_entry_expires() -> None:
+    timer = FakeTimer()
+    cache = caches.TTLCache(maxsize=2, ttl_seconds=10, timer=timer)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=30)
+    timer.now += 11
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_ttl_cache_non_positive_ttl_is_not_stored() -> None:
+    cache = caches.TTLCache(maxsize=2, ttl_seconds=10)
+
+    cache.set("a", 1, ttl_seconds=0)
+
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache = caches.TTLCache(maxsize=2, ttl_seconds=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_evict_by_predicate() -> None:
+    cache = caches.TTLCache(maxsize=10, ttl_seconds=10)
+    for i in range(4):
+        cache.set(("scope", i % 2, i), i)
+
+    assert cache.evict(lambda k: k[1] == 0) == 2
+    assert len(cache) == 2
+
+
+def test_ttl_cache_invalid_maxsize() -> None:
+    with pytest.raises(ValueError):
+        caches.TTLCache(maxsize=0)
@@ -0,0 +1,117 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import random
+from unittest import mock
+
+import pytest
+
+from gcl_iam import catalogs
+from gcl_iam import enforcers
+from gcl_iam import rules
+
+SEGMENTS = ["*", "a", "b", "c"]
+GLOB_SEGMENTS = SEGMENTS + ["a*", "*c"]
+CATALOG_SEGMENTS = ["a", "b", "c", "d"]
+
+
+def _catalog() -> catalogs.PermissionCatalog:
+    return catalogs.PermissionCatalog(
+        f"{s}.{r}.{p}"
+        for s in CATALOG_SEGMENTS
+        for r in CATALOG_SEGMENTS
+        for p in CATALOG_SEGMENTS
+    )
+
+
+def test_catalog_assigns_indexes() -> None:
+    catalog = catalogs.PermissionCatalog(["svc.vm.read", "svc.vm.create"])
+
+    assert catalog.add(rules.Rule("svc", "vm", "read")) == 0
+    assert catalog.add("svc.net.read") == 2
+    assert catalog.index("svc.vm.create") == 1
+    assert catalog.index("svc.vm.delete") is None
+    assert "svc.net.read" in catalog
+    assert len(catalog) == 3
+    assert catalog.rules == ("svc.vm.read", "svc.vm.create", "svc.net.read")
+    with pytest.raises(ValueError):
+        catalog.add("svc.*.read")
+    with pytest.raises(ValueError):
+        catalog.add("svc.vm_*.read")
+
+
+@pytest.mark.parametrize("segments", [SEGMENTS, GLOB_SEGMENTS])
+def test_compile_same_decisions_as_enforcer(segments) -> None:
+    rnd = random.Random(3)
+    catalog = _catalog()
+
+    for _ in range(300):
+        perms = [
+            ".".join(rnd.choice(segments) for _ in range(3))
+            for _ in range(rnd.randrange(6))
+        ]
+        enforcer = enforcers.Enforcer(perms)
+        mask = catalog.compile(perms)
+        catalog_enforcer = catalogs.CatalogEnforcer(perms, catalog)
+
+        assert catalog_enforcer.mask == mask
+        for rule in catalog.rules:
+            expected = enforcer.enforce_raw(rule)
+            assert catalog.enforce(mask, rule) is expected, (perms, rule)
+            assert catalog_enforcer.enforce_raw(rule) is expected, (perms, rule)
+
+
+def test_catalog_enforcer_falls_back_for_unknown_rules() -> None:
+    catalog = catalogs.PermissionCatalog(["svc.vm.read"])
+    enforcer = catalogs.CatalogEnforcer(["svc.*.*"], catalog)
+    catalog.add("svc.vm.create")
+
+    assert enforcer.enforce_raw("svc.vm.read")
+    assert enforcer.enforce_raw("svc.vm.create")
+    assert enforcer.enforce_raw("svc.net.list")
+    assert not enforcer.enforce_raw("other.net.list")
+    assert catalog.enforce(enforcer.mask, "svc.net.list") == enforcers.Grant.DENY
+
+
+def test_who_can_with_int_masks() -> None:
+    catalog = _catalog()
+    masks = [catalog.compile(p) for p in (["a.a.*"], ["a.*.*"], ["b.b.b"], [])]
+
+    assert catalog.who_can(masks, ["a.a.a"]) == [True, True, False, False]
+    assert catalog.who_can(masks, ["a.a.a", "a.b.c"]) == [False, True, False, False]
+    assert catalog.who_can(masks, []) == [True, True, True, True]
+
+
+def test_who_can_with_numpy_bitset() -> None:
+    pytest.importorskip("numpy")
+    catalog = _catalog()
+    perm_sets = [["a.a.*"], ["a.*.*"], ["d.d.d"], ["*.*.*"], []]
+    masks = [catalog.compile(p) for p in perm_sets]
+
+    bitset = catalog.to_bitset(masks)
+
+    # 64 catalog rules fit exactly into one word, "d.d.d" is the last bit
+    assert bitset.shape == (5, 1)
+    for required in (["a.a.a"], ["a.a.a", "a.b.c"], ["d.d.d"], []):
+        assert catalog.who_can(bitset, required).tolist() == catalog.who_can(
+            masks, required
+        )
+
+
+def test_bitset_requires_numpy() -> None:
+    with mock.patch.object(catalogs, "np", None):
+        with pytest.raises(ImportError):
+            _catalog().to_bitset([0])
@@ -21,9 +21,12 @@ from unittest import mock
 
 from restalchemy.api import constants
 from restalchemy.common import contexts
+from restalchemy.dm import filters
 
 from gcl_iam.api import controllers
+from gcl_iam import enforcers
 from gcl_iam import exceptions
+from gcl_iam import rules
 
 FAKE_PROJECT_ID = uuid.UUID("fbe1fc09-e4cc-4cd2-a51d-c823b40155b2")
 FAKE_PROJECT_ID_2 = uuid.UUID("29885802-c8b9-42d5-806f-6ecc1c943bbb")
@@ -165,6 +168,52 @@ class TestPolicyBasedControllerMixin:
 
         assert kwargs == {"project_id": FAKE_PROJECT_ID}
 
+    def test_enforce_many_does_not_raise(self, user_context):
+        contexts.get_context().iam_context.enforcer = enforcers.Enforcer(
+            ["service.vm.read", "service.vm.update"]
+        )
+        pc = FakeController()
+
+        grants = pc._enforce_many(["read", "delete", "update", "read"])
+
+        assert grants == [
+            enforcers.Grant.ALLOW,
+            enforcers.Grant.DENY,
+            enforcers.Grant.ALLOW,
+            enforcers.Grant.ALLOW,
+        ]
+
+    def test_policy_rules_are_cached_per_class(self, user_context):
+        class OtherController(FakeController):
+            __policy_name__ = "net"
+
+        pc = FakeController()
+        rule = pc._get_policy_rule("read")
+
+        assert rule is FakeController()._get_policy_rule("read")
+        assert rule == rules.Rule("service", "vm", "read")
+        assert OtherController()._get_policy_rule("read") == rules.Rule(
+            "service", "net", "read"
+        )
+        assert pc._get_policy_rule("read") is rule
+        assert pc._get_policy_rule("other") == rules.Rule("service", "vm", "other")
+
+    def test_policy_rules_follow_late_policy_names(self, user_context):
+        class LateController(FakeController):
+            __policy_service_name__ = ""
+            __policy_name__ = None
+
+        assert LateController()._get_policy_rule("read") == rules.Rule(
+            "", "default", "read"
+        )
+
+        LateController.__policy_service_name__ = "service"
+        LateController.__policy_name__ = "vm"
+
+        assert LateController()._get_policy_rule("read") == rules.Rule(
+            "service", "vm", "read"
+        )
+
 
 class TestPolicyBasedCheckOtpController:
     def test_check_otp_verified_true(self, otp_enabled_context):
@@ -184,3 +233,65 @@ class TestPolicyBasedCheckOtpController:
     def test_check_otp_mandatory_off(self, otp_not_enabled_context):
         pc = controllers.PolicyBasedCheckOtpController(request=mock.Mock())
         pc._check_otp(constants.FILTER)
+
+
+class KindController(controllers.PolicyBasedController):
+    __policy_service_name__ = "service"
+    __policy_name__ = "vm"
+    __policy_resource_field__ = "kind"
+
+
+def _filter_kinds(perms, rows, filters=None):
+    contexts.get_context().iam_context.enforcer = enforcers.Enforcer(perms)
+    pc = KindController(request=mock.Mock())
+    with mock.patch.object(
+        controllers.controllers.BaseResourceController,
+        "filter",
+        return_value=[mock.Mock(kind=kind) for kind in rows],
+    ) as base_filter:
+        result = pc.filter(filters or {})
+    return base_filter.call_args[0][0], [dm.kind for dm in result]
+
+
+class TestPolicyBasedControllerFilter:
+    def test_filter_pushes_down_allowed_resources(self, user_context):
+        storage_filters, kinds = _filter_kinds(
+            ["service.vm.read", "service.disk.read", "service.net.create"],
+            ["vm", "disk"],
+        )
+
+        assert storage_filters == {
+            "kind": filters.In(["disk", "vm"]),
+            "project_id": FAKE_PROJECT_ID,
+        }
+        assert kinds == ["vm", "disk"]
+
+    def test_filter_any_resource_unscoped(self, user_context):
+        user_context.return_value["project_id"] = None
+
+        storage_filters, _ = _filter_kinds(["service.*.read"], ["vm"])
+
+        assert storage_filters == {}
+
+    def test_filter_checks_rows_with_globs(self, user_context):
+        storage_filters, kinds = _filter_kinds(
+            ["service.vm_*.read", "service.disk.read"],
+            ["vm_small", "disk", "net"],
+        )
+
+        assert "kind" not in storage_filters
+        assert kinds == ["vm_small", "disk"]
+
+    def test_filter_keeps_resource_filter(self, user_context):
+        storage_filters, kinds = _filter_kinds(
+            ["service.vm.read"],
+            ["vm", "disk"],
+            {"kind": filters.EQ("disk")},
+        )
+
+        assert storage_filters["kind"] == filters.EQ("disk")
+        assert kinds == ["vm"]
+
+    def test_filter_forbidden(self, user_context):
+        with pytest.raises(exceptions.PolicyNotAuthorized):
+            _filter_kinds(["service.vm.create"], [])
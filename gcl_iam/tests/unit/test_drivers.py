@@ -0,0 +1,125 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import time
+import unittest.mock as mock
+import uuid as sys_uuid
+
+import pytest
+
+import gcl_iam.algorithms as algorithms
+import gcl_iam.drivers as drivers
+import gcl_iam.tokens as tokens
+
+AUDIENCE = "client-1"
+INTROSPECTION = {
+    "user_info": {"uuid": "00000000-0000-0000-0000-000000000000"},
+    "project_id": None,
+    "otp_verified": False,
+    "permissions": ["*.*.*"],
+}
+
+
+def _make_driver(**kwargs) -> drivers.HttpDriver:
+    driver = drivers.HttpDriver(
+        "http://iam.example/",
+        audience=AUDIENCE,
+        hs256_jwks_decryption_key="A" * 43,
+        **kwargs,
+    )
+    driver._client = mock.Mock()
+    driver._client.get.return_value.json.side_effect = lambda: copy.deepcopy(
+        INTROSPECTION
+    )
+    return driver
+
+
+def _make_auth_token(exp_delta: int = 3600, jti=None) -> tokens.AuthToken:
+    algo = algorithms.HS256(key="secret")
+    token = algo.encode(
+        {
+            "jti": jti or str(sys_uuid.uuid4()),
+            "aud": AUDIENCE,
+            "exp": int(time.time()) + exp_delta,
+        }
+    )
+    return tokens.AuthToken(token, algo, ignore_audience=True)
+
+
+def test_http_driver_introspection_cache_disabled_by_default() -> None:
+    driver = _make_driver()
+    token_info = _make_auth_token()
+
+    driver.get_introspection_info(token_info)
+    driver.get_introspection_info(token_info)
+
+    assert driver._client.get.call_count == 2
+    assert driver.introspection_cache_stats is None
+
+
+def test_http_driver_introspection_cache_hit() -> None:
+    driver = _make_driver(introspection_cache_ttl_seconds=60)
+    token_info = _make_auth_token()
+
+    first = driver.get_introspection_info(token_info)
+    first["otp_enabled"] = True
+    first["permissions"].append("svc.vm.delete")
+    first["user_info"]["uuid"] = "forged"
+    second = driver.get_introspection_info(token_info)
+    second["permissions"].append("svc.vm.create")
+    third = driver.get_introspection_info(token_info)
+
+    assert driver._client.get.call_count == 1
+    assert third == INTROSPECTION
+    stats = driver.introspection_cache_stats
+    assert (stats.hits, stats.misses) == (2, 1)
+
+
+def test_http_driver_introspection_cache_skips_otp_codes() -> None:
+    driver = _make_driver(introspection_cache_ttl_seconds=60)
+    token_info = _make_auth_token()
+
+    # Every OTP code must be checked by IAM, otherwise it could be replayed
+    driver.get_introspection_info(token_info, otp_code=123456)
+    driver.get_introspection_info(token_info, otp_code=123456)
+    assert driver._client.get.call_count == 2
+
+    driver.get_introspection_info(token_info)
+    driver.get_introspection_info(token_info)
+    assert driver._client.get.call_count == 3
+
+
+def test_http_driver_introspection_cache_ttl_capped_by_exp() -> None:
+    driver = _make_driver(introspection_cache_ttl_seconds=60)
+    token_info = _make_auth_token(exp_delta=5)
+
+    with mock.patch.object(driver._introspection_cache, "set") as cache_set:
+        driver.get_introspection_info(token_info)
+
+    # `exp` is truncated to whole seconds, so 4 < TTL <= 5 minus the test time
+    assert cache_set.call_args.kwargs["ttl_seconds"] == pytest.approx(4.5, abs=1)
+
+
+def test_http_driver_introspection_cache_skips_unverified_tokens() -> None:
+    driver = _make_driver(introspection_cache_ttl_seconds=60)
+    token = _make_auth_token().token
+    token_info = tokens.UnverifiedToken(token)
+
+    driver.get_introspection_info(token_info)
+    driver.get_introspection_info(token_info)
+
+    assert driver._client.get.call_count == 2
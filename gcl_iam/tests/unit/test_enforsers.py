@@ -15,9 +15,14 @@
 #    under the License.
 
 import collections
+import fnmatch
+import random
 
 import pytest
-from gcl_iam.enforcers import Enforcer, Grant
+from unittest import mock
+
+from gcl_iam import enforcers
+from gcl_iam.enforcers import CompiledEnforcer, Enforcer, Grant
 from gcl_iam import exceptions
 from gcl_iam import rules
 
@@ -121,3 +126,309 @@ def test_enforce_multiple_permissions():
     result = enforcer.enforce_raw("genesis_core.vm.*")
 
     assert result == Grant.ALLOW
+
+
+SEGMENTS = ["*", "a", "b", "c"]
+PERM_SEGMENTS = ["*", "a", "b", "c", "a.b", "*.a"]
+
+
+def _random_perms(rnd):
+    return [
+        ".".join(
+            (rnd.choice(SEGMENTS), rnd.choice(SEGMENTS), rnd.choice(PERM_SEGMENTS))
+        )
+        for _ in range(rnd.randrange(8))
+    ]
+
+
+def test_compiled_enforcer_same_decisions_as_enforcer():
+    rnd = random.Random(5)
+
+    for _ in range(500):
+        perms = _random_perms(rnd)
+        enforcer = Enforcer(perms)
+        compiled = CompiledEnforcer(perms, memo_maxsize=8)
+
+        for service in SEGMENTS:
+            for res in SEGMENTS:
+                for perm in PERM_SEGMENTS:
+                    raw = f"{service}.{res}.{perm}"
+                    expected = enforcer.enforce_raw(raw)
+                    # Twice to go through the memo as well
+                    for _ in range(2):
+                        assert compiled.enforce_raw(raw) is expected, (perms, raw)
+                        assert (
+                            compiled.enforce(rules.Rule(service, res, perm)) is expected
+                        ), (perms, raw)
+
+
+def test_compiled_enforcer_raises_like_enforcer():
+    compiled = CompiledEnforcer(perms)
+
+    with pytest.raises(exceptions.PolicyNotAuthorized) as excinfo:
+        compiled.enforce_raw("genesis_core.resource.other", do_raise=True)
+    with pytest.raises(KeyError):
+        compiled.enforce(
+            rules.Rule("genesis_core", "resource", "other"),
+            do_raise=True,
+            exc=lambda rule: KeyError(rule),
+        )
+    with pytest.raises(ValueError):
+        compiled.enforce_raw("genesis_core.resource")
+
+    assert "genesis_core.resource.other" in str(excinfo.value)
+    assert compiled.enforce_raw("genesis_core.vm.create", do_raise=True)
+
+
+def test_compiled_enforcer_memo_is_bounded():
+    compiled = CompiledEnforcer(perms, memo_maxsize=2)
+
+    for perm in ("a", "b", "c", "d"):
+        compiled.enforce(rules.Rule("genesis_core", "vm", perm))
+
+    assert len(compiled._memo) <= 2
+
+
+@pytest.mark.parametrize("enforcer_class", [Enforcer, CompiledEnforcer])
+def test_enforce_many_deduplicates_rules(enforcer_class):
+    enforcer = enforcer_class(perms)
+    batch = [
+        rules.Rule("genesis_core", "vm", "delete"),
+        rules.Rule("genesis_core", "resource", "other"),
+        rules.Rule("genesis_core", "vm", "delete"),
+        "service.resource.action",
+        "service.resource.other",
+        "service.resource.action",
+    ]
+
+    with mock.patch.object(
+        enforcer, "enforce_raw", wraps=enforcer.enforce_raw
+    ) as enforce_raw:
+        with mock.patch.object(enforcer, "enforce", wraps=enforcer.enforce) as enforce:
+            grants = enforcer.enforce_many(batch)
+
+    assert grants == [
+        Grant.ALLOW,
+        Grant.DENY,
+        Grant.ALLOW,
+        Grant.ALLOW,
+        Grant.DENY,
+        Grant.ALLOW,
+    ]
+    assert enforce_raw.call_count == 2
+    rule_calls = [c for c in enforce.call_args_list if c.args[0].service != "service"]
+    assert len(rule_calls) == 2
+
+
+def test_enforce_many_empty():
+    assert Enforcer(perms).enforce_many([]) == []
+
+
+def test_enforce_matrix():
+    np = pytest.importorskip("numpy")
+    registry = enforcers.EnforcerRegistry()
+    users = [
+        registry.get(["svc.vm.read"]),
+        registry.get(["svc.*.*"]),
+        registry.get(["svc.vm.read"]),
+    ]
+    batch = ["svc.vm.read", rules.Rule("svc", "vm", "delete"), "svc.vm.read"]
+
+    matrix = enforcers.enforce_matrix(users, batch)
+
+    assert matrix.dtype == np.bool_
+    assert matrix.tolist() == [
+        [True, False, True],
+        [True, True, True],
+        [True, False, True],
+    ]
+    assert enforcers.enforce_matrix([], batch).shape == (0, 3)
+    assert enforcers.enforce_matrix(users, []).shape == (3, 0)
+
+
+def test_enforce_matrix_accepts_iterators():
+    np = pytest.importorskip("numpy")
+    users = [Enforcer(["svc.vm.read"]), Enforcer(["svc.*.*"])]
+
+    matrix = enforcers.enforce_matrix(iter(users), (r for r in ["svc.vm.delete"]))
+
+    assert matrix.dtype == np.bool_
+    assert matrix.tolist() == [[False], [True]]
+
+
+def test_matrix_indexes():
+    reader = Enforcer(["svc.vm.read"])
+    admin = Enforcer(["*.*.*"])
+    batch = ["svc.vm.read", rules.Rule("svc", "vm", "read"), "svc.vm.delete"]
+
+    # Single pass iterators, as generators given to `enforce_matrix`
+    rows, unique_enforcers, columns, unique_rules = enforcers._matrix_indexes(
+        iter([reader, admin, reader]),
+        iter(batch),
+    )
+
+    assert rows == [0, 1, 0]
+    assert unique_enforcers == [reader, admin]
+    assert columns == [0, 1, 2]
+    assert unique_rules == batch
+
+
+def test_enforce_matrix_requires_numpy():
+    with mock.patch.object(enforcers, "np", None):
+        with pytest.raises(ImportError):
+            enforcers.enforce_matrix([Enforcer(perms)], ["a.b.c"])
+
+
+def test_enforce_globs():
+    enforcer = Enforcer(["compute.vm_*.read", "network.*.list*", "*_admin.*.*"])
+
+    for raw in (
+        "compute.vm_disk.read",
+        "compute.vm_.read",
+        "network.port.list",
+        "network.port.list_all",
+        "iam_admin.user.delete",
+    ):
+        assert enforcer.enforce_raw(raw) == Grant.ALLOW, raw
+    for raw in (
+        "compute.vm.read",
+        "compute.disk_vm_x.read",
+        "compute.vm_disk.update",
+        "network.port.get_list",
+        "iam.user.delete",
+    ):
+        assert enforcer.enforce_raw(raw) == Grant.DENY, raw
+
+
+def test_star_level_shadows_globs():
+    # Like exact keys, globs are shadowed by a "*" of the same level
+    enforcer = Enforcer(["compute.vm_*.read", "compute.*.list"])
+
+    assert enforcer.enforce_raw("compute.vm_disk.read") == Grant.DENY
+    assert enforcer.enforce_raw("compute.vm_disk.list") == Grant.ALLOW
+
+
+def test_glob_trie_match():
+    trie = enforcers.GlobTrie(["vm_*", "vm_d*", "*_disk", "x*", "vm_*"])
+
+    assert len(trie) == 4
+    assert sorted(trie.match("vm_disk")) == ["*_disk", "vm_*", "vm_d*"]
+    assert trie.match("vm_") == ["vm_*"]
+    assert trie.match("vm") == []
+    assert trie.match("") == []
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("vm_*", True),
+        ("*_admin", True),
+        ("*", False),
+        ("vm", False),
+        ("*vm*", False),
+        ("v*m", False),
+    ],
+)
+def test_is_glob(name, expected):
+    assert enforcers.is_glob(name) is expected
+
+
+GLOB_SEGMENTS = ["*", "a", "ab", "ba", "a*", "*a", "b*", "a*b"]
+GLOB_NAMES = ["a", "ab", "ba", "b", "aab", "a*", "a*b", "*"]
+
+
+def _reference_decision(perms, service, res, perm):
+    # Naive linear scan of what `Enforcer` is expected to decide
+    levels = {}
+    for p in perms:
+        s, r, a = p.split(".", maxsplit=2)
+        if "*" in levels:
+            s = "*"
+        resources = levels.setdefault(s, {})
+        if "*" in resources:
+            r = "*"
+        resources.setdefault(r, set()).add(a)
+
+    def keys(level, name):
+        if "*" in level:
+            return ["*"]
+        return [
+            key
+            for key in level
+            if key == name or enforcers.is_glob(key) and fnmatch.fnmatchcase(name, key)
+        ]
+
+    for s in keys(levels, service):
+        for r in keys(levels[s], res):
+            actions = levels[s][r]
+            if "*" in actions or any(
+                a == perm or enforcers.is_glob(a) and fnmatch.fnmatchcase(perm, a)
+                for a in actions
+            ):
+                return Grant.ALLOW
+    return Grant.DENY
+
+
+def test_globs_same_decisions_as_reference():
+    rnd = random.Random(17)
+
+    for _ in range(300):
+        perms = [
+            ".".join(rnd.choice(GLOB_SEGMENTS) for _ in range(3))
+            for _ in range(rnd.randrange(8))
+        ]
+        enforcer = Enforcer(perms)
+        compiled = CompiledEnforcer(perms, memo_maxsize=8)
+
+        for _ in range(60):
+            service, res, perm = (rnd.choice(GLOB_NAMES) for _ in range(3))
+            expected = _reference_decision(perms, service, res, perm)
+            rule = rules.Rule(service, res, perm)
+
+            assert enforcer.enforce(rule) is expected, (perms, rule)
+            assert compiled.enforce(rule) is expected, (perms, rule)
+
+
+def test_compiled_enforcer_granted_perms_with_globs():
+    compiled = CompiledEnforcer(["compute.vm_*.read"])
+
+    assert compiled.has_globs
+    assert not CompiledEnforcer(perms).has_globs
+    with pytest.raises(ValueError):
+        compiled.granted_perms("compute", "vm_disk")
+
+
+def test_allowed_resources():
+    enforcer = Enforcer(
+        ["compute.vm_*.read", "compute.disk.read", "compute.net.*", "iam.*.read"]
+    )
+
+    allowed = enforcer.allowed_resources("compute", "read")
+
+    assert allowed == enforcers.AllowedResources(
+        False, frozenset(["disk", "net"]), frozenset(["vm_*"])
+    )
+    assert "vm_disk" in allowed
+    assert "port" not in allowed
+    assert enforcer.allowed_resources("iam", "read").any_resource
+    assert enforcer.allowed_resources("compute", "delete").names == {"net"}
+    assert not enforcer.allowed_resources("other", "read")
+
+
+@pytest.mark.parametrize("segments", [SEGMENTS, GLOB_SEGMENTS])
+def test_allowed_resources_same_decisions_as_enforce(segments):
+    rnd = random.Random(19)
+
+    for _ in range(300):
+        perms = [
+            ".".join(rnd.choice(segments) for _ in range(3))
+            for _ in range(rnd.randrange(8))
+        ]
+        enforcer = Enforcer(perms)
+
+        for service in GLOB_NAMES:
+            for perm in GLOB_NAMES:
+                allowed = enforcer.allowed_resources(service, perm)
+                for res in GLOB_NAMES:
+                    expected = enforcer.enforce(rules.Rule(service, res, perm))
+                    assert (res in allowed) is bool(expected), (perms, res, perm)
@@ -0,0 +1,303 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+import time
+import tracemalloc
+import uuid as sys_uuid
+from unittest import mock
+
+import pytest
+
+import gcl_iam.algorithms as algorithms
+import gcl_iam.drivers as drivers
+import gcl_iam.enforcers as enforcers
+import gcl_iam.engines as engines
+import gcl_iam.exceptions as exceptions
+import gcl_iam.middlewares as middlewares
+
+HS256_KEY = "a-secret-key-that-is-at-least-32-bytes"
+
+
+def _make_engine(driver, **kwargs) -> engines.IamEngine:
+    algo = algorithms.HS256(key=HS256_KEY)
+    token = algo.encode(
+        {
+            "jti": str(sys_uuid.uuid4()),
+            "aud": "client-1",
+            "exp": int(time.time()) + 3600,
+        }
+    )
+    return engines.IamEngine(
+        auth_token=token,
+        algorithm=algo,
+        driver=driver,
+        **kwargs,
+    )
+
+
+def test_engines_share_enforcer_for_same_permissions() -> None:
+    driver = drivers.DummyDriver()
+    driver.permissions = ["svc.vm.read", "svc.vm.create"]
+    first = _make_engine(driver)
+    driver.permissions = ["svc.vm.read", "svc.vm.create"]
+    second = _make_engine(driver)
+    driver.permissions = ["svc.vm.read"]
+    third = _make_engine(driver)
+    driver.permissions = ["svc.vm.create", "svc.vm.read"]
+    reordered = _make_engine(driver)
+
+    assert first.enforcer is second.enforcer
+    assert first.enforcer is not third.enforcer
+    assert first.enforcer is not reordered.enforcer
+    assert first.enforcer.enforce_raw("svc.vm.create")
+    assert not third.enforcer.enforce_raw("svc.vm.create")
+
+
+def test_shared_enforcer_keeps_permission_order() -> None:
+    perms = [
+        "*.vm.read",
+        "compute.net.write",
+        "compute.disk.read",
+        "*.img.list",
+    ]
+    rules = [
+        "compute.net.write",
+        "compute.vm.read",
+        "compute.disk.read",
+        "compute.img.list",
+        "other.vm.read",
+    ]
+    registry = enforcers.EnforcerRegistry()
+
+    for order in itertools.permutations(perms):
+        shared = registry.get(list(order))
+        expected = enforcers.Enforcer(list(order))
+        for rule in rules:
+            assert shared.enforce_raw(rule) == expected.enforce_raw(rule)
+        for action in ("read", "write", "list"):
+            assert shared.allowed_resources("compute", action) == (
+                expected.allowed_resources("compute", action)
+            )
+
+
+def test_engines_share_enforcer_by_permissions_only() -> None:
+    driver = drivers.DummyDriver()
+    introspect = driver.get_introspection_info
+    # IAM hashes are opaque, equal ones must not share permissions
+    driver.get_introspection_info = lambda *args, **kwargs: dict(
+        introspect(*args, **kwargs),
+        permission_hash="xxxx",
+    )
+    admin = _make_engine(driver)
+    driver.permissions = ["iam.user.read"]
+    reader = _make_engine(driver)
+
+    assert admin.enforcer is not reader.enforcer
+    assert admin.enforcer.enforce_raw("iam.user.delete")
+    assert not reader.enforcer.enforce_raw("iam.user.delete")
+
+
+def test_engine_explicit_enforcer_is_kept() -> None:
+    enforcer = enforcers.Enforcer([])
+
+    engine = _make_engine(drivers.DummyDriver(), enforcer=enforcer)
+
+    assert engine.enforcer is enforcer
+
+
+def test_enforcer_registry_is_bounded() -> None:
+    registry = enforcers.EnforcerRegistry(maxsize=2)
+
+    first = registry.get(["a.b.c"])
+    registry.get(["a.b.d"])
+    assert registry.get(["a.b.c"]) is first
+    registry.get(["a.b.e"])
+
+    stats = registry.stats()
+    assert stats.size == 2
+    assert (stats.hits, stats.misses) == (1, 3)
+    assert registry.get(["a.b.d"]) is not None
+    assert registry.stats().misses == 4
+
+
+def test_lazy_engine_defers_introspection() -> None:
+    engines.reset_lazy_stats()
+    driver = drivers.DummyDriver()
+    driver.permissions = ["svc.vm.read"]
+
+    with mock.patch.object(
+        driver, "get_introspection_info", wraps=driver.get_introspection_info
+    ) as introspect:
+        used = _make_engine(driver, lazy=True)
+        unused = _make_engine(driver, lazy=True)
+
+        assert unused.token_info.token_info["aud"] == "client-1"
+        assert not introspect.called
+        assert used.enforcer.enforce_raw("svc.vm.read")
+        assert used.introspection_info()["permissions"] == ["svc.vm.read"]
+        assert used.get_introspection_info().permissions == ["svc.vm.read"]
+
+    assert introspect.call_count == 1
+    assert used.introspected and not unused.introspected
+    stats = engines.lazy_stats()
+    assert (stats.engines, stats.introspections, stats.avoided) == (2, 1, 1)
+    assert stats.avoided_ratio == 0.5
+
+
+def test_lazy_engine_raises_like_eager_engine() -> None:
+    driver = drivers.DummyDriver()
+    driver.get_introspection_info = mock.Mock(return_value={})
+
+    with pytest.raises(exceptions.Unauthorized):
+        _make_engine(driver)
+    engine = _make_engine(driver, lazy=True)
+    for _ in range(2):
+        with pytest.raises(exceptions.Unauthorized):
+            engine.enforcer
+    assert driver.get_introspection_info.call_count == 2
+
+
+def test_lazy_engine_keeps_explicit_enforcer() -> None:
+    enforcer = enforcers.Enforcer([])
+
+    engine = _make_engine(drivers.DummyDriver(), enforcer=enforcer, lazy=True)
+
+    assert engine.enforcer is enforcer
+
+
+def test_middleware_lazy_engine_reports_invalid_token() -> None:
+    driver = drivers.DummyDriver()
+    driver.get_introspection_info = mock.Mock(side_effect=ValueError("boom"))
+    algo = algorithms.HS256(key=HS256_KEY)
+    token = algo.encode({"aud": "client-1", "exp": int(time.time()) + 3600})
+
+    engine = middlewares._LazyIamEngine(token, algo, driver)
+
+    with pytest.raises(exceptions.InvalidAuthTokenError):
+        engine.introspection_info()
+
+
+def _introspected_engine() -> engines.IamEngine:
+    driver = drivers.DummyDriver()
+    driver.project_id = str(sys_uuid.uuid4())
+    driver.permissions = [f"svc.res_{i}.read" for i in range(200)]
+    return _make_engine(driver)
+
+
+def test_introspection_info_views_are_immutable() -> None:
+    engine = _introspected_engine()
+    info = engine.get_introspection_info()
+
+    assert engine.get_introspection_info() is info
+    assert info.user_info is info.user_info
+    assert info.project_id is info.project_id
+    assert isinstance(info.project_id, sys_uuid.UUID)
+    assert info.permissions is info.permissions
+    assert info.permissions == engine.introspection_info()["permissions"]
+    with pytest.raises(AttributeError):
+        info.permissions = []
+    with pytest.raises(AttributeError):
+        info.user_info.extra = 1
+    with pytest.raises(AttributeError):
+        del info._permissions
+
+
+def test_introspection_info_is_a_snapshot() -> None:
+    engine = _introspected_engine()
+    result = engine.introspection_info()
+    info = engine.get_introspection_info()
+    expected = (
+        info.user_info.uuid,
+        info.project_id,
+        info.otp_verified,
+        list(info.permissions),
+    )
+
+    result["user_info"]["uuid"] = "changed"
+    result["project_id"] = None
+    result["otp_verified"] = not result["otp_verified"]
+    result["permissions"].append("svc.vm.delete")
+
+    assert (
+        info.user_info.uuid,
+        info.project_id,
+        info.otp_verified,
+        info.permissions,
+    ) == expected
+
+
+def test_introspection_info_access_allocates_nothing() -> None:
+    engine = _introspected_engine()
+    info = engine.get_introspection_info()
+    info.user_info, info.project_id, info.permissions
+    # Results are kept alive, so any copy would show up as traced memory
+    results = [None] * 3000
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(0, len(results), 3):
+            info = engine.get_introspection_info()
+            results[i] = info.user_info
+            results[i + 1] = info.project_id
+            results[i + 2] = info.permissions
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert allocated < 1024
+
+
+@pytest.mark.skipif(
+    not hasattr(tracemalloc, "reset_peak"), reason="requires Python 3.9+"
+)
+def test_authenticated_request_allocations_are_capped() -> None:
+    algo = algorithms.HS256(key=HS256_KEY)
+    token = algo.encode(
+        {
+            "jti": str(sys_uuid.uuid4()),
+            "aud": "client-1",
+            "exp": int(time.time()) + 3600,
+        }
+    )
+    driver = drivers.DummyDriver()
+    driver.project_id = str(sys_uuid.uuid4())
+    driver.permissions = [f"svc.res_{i}.read" for i in range(200)]
+
+    def request(accesses):
+        engine = engines.IamEngine(auth_token=token, algorithm=algo, driver=driver)
+        for _ in range(accesses):
+            info = engine.get_introspection_info()
+            info.user_info.uuid, info.project_id, info.permissions
+            engine.enforcer.enforce_raw("svc.res_1.read")
+
+    # Warm up the shared enforcer and the rule caches
+    request(1)
+    tracemalloc.start()
+    try:
+        peaks = []
+        for accesses in (1, 100):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            request(accesses)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    # Token verification and introspection only, repeated access is free
+    assert peaks[0] < 32 * 1024
+    assert peaks[1] <= peaks[0] + 1024
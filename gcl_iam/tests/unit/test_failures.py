@@ -0,0 +1,173 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+
+import jwt
+import pytest
+
+from gcl_iam import algorithms
+from gcl_iam import exceptions
+from gcl_iam import failures
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make_reporter(clock, **kwargs) -> failures.FailureReporter:
+    return failures.FailureReporter(
+        logger=logging.getLogger("test_failures"),
+        clock=clock,
+        **kwargs,
+    )
+
+
+def _messages(caplog):
+    return [record.getMessage() for record in caplog.records]
+
+
+def test_failure_reason_includes_cause() -> None:
+    try:
+        try:
+            raise jwt.exceptions.ExpiredSignatureError("expired")
+        except jwt.exceptions.ExpiredSignatureError as e:
+            raise exceptions.CredentialsAreInvalidError() from e
+    except exceptions.CredentialsAreInvalidError as e:
+        error = e
+
+    assert failures.failure_reason(error) == (
+        "CredentialsAreInvalidError:ExpiredSignatureError"
+    )
+    assert failures.failure_reason(ValueError()) == "ValueError"
+    assert failures.failure_reason(
+        exceptions.TokenRejectedError(reason="token has expired")
+    ) == ("TokenRejectedError:token has expired")
+
+
+def test_reporter_counts_and_rate_limits(caplog) -> None:
+    clock = _Clock()
+    reporter = _make_reporter(clock, rate_per_second=1, burst=2)
+    error = exceptions.CredentialsAreInvalidError()
+
+    with caplog.at_level(logging.WARNING, logger="test_failures"):
+        for _ in range(5):
+            reporter.report(error, audience="client-1", issuer="iam")
+        clock.now += 1
+        reporter.report(error, audience="client-1", issuer="iam")
+
+    assert len(caplog.records) == 3
+    assert _messages(caplog)[0].startswith(
+        "Invalid auth token (reason=CredentialsAreInvalidError, "
+        "audience=client-1, issuer=iam)"
+    )
+    assert all(record.exc_info is None for record in caplog.records)
+    assert reporter.stats() == {"CredentialsAreInvalidError": 6}
+
+
+def test_reporter_traceback_for_unexpected_errors(caplog) -> None:
+    reporter = _make_reporter(_Clock())
+
+    with caplog.at_level(logging.WARNING, logger="test_failures"):
+        reporter.report(KeyError("aud"))
+        reporter.report(jwt.exceptions.DecodeError("Not enough segments"))
+
+    unexpected, expected = caplog.records
+    assert unexpected.levelno == logging.ERROR
+    assert isinstance(unexpected.exc_info[1], KeyError)
+    assert expected.levelno == logging.WARNING
+    assert expected.exc_info is None
+
+
+def test_reporter_periodic_summary(caplog) -> None:
+    clock = _Clock()
+    reporter = _make_reporter(
+        clock,
+        rate_per_second=0,
+        burst=1,
+        summary_interval_seconds=60,
+    )
+
+    with caplog.at_level(logging.WARNING, logger="test_failures"):
+        for _ in range(3):
+            reporter.report(exceptions.UnknownKeyIdError(kid="k"), audience="a")
+        reporter.report(exceptions.CredentialsAreInvalidError(), audience="b")
+        clock.now += 60
+        reporter.report(exceptions.CredentialsAreInvalidError(), audience="b")
+
+    assert len(caplog.records) == 2
+    assert _messages(caplog)[1] == (
+        "4 auth failures in the last 60s, 3 not logged, top: "
+        "reason=UnknownKeyIdError audience=a issuer=-: 3; "
+        "reason=CredentialsAreInvalidError audience=b issuer=-: 1"
+    )
+
+
+def test_reporter_no_summary_without_suppressed_failures(caplog) -> None:
+    reporter = _make_reporter(_Clock())
+
+    with caplog.at_level(logging.WARNING, logger="test_failures"):
+        reporter.report(exceptions.CredentialsAreInvalidError())
+        reporter.flush()
+
+    assert len(caplog.records) == 1
+
+
+def test_reporter_caps_keys_and_labels() -> None:
+    clock = _Clock()
+    reporter = _make_reporter(
+        clock,
+        max_keys=2,
+        rate_per_second=0,
+        burst=0,
+        summary_interval_seconds=60,
+    )
+    error = exceptions.CredentialsAreInvalidError()
+
+    for i in range(4):
+        reporter.report(error, audience=f"aud-{i}", issuer="x" * 100)
+    reporter.report(error, audience=["a", "b"])
+
+    assert reporter._window == {
+        ("CredentialsAreInvalidError", "aud-0", "x" * 64): 1,
+        ("CredentialsAreInvalidError", "aud-1", "x" * 64): 1,
+        ("<other>", "<other>", "<other>"): 3,
+    }
+
+    # Labels of a past interval do not take the keys of the next one
+    clock.now += 60
+    reporter.report(error, audience="aud-new")
+
+    assert reporter._window == {("CredentialsAreInvalidError", "aud-new", "-"): 1}
+    assert reporter.stats() == {"CredentialsAreInvalidError": 6}
+
+
+def test_signature_failure_is_the_cause() -> None:
+    token = jwt.encode(
+        {"aud": "client-1"},
+        "a-secret-key-that-is-at-least-32-bytes",
+        algorithm="HS256",
+    )
+    algo = algorithms.HS256(key="another-secret-key-of-at-least-32-bytes")
+
+    with pytest.raises(exceptions.CredentialsAreInvalidError) as e:
+        algo.decode(token, ignore_audience=True)
+
+    assert isinstance(e.value.__cause__, jwt.exceptions.InvalidSignatureError)
@@ -0,0 +1,97 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest.mock as mock
+from concurrent import futures
+
+import pytest
+
+import gcl_iam.algorithms as algorithms
+import gcl_iam.issuers as issuers
+
+HS256_KEY = "a-secret-key-that-is-at-least-32-bytes"
+
+
+@pytest.fixture(scope="module")
+def rs256() -> algorithms.RS256:
+    private_key_pem = algorithms.generate_rsa_private_key_pem(bitness=2048)
+    public_key_pem = algorithms.generate_rsa_public_key_pem(private_key_pem)
+    return algorithms.RS256(private_key=private_key_pem, public_key=public_key_pem)
+
+
+def test_encode_many_keeps_order() -> None:
+    algo = algorithms.HS256(key=HS256_KEY)
+    payloads = [{"n": i} for i in range(10)]
+
+    encoded = algo.encode_many(payloads, chunk_size=3)
+
+    assert [algo.decode(t)["n"] for t in encoded] == list(range(10))
+
+
+def test_encode_many_invalid_chunk_size_raises() -> None:
+    with pytest.raises(ValueError):
+        algorithms.HS256(key=HS256_KEY).encode_many([{}], chunk_size=0)
+
+
+def test_issuer_encode_many_on_thread_pool(rs256) -> None:
+    payloads = [{"n": i} for i in range(20)]
+
+    with issuers.TokenIssuer(rs256, max_workers=4, chunk_size=4) as issuer:
+        encoded = issuer.encode_many(payloads)
+
+    assert [rs256.decode(t)["n"] for t in encoded] == list(range(20))
+
+
+def test_issuer_submit_returns_future(rs256) -> None:
+    with issuers.TokenIssuer(rs256) as issuer:
+        token = issuer.submit({"sub": "user"}).result()
+
+    assert rs256.decode(token)["sub"] == "user"
+
+
+def test_issuer_encode_many_on_process_pool(rs256) -> None:
+    payloads = [{"n": i} for i in range(4)]
+
+    with futures.ProcessPoolExecutor(max_workers=2) as executor:
+        with issuers.TokenIssuer(rs256, executor=executor, chunk_size=2) as issuer:
+            encoded = issuer.encode_many(payloads)
+        # An external executor is left to its owner
+        assert executor.submit(int, "1").result() == 1
+
+    assert [rs256.decode(t)["n"] for t in encoded] == list(range(4))
+
+
+def test_issuer_process_pool_gets_key_once(rs256) -> None:
+    payloads = [{"n": i} for i in range(4)]
+
+    with issuers.TokenIssuer(rs256, max_workers=2, processes=True) as issuer:
+        assert isinstance(issuer._executor, algorithms.AlgorithmProcessPool)
+        # Tasks refer to the key the workers got at start
+        assert isinstance(issuer._target, algorithms._WorkerAlgorithm)
+        encoded = issuer.encode_many(payloads)
+        token = issuer.submit({"sub": "user"}).result()
+
+    assert [rs256.decode(t)["n"] for t in encoded] == list(range(4))
+    assert rs256.decode(token)["sub"] == "user"
+
+
+def test_issuer_shutdown_only_own_executor() -> None:
+    executor = mock.MagicMock()
+    issuer = issuers.TokenIssuer(algorithms.HS256(key=HS256_KEY), executor=executor)
+
+    issuer.shutdown()
+
+    assert not executor.shutdown.called
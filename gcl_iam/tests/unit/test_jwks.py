@@ -0,0 +1,184 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+import unittest.mock as mock
+
+import pytest
+
+import gcl_iam.jwks as jwks
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeferredSpawn:
+    def __init__(self):
+        self.targets = []
+
+    def __call__(self, target):
+        self.targets.append(target)
+
+    def run_all(self):
+        targets, self.targets = self.targets, []
+        for target in targets:
+            target()
+
+
+def _make_manager(fetch, **kwargs):
+    timer = FakeTimer()
+    spawn = DeferredSpawn()
+    manager = jwks.JwksKeyManager(
+        fetch=fetch,
+        ttl_seconds=300,
+        jitter=0,
+        timer=timer,
+        rand=lambda: 0.0,
+        spawn=spawn,
+        **kwargs,
+    )
+    return manager, timer, spawn
+
+
+def test_jwks_key_manager_first_get_fetches_synchronously() -> None:
+    fetch = mock.Mock(return_value="keys-1")
+    manager, _, spawn = _make_manager(fetch)
+
+    assert not manager.is_warm
+    assert manager.get() == "keys-1"
+    assert manager.get() == "keys-1"
+
+    assert fetch.call_count == 1
+    assert not spawn.targets
+
+
+def test_jwks_key_manager_refreshes_in_background_after_expiration() -> None:
+    fetch = mock.Mock(side_effect=["keys-1", "keys-2"])
+    manager, timer, spawn = _make_manager(fetch)
+    manager.get()
+
+    timer.now += 301
+    # The stale key set is served while the refresh is in flight
+    assert manager.get() == "keys-1"
+    assert manager.get() == "keys-1"
+    assert len(spawn.targets) == 1
+
+    spawn.run_all()
+
+    assert manager.get() == "keys-2"
+    assert fetch.call_count == 2
+
+
+def test_jwks_key_manager_early_refresh_is_probabilistic() -> None:
+    fetch = mock.Mock(side_effect=["keys-1", "keys-2"])
+    manager, timer, spawn = _make_manager(fetch)
+    manager._rand = lambda: 0.0
+    manager.get()
+    timer.now += 299.99
+
+    manager.get()
+    assert not spawn.targets
+
+    # rand close to 1 gives a long gap, so refresh is started early
+    manager._rand = lambda: 1 - 1e-9
+    manager.get()
+    assert len(spawn.targets) == 1
+
+
+def test_jwks_key_manager_keeps_stale_keys_on_failure() -> None:
+    fetch = mock.Mock(side_effect=["keys-1", RuntimeError("IAM is down"), "keys-2"])
+    manager, timer, spawn = _make_manager(fetch, retry_interval_seconds=10)
+    manager.get()
+
+    timer.now += 301
+    manager.get()
+    spawn.run_all()
+
+    assert manager.get() == "keys-1"
+    assert not spawn.targets
+
+    timer.now += 11
+    manager.get()
+    spawn.run_all()
+
+    assert manager.get() == "keys-2"
+
+
+def test_jwks_key_manager_cold_fetch_error_is_raised() -> None:
+    fetch = mock.Mock(side_effect=RuntimeError("IAM is down"))
+    manager, _, _ = _make_manager(fetch)
+
+    with pytest.raises(RuntimeError):
+        manager.get()
+
+    assert not manager.is_warm
+
+
+def test_jwks_key_manager_ttl_jitter() -> None:
+    fetch = mock.Mock(return_value="keys-1")
+    manager, timer, _ = _make_manager(fetch)
+    manager._jitter = 0.1
+    manager._rand = lambda: 0.5
+
+    manager.get()
+
+    assert manager._entry.expires_at == pytest.approx(timer.now + 285)
+
+
+class CountingLock:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entered = 0
+
+    def __enter__(self):
+        self.entered += 1
+        return self._lock.__enter__()
+
+    def __exit__(self, *args):
+        return self._lock.__exit__(*args)
+
+
+def test_jwks_key_manager_concurrent_cold_gets_share_one_fetch() -> None:
+    release = threading.Event()
+    fetch = mock.Mock(return_value="keys-1")
+
+    def slow_fetch():
+        release.wait(5)
+        return fetch()
+
+    manager, _, _ = _make_manager(slow_fetch)
+    manager._fetch_lock = lock = CountingLock()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.get())) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    # Every request is cold and queued on the fetch lock
+    while lock.entered < len(threads):
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["keys-1"] * 8
+    fetch.assert_called_once_with()
@@ -0,0 +1,255 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gc
+import time
+import unittest.mock as mock
+import uuid as sys_uuid
+
+import bazooka.exceptions
+import pytest
+
+from gcl_iam import algorithms
+from gcl_iam import drivers
+from gcl_iam import exceptions
+from gcl_iam import metrics
+from gcl_iam import tokens
+
+AUDIENCE = "client-1"
+INTROSPECTION = {
+    "user_info": {"uuid": "00000000-0000-0000-0000-000000000000"},
+    "project_id": None,
+    "otp_verified": False,
+    "permissions": ["*.*.*"],
+}
+
+
+def _make_driver(registry, **kwargs) -> drivers.HttpDriver:
+    driver = drivers.HttpDriver(
+        "http://iam.example/",
+        audience=AUDIENCE,
+        hs256_jwks_decryption_key="A" * 43,
+        metrics_registry=registry,
+        **kwargs,
+    )
+    driver._client = mock.Mock()
+    driver._client.get.return_value.json.side_effect = lambda: dict(INTROSPECTION)
+    return driver
+
+
+def _make_auth_token() -> tokens.AuthToken:
+    algo = algorithms.HS256(key="secret")
+    token = algo.encode(
+        {
+            "jti": str(sys_uuid.uuid4()),
+            "aud": AUDIENCE,
+            "exp": int(time.time()) + 3600,
+        }
+    )
+    return tokens.AuthToken(token, algo, ignore_audience=True)
+
+
+def test_counter_render() -> None:
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("path",))
+
+    counter.inc(labels=('/a"b\\c\n',))
+    counter.inc(2, labels=('/a"b\\c\n',))
+
+    assert registry.render() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/a\\"b\\\\c\\n"} 3\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    registry = metrics.MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 5.65",
+        "latency_seconds_count 4",
+    ]
+    assert histogram.count() == 4
+
+
+def test_registry_returns_the_same_metric() -> None:
+    registry = metrics.MetricsRegistry()
+
+    counter = registry.counter("a_total", "A")
+
+    assert registry.counter("a_total", "A") is counter
+    with pytest.raises(ValueError):
+        registry.histogram("a_total", "A")
+    with pytest.raises(ValueError):
+        counter.inc(labels=("unexpected",))
+
+
+def test_registry_drops_dead_collectors() -> None:
+    registry = metrics.MetricsRegistry()
+    families = [metrics.MetricFamily("g", "gauge", "G", [("", (), (), 1)])]
+    registry.register_collector(lambda: families)
+    registry.register_collector(lambda: None)
+
+    assert registry.render().endswith("g 1\n")
+    assert len(registry._collectors) == 1
+
+
+def test_wsgi_app() -> None:
+    registry = metrics.MetricsRegistry()
+    registry.counter("a_total", "A").inc()
+    start_response = mock.Mock()
+
+    body = b"".join(metrics.make_wsgi_app(registry)({}, start_response))
+
+    assert body == b"# HELP a_total A\n# TYPE a_total counter\na_total 1\n"
+    start_response.assert_called_once_with(
+        "200 OK",
+        [("Content-Type", metrics.CONTENT_TYPE), ("Content-Length", str(len(body)))],
+    )
+
+
+def test_histogram_sink() -> None:
+    registry = metrics.MetricsRegistry()
+    sink = metrics.HistogramSink(registry)
+
+    sink.record("verify", 0.001)
+    sink.record("verify", 0.002)
+
+    histogram = registry.histogram("gcl_iam_auth_phase_seconds", "")
+    assert histogram.count(("verify",)) == 2
+
+
+def test_http_driver_introspection_metrics() -> None:
+    registry = metrics.MetricsRegistry()
+    driver = _make_driver(registry, introspection_cache_ttl_seconds=60)
+    token_info = _make_auth_token()
+
+    driver.get_introspection_info(token_info)
+    driver.get_introspection_info(token_info)
+
+    histogram = registry.histogram("gcl_iam_introspection_seconds", "")
+    assert histogram.count((AUDIENCE,)) == 1
+    rendered = registry.render()
+    assert (
+        'gcl_iam_cache_hits_total{audience="client-1",cache="introspection"} 1'
+        in rendered
+    )
+    assert (
+        'gcl_iam_cache_hit_ratio{audience="client-1",cache="introspection"} 0.5'
+        in rendered
+    )
+
+
+def test_http_driver_error_metrics() -> None:
+    registry = metrics.MetricsRegistry()
+    driver = _make_driver(registry)
+    driver._client.get.side_effect = bazooka.exceptions.BadRequestError(mock.Mock())
+
+    with pytest.raises(exceptions.InvalidAuthTokenError):
+        driver.get_introspection_info(_make_auth_token())
+    with pytest.raises(Exception):
+        driver.get_algorithm(tokens.UnverifiedToken(_make_auth_token().token))
+
+    errors = registry.counter("gcl_iam_driver_errors_total", "")
+    assert errors.value((AUDIENCE, "introspect", "InvalidAuthTokenError")) == 1
+    assert errors.value((AUDIENCE, "algorithm", "BadRequestError")) == 1
+    assert errors.value((AUDIENCE, "jwks", "BadRequestError")) == 1
+    assert registry.histogram("gcl_iam_jwks_fetch_seconds", "").count((AUDIENCE,))
+
+
+def test_http_driver_algorithm_cache_stats() -> None:
+    driver = _make_driver(None)
+    algorithm = mock.Mock(key_ids=frozenset(["kid-1"]))
+    driver._jwks = mock.Mock(is_warm=False)
+    driver._jwks.get.return_value = algorithm
+    token_info = mock.Mock(audience_name=AUDIENCE, key_id="kid-1")
+
+    driver.get_algorithm(token_info)
+    driver._jwks.is_warm = True
+    driver.get_algorithm(token_info)
+    driver.get_algorithm(token_info)
+
+    stats = driver.algorithm_cache_stats
+    assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+
+
+def test_http_driver_without_registry() -> None:
+    driver = _make_driver(None)
+
+    driver.get_introspection_info(_make_auth_token())
+
+    assert driver._introspection_seconds is None
+
+
+def test_collected_driver_is_dropped() -> None:
+    registry = metrics.MetricsRegistry()
+    driver = _make_driver(registry)
+    assert "gcl_iam_cache_hits_total" in registry.render()
+
+    del driver
+    gc.collect()
+
+    assert "gcl_iam_cache_hits_total" not in registry.render()
+
+
+def test_drivers_of_one_audience_share_cache_series() -> None:
+    registry = metrics.MetricsRegistry()
+    drivers_ = [
+        _make_driver(registry, introspection_cache_ttl_seconds=60) for _ in range(2)
+    ]
+    token_info = _make_auth_token()
+    for driver in drivers_:
+        driver.get_introspection_info(token_info)
+        driver.get_introspection_info(token_info)
+
+    lines = registry.render().splitlines()
+
+    assert len(registry._collectors) == 1
+    for line in lines:
+        if not line.startswith("#"):
+            assert (
+                sum(
+                    other.rsplit(" ", 1)[0] == line.rsplit(" ", 1)[0] for other in lines
+                )
+                == 1
+            ), line
+    assert (
+        'gcl_iam_cache_hits_total{audience="client-1",cache="introspection"} 2' in lines
+    )
+    assert (
+        'gcl_iam_cache_hit_ratio{audience="client-1",cache="introspection"} 0.5'
+        in lines
+    )
+
+
+def test_http_driver_metrics_are_opt_in() -> None:
+    driver = drivers.HttpDriver(
+        "http://iam.example/",
+        audience=AUDIENCE,
+        hs256_jwks_decryption_key="A" * 43,
+    )
+
+    assert driver._errors is None
+    assert "gcl_iam_cache" not in metrics.DEFAULT_REGISTRY.render()
@@ -0,0 +1,312 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import random
+import re
+import time
+from unittest import mock
+
+import jwt
+import pytest
+import webob
+import webob.dec
+
+from gcl_iam import algorithms
+from gcl_iam import drivers
+from gcl_iam import exceptions
+from gcl_iam import middlewares
+from gcl_iam import timings
+
+HS256_KEY = "a-secret-key-that-is-at-least-32-bytes"
+
+
+class _Request:
+    def __init__(self, path: str, method: str = "GET"):
+        self.path = path
+        self.method = method
+        self.get_response = mock.Mock(return_value="response")
+
+
+class _PrefixComparator(middlewares.AbstactEndpointComparator):
+    def compare(self, req):
+        return req.path.startswith("/internal/")
+
+
+class _CaseInsensitiveComparator(middlewares.EndpointComparator):
+    def _build_full_path(self, path):
+        return re.compile(path, re.IGNORECASE)
+
+
+ENDPOINTS = [
+    middlewares.EndpointComparator("/health"),
+    middlewares.EndpointComparator("/metrics", methods=["GET", "HEAD"]),
+    middlewares.EndpointComparator("/v1/files/.*"),
+    middlewares.EndpointComparator("/v1/(a|b)/\\1", methods=["POST"]),
+    middlewares.EndpointComparator("(?i)/v1/docs"),
+    middlewares.EndpointComparator("/v[0-9]+/version"),
+    _CaseInsensitiveComparator("/Static"),
+    _PrefixComparator(),
+]
+PATHS = [
+    "/health",
+    "/health/",
+    "/healthz",
+    "/metrics",
+    "/v1/files/x",
+    "/v1/files",
+    "/v1/a/a",
+    "/v1/a/b",
+    "/V1/DOCS",
+    "/v12/version",
+    "/vx/version",
+    "/static",
+    "/internal/x",
+    "/",
+]
+METHODS = ["GET", "HEAD", "POST"]
+
+
+def test_skip_auth_router_same_decisions_as_comparators() -> None:
+    rnd = random.Random(23)
+
+    for _ in range(200):
+        endpoints = rnd.sample(ENDPOINTS, rnd.randrange(len(ENDPOINTS) + 1))
+        router = middlewares.SkipAuthRouter(endpoints)
+        for path in PATHS:
+            for method in METHODS:
+                req = _Request(path, method)
+                expected = any(e.compare(req) for e in endpoints)
+
+                assert router.match(req) is expected, (path, method, endpoints)
+
+
+def test_skip_auth_router_literal_paths_skip_regexes() -> None:
+    router = middlewares.SkipAuthRouter(
+        [middlewares.EndpointComparator("/health", methods=["GET", "HEAD"])]
+    )
+
+    assert router._literals == {"GET": {"/health"}, "HEAD": {"/health"}}
+    assert router._patterns == {}
+    assert router.match(_Request("/health", "HEAD"))
+    assert not router.match(_Request("/health", "POST"))
+
+
+def test_endpoint_comparator_compiles_once() -> None:
+    with mock.patch.object(re, "compile", wraps=re.compile) as compile_mock:
+        endpoint = middlewares.EndpointComparator("/v1/files/.*")
+        for _ in range(3):
+            endpoint.compare(_Request("/v1/files/x"))
+
+    assert compile_mock.call_count == 1
+
+
+@pytest.mark.parametrize("log_level, expected_records", [(logging.INFO, 1), (None, 0)])
+def test_skip_auth_log_level(caplog, log_level, expected_records) -> None:
+    middleware = middlewares.GenesisCoreAuthMiddleware(
+        application=mock.Mock(),
+        iam_engine_driver=drivers.DummyDriver(),
+        skip_auth_endpoints=[middlewares.EndpointComparator("/health")],
+        skip_auth_log_level=log_level,
+    )
+    req = _Request("/health")
+
+    with caplog.at_level(logging.DEBUG, logger=middlewares.LOG.name):
+        response = middleware._get_response(mock.MagicMock(), req)
+
+    assert response == "response"
+    assert len(caplog.records) == expected_records
+
+
+class _ListSink(timings.StatsSink):
+    def __init__(self):
+        self.records = []
+
+    def record(self, phase, seconds):
+        self.records.append((phase, seconds))
+
+
+def _auth_request(driver, lazy=False, application=None, **kwargs):
+    algo = algorithms.HS256(key=HS256_KEY)
+    driver.algorithm_keys = {"client-1": drivers.HS256AlgorithmKeys(key=HS256_KEY)}
+    token = algo.encode({"aud": "client-1", "exp": int(time.time()) + 3600})
+    middleware = middlewares.GenesisCoreAuthMiddleware(
+        application=application or webob.Response("ok"),
+        iam_engine_driver=driver,
+        lazy_introspection=lazy,
+        **kwargs,
+    )
+    req = webob.Request.blank("/v1/vms", headers={"Authorization": f"Bearer {token}"})
+    return middleware._get_response(mock.MagicMock(), req)
+
+
+def test_server_timing_header() -> None:
+    response = _auth_request(drivers.DummyDriver(), server_timing=True)
+
+    phases = [
+        item.split(";")[0] for item in response.headers["Server-Timing"].split(", ")
+    ]
+    assert phases == ["parse", "algorithm", "verify", "introspect", "enforcer"]
+    assert response.body == b"ok"
+
+
+def test_timing_sink_without_header() -> None:
+    sink = _ListSink()
+
+    response = _auth_request(drivers.DummyDriver(), timing_sink=sink)
+
+    assert "Server-Timing" not in response.headers
+    assert [phase for phase, _ in sink.records] == [
+        "parse",
+        "algorithm",
+        "verify",
+        "introspect",
+        "enforcer",
+    ]
+    assert all(seconds >= 0 for _, seconds in sink.records)
+
+
+def test_timing_sink_records_failed_requests() -> None:
+    sink = _ListSink()
+    driver = drivers.DummyDriver()
+    driver.get_introspection_info = mock.Mock(return_value={})
+
+    with pytest.raises(exceptions.InvalidAuthTokenError):
+        _auth_request(driver, timing_sink=sink)
+
+    assert [phase for phase, _ in sink.records] == [
+        "parse",
+        "algorithm",
+        "verify",
+        "introspect",
+    ]
+
+
+def test_timings_disabled_by_default() -> None:
+    response = _auth_request(drivers.DummyDriver())
+
+    assert "Server-Timing" not in response.headers
+
+
+@webob.dec.wsgify
+def _introspecting_app(req):
+    req.iam_engine.introspection_info()
+    return webob.Response("ok")
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_failure_reporter_gets_token_claims(lazy) -> None:
+    reporter = mock.Mock()
+    driver = drivers.DummyDriver()
+    driver.get_introspection_info = mock.Mock(side_effect=ValueError("boom"))
+
+    with pytest.raises(exceptions.InvalidAuthTokenError):
+        _auth_request(
+            driver,
+            lazy=lazy,
+            failure_reporter=reporter,
+            application=_introspecting_app,
+        )
+
+    (error,), kwargs = reporter.report.call_args
+    assert isinstance(error, ValueError)
+    assert kwargs == {"audience": "client-1", "issuer": None}
+
+
+def test_failure_reporter_gets_parse_errors() -> None:
+    reporter = mock.Mock()
+    middleware = middlewares.GenesisCoreAuthMiddleware(
+        application=webob.Response("ok"),
+        iam_engine_driver=drivers.DummyDriver(),
+        failure_reporter=reporter,
+    )
+    req = webob.Request.blank("/v1/vms", headers={"Authorization": "Bearer garbage"})
+
+    with pytest.raises(exceptions.InvalidAuthTokenError):
+        middleware._get_response(mock.MagicMock(), req)
+
+    (error,), kwargs = reporter.report.call_args
+    assert kwargs == {"audience": None, "issuer": None}
+
+
+def _bearer_request(token):
+    return webob.Request.blank("/v1/vms", headers={"Authorization": f"Bearer {token}"})
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "garbage",
+        "a" * 10000,
+        algorithms.HS256(key=HS256_KEY).encode(
+            {"aud": "client-1", "exp": int(time.time()) - 60}
+        ),
+    ],
+)
+def test_junk_tokens_are_rejected_before_verification(token) -> None:
+    driver = mock.Mock()
+    reporter = mock.Mock()
+    middleware = middlewares.GenesisCoreAuthMiddleware(
+        application=webob.Response("ok"),
+        iam_engine_driver=driver,
+        failure_reporter=reporter,
+    )
+
+    with pytest.raises(exceptions.InvalidAuthTokenError):
+        middleware._get_response(mock.MagicMock(), _bearer_request(token))
+
+    driver.get_algorithm.assert_not_called()
+    (error,), _ = reporter.report.call_args
+    assert isinstance(error, exceptions.TokenRejectedError)
+
+
+def test_token_prefilter_disabled() -> None:
+    driver = mock.Mock()
+    driver.get_algorithm.side_effect = ValueError("no keys")
+    middleware = middlewares.GenesisCoreAuthMiddleware(
+        application=webob.Response("ok"),
+        iam_engine_driver=driver,
+        failure_reporter=mock.Mock(),
+        token_prefilter=None,
+    )
+    token = algorithms.HS256(key=HS256_KEY).encode(
+        {"aud": "client-1", "exp": int(time.time()) - 60}
+    )
+
+    with pytest.raises(exceptions.InvalidAuthTokenError):
+        middleware._get_response(mock.MagicMock(), _bearer_request(token))
+
+    driver.get_algorithm.assert_called_once()
+
+
+def test_token_prefilter_keeps_custom_algorithms() -> None:
+    driver = mock.Mock()
+    driver.get_algorithm.side_effect = ValueError("no keys")
+    middleware = middlewares.GenesisCoreAuthMiddleware(
+        application=webob.Response("ok"),
+        iam_engine_driver=driver,
+        failure_reporter=mock.Mock(),
+    )
+    token = jwt.encode(
+        {"aud": "client-1", "exp": int(time.time()) + 60},
+        HS256_KEY + HS256_KEY,
+        algorithm="HS512",
+    )
+
+    with pytest.raises(exceptions.InvalidAuthTokenError):
+        middleware._get_response(mock.MagicMock(), _bearer_request(token))
+
+    driver.get_algorithm.assert_called_once()
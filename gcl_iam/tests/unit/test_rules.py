@@ -0,0 +1,59 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import pickle
+
+import pytest
+
+from gcl_iam import rules
+
+
+def test_rule_is_immutable_and_slotted() -> None:
+    rule = rules.Rule("service", "res", "perm")
+
+    with pytest.raises(AttributeError):
+        rule.perm = "other"
+    with pytest.raises(AttributeError):
+        del rule.service
+    assert not hasattr(rule, "__dict__")
+
+
+def test_rule_compares_and_hashes_by_value() -> None:
+    rule = rules.Rule("service", "res", "perm")
+
+    assert rule == rules.Rule("service", "res", "perm")
+    assert rule != rules.Rule("service", "res", "other")
+    assert rule != "service.res.perm"
+    assert {rule: 1}[rules.Rule("service", "res", "perm")] == 1
+    assert str(rule) == "service.res.perm"
+    assert repr(rule) == "Rule('service', 'res', 'perm')"
+
+
+def test_rule_from_raw_is_interned() -> None:
+    rule = rules.Rule.from_raw("service.res.perm.with.dots")
+
+    assert rule is rules.Rule.from_raw("service.res.perm.with.dots")
+    assert rule == rules.Rule("service", "res", "perm.with.dots")
+    with pytest.raises(ValueError):
+        rules.Rule.from_raw("service.res")
+
+
+def test_rule_pickle_and_copy() -> None:
+    rule = rules.Rule("service", "res", "perm")
+
+    assert pickle.loads(pickle.dumps(rule)) == rule
+    assert copy.deepcopy(rule) == rule
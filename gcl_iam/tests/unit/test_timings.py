@@ -0,0 +1,59 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import tracemalloc
+from unittest import mock
+
+from gcl_iam import timings
+
+
+def test_phase_timer_records_phases() -> None:
+    timer = timings.PhaseTimer()
+    sink = mock.Mock(spec=timings.StatsSink)
+
+    with mock.patch("time.perf_counter", side_effect=[1.0, 1.25, 2.0, 2.5]):
+        started = timer.start()
+        timer.stop("parse", started)
+        started = timer.start()
+        timer.stop("verify", started)
+    timer.report(sink)
+
+    assert timer.phases == [("parse", 0.25), ("verify", 0.5)]
+    assert timer.server_timing() == "parse;dur=250.000, verify;dur=500.000"
+    assert sink.record.call_args_list == [
+        mock.call("parse", 0.25),
+        mock.call("verify", 0.5),
+    ]
+
+
+def test_null_timer_does_not_allocate() -> None:
+    timer = timings.NULL_TIMER
+    timer.stop("warm up", timer.start())
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(1000):
+            timer.stop("verify", timer.start())
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    # A float per clock read would be 24 KB
+    assert allocated < 1024
+    assert not timer.enabled
+    assert timer.phases == ()
+    assert timer.server_timing() == ""
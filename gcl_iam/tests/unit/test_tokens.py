@@ -0,0 +1,194 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import random
+import time
+import unittest.mock as mock
+
+import jwt
+import pytest
+
+import gcl_iam.algorithms as algorithms
+import gcl_iam.exceptions as exceptions
+import gcl_iam.tokens as tokens
+
+SECRET = "a-secret-key-that-is-at-least-32-bytes"
+
+
+def _encode(payload, headers=None) -> str:
+    return jwt.encode(payload, key=SECRET, algorithm="HS256", headers=headers)
+
+
+def test_parsed_token_matches_pyjwt() -> None:
+    token = _encode({"sub": "user", "aud": "client"}, headers={"kid": "k1"})
+
+    parsed = tokens.ParsedToken(token)
+
+    assert parsed.token == token
+    assert parsed.header == jwt.get_unverified_header(token)
+    assert parsed.payload == jwt.decode(token, options={"verify_signature": False})
+    assert isinstance(parsed.signing_input, memoryview)
+    assert parsed.signing_input.obj is parsed.raw
+    assert bytes(parsed.signing_input) == token.rsplit(".", 1)[0].encode()
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not-a-jwt",
+        "a.b",
+        "!!!.e30.sig",
+        "e30.W10.c2ln",  # payload is not a json object
+        "bm90IGpzb24.e30.c2ln",  # header is not json
+    ],
+)
+def test_parsed_token_malformed_raises_decode_error(token) -> None:
+    with pytest.raises(jwt.exceptions.DecodeError):
+        tokens.ParsedToken(token)
+
+
+def test_parsed_token_non_string_kid_raises() -> None:
+    token = "eyJhbGciOiJIUzI1NiIsImtpZCI6MX0.e30.c2ln"  # {"alg":"HS256","kid":1}
+
+    with pytest.raises(jwt.exceptions.InvalidTokenError):
+        tokens.ParsedToken(token)
+
+
+def test_unverified_token_parses_once() -> None:
+    token = _encode({"aud": "client"}, headers={"kid": "k1"})
+
+    with mock.patch.object(tokens.json, "loads", wraps=tokens.json.loads) as loads:
+        unverified = tokens.UnverifiedToken(token)
+
+    assert loads.call_count == 2
+    assert unverified.audience_name == "client"
+    assert unverified.key_id == "k1"
+    assert unverified.parsed_token.token == token
+
+
+def test_auth_token_from_parsed_token() -> None:
+    algo = algorithms.HS256(key=SECRET)
+    token = algo.encode({"aud": "client", "exp": int(time.time()) + 60})
+    unverified = tokens.UnverifiedToken(token)
+
+    with mock.patch.object(jwt, "decode") as jwt_decode:
+        auth_token = tokens.AuthToken(
+            unverified.parsed_token,
+            algo,
+            ignore_audience=True,
+        )
+
+    assert not jwt_decode.called
+    assert auth_token.token == token
+    assert auth_token.audience_name == "client"
+
+
+@pytest.mark.parametrize(
+    "header_value, token, reason",
+    [
+        ("Bearer " + "a" * 8193, "a" * 8193, "header is too large"),
+        ("Bearer a.b", "a.b", "not three segments"),
+        ("Bearer a.b.c.d", "a.b.c.d", "not three segments"),
+    ],
+)
+def test_prefilter_rejects_raw_tokens(header_value, token, reason) -> None:
+    with pytest.raises(exceptions.TokenRejectedError) as e:
+        tokens.DEFAULT_PREFILTER.check_raw(header_value, token)
+
+    assert e.value.reason == reason
+
+
+def test_prefilter_token_size() -> None:
+    prefilter = tokens.TokenPrefilter(max_token_size=8)
+
+    prefilter.check_raw("Bearer a.b.c", "a.b.c")
+    with pytest.raises(exceptions.TokenRejectedError) as e:
+        prefilter.check_raw("Bearer aaa.bbb.ccc", "aaa.bbb.ccc")
+
+    assert e.value.reason == "token is too large"
+
+
+@pytest.mark.parametrize(
+    "payload, headers, reason",
+    [
+        ({"exp": 999}, None, "token has expired"),
+        ({"exp": 1000.5}, None, "token has expired"),
+        ({"nbf": 1001}, None, "token is not yet valid"),
+        ({}, {"alg": "none"}, "algorithm is not allowed"),
+    ],
+)
+def test_prefilter_rejects_claims(payload, headers, reason) -> None:
+    token = tokens.UnverifiedToken(_encode({"aud": "client", **payload}))
+    token.header.update(headers or {})
+    prefilter = tokens.TokenPrefilter(
+        allowed_algorithms=tokens.SUPPORTED_ALGORITHMS,
+        clock=lambda: 1000.0,
+    )
+
+    with pytest.raises(exceptions.TokenRejectedError) as e:
+        prefilter.check_parsed(token)
+
+    assert e.value.reason == reason
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"exp": 1001}, {"nbf": 1000.9}, {"exp": "999"}, {"exp": float("nan")}, {}],
+)
+def test_prefilter_leaves_the_rest_to_verification(payload) -> None:
+    token = tokens.UnverifiedToken(_encode({"aud": "client", **payload}))
+
+    tokens.TokenPrefilter(clock=lambda: 1000.0).check_parsed(token)
+
+
+def test_prefilter_rejects_only_what_verification_rejects() -> None:
+    rnd = random.Random(25)
+    now = time.time()
+    values = [None, True, "x", now - 10, now + 10, int(now) - 1, int(now) + 1]
+    prefilter = tokens.TokenPrefilter(clock=lambda: now)
+
+    class FrozenDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(now, tz)
+
+    for _ in range(300):
+        payload = {"aud": "client"}
+        payload.update(
+            (claim, value)
+            for claim in ("exp", "nbf")
+            if (value := rnd.choice(values)) is not None
+        )
+        token = _encode(payload)
+        try:
+            prefilter.check_parsed(tokens.UnverifiedToken(token))
+        except exceptions.TokenRejectedError:
+            # PyJWT reads the clock through `datetime.now()`
+            with mock.patch.object(jwt.api_jwt, "datetime", FrozenDatetime):
+                with pytest.raises(jwt.exceptions.InvalidTokenError):
+                    jwt.decode(
+                        token, key=SECRET, algorithms=["HS256"], audience="client"
+                    )
+
+
+def test_prefilter_algorithm_check_is_opt_in() -> None:
+    token = tokens.UnverifiedToken(_encode({"aud": "client"}))
+    token.header["alg"] = "HS512"
+
+    tokens.DEFAULT_PREFILTER.check_parsed(token)
+    with pytest.raises(exceptions.TokenRejectedError):
+        tokens.TokenPrefilter(allowed_algorithms={"HS256"}).check_parsed(token)
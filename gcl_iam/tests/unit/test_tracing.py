@@ -0,0 +1,207 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+import uuid as sys_uuid
+from unittest import mock
+
+import pytest
+
+import gcl_iam.algorithms as algorithms
+import gcl_iam.drivers as drivers
+import gcl_iam.enforcers as enforcers
+import gcl_iam.engines as engines
+import gcl_iam.exceptions as exceptions
+import gcl_iam.rules as rules
+import gcl_iam.tracing as tracing
+
+HS256_KEY = "a-secret-key-that-is-at-least-32-bytes"
+
+
+class _RecordedSpan(tracing.Span):
+    def __init__(self, tracer, name, attributes, parent):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.exceptions = []
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+    def end(self):
+        self.ended = True
+        self.tracer.stack.remove(self)
+
+
+class _RecordingTracer(tracing.Tracer):
+    def __init__(self):
+        self.spans = []
+        self.stack = []
+
+    def start_span(self, name, attributes=None):
+        parent = self.stack[-1].name if self.stack else None
+        span = _RecordedSpan(self, name, attributes, parent)
+        self.spans.append(span)
+        self.stack.append(span)
+        return span
+
+    def by_name(self, name):
+        return [span for span in self.spans if span.name == name]
+
+
+@pytest.fixture
+def tracer():
+    recording = _RecordingTracer()
+    tracing.set_tracer(recording)
+    yield recording
+    tracing.set_tracer(None)
+
+
+def _make_token(algo) -> str:
+    return algo.encode(
+        {
+            "jti": str(sys_uuid.uuid4()),
+            "aud": "client-1",
+            "exp": int(time.time()) + 3600,
+        }
+    )
+
+
+def test_noop_tracer_by_default() -> None:
+    assert tracing.get_tracer() is tracing.NOOP_TRACER
+    assert not tracing.TRACER.enabled
+
+    with tracing.TRACER.start_span("name", {"key": 1}) as span:
+        span.set_attribute("key", 2)
+
+
+def test_set_tracer(tracer) -> None:
+    assert tracing.get_tracer() is tracer
+
+    tracing.set_tracer(None)
+
+    assert tracing.get_tracer() is tracing.NOOP_TRACER
+
+
+@pytest.mark.parametrize(
+    "enforcer_class", [enforcers.Enforcer, enforcers.CompiledEnforcer]
+)
+def test_enforce_span(tracer, enforcer_class) -> None:
+    enforcer = enforcer_class(["svc.vm.read"])
+
+    assert enforcer.enforce(rules.Rule("svc", "vm", "read"))
+    with pytest.raises(exceptions.PolicyNotAuthorized):
+        enforcer.enforce(rules.Rule("svc", "vm", "delete"), do_raise=True)
+
+    allowed, denied = tracer.by_name("gcl_iam.enforcer.enforce")
+    assert allowed.attributes == {"gcl_iam.rule": "svc.vm.read", "gcl_iam.grant": True}
+    assert denied.attributes == {"gcl_iam.rule": "svc.vm.delete"}
+    assert isinstance(denied.exceptions[0], exceptions.PolicyNotAuthorized)
+    assert allowed.ended and denied.ended
+
+
+def test_engine_spans_nest(tracer) -> None:
+    algo = algorithms.HS256(key=HS256_KEY)
+
+    engine = engines.IamEngine(
+        auth_token=_make_token(algo),
+        algorithm=algo,
+        driver=drivers.DummyDriver(),
+    )
+
+    assert engine.introspected
+    (init,) = tracer.by_name("gcl_iam.engine.init")
+    (decode,) = tracer.by_name("gcl_iam.algorithm.decode")
+    assert init.attributes == {"gcl_iam.lazy": False}
+    assert decode.parent == "gcl_iam.engine.init"
+    assert decode.attributes == {"gcl_iam.algorithm": "HS256", "gcl_iam.verify": True}
+    assert not tracer.stack
+
+
+def test_decode_span_records_errors(tracer) -> None:
+    algo = algorithms.HS256(key=HS256_KEY)
+
+    with pytest.raises(Exception):
+        algo.decode("not-a-token")
+
+    (decode,) = tracer.by_name("gcl_iam.algorithm.decode")
+    assert decode.exceptions and decode.ended
+
+
+def test_http_driver_spans(tracer) -> None:
+    driver = drivers.HttpDriver(
+        "http://iam.example/",
+        audience="client-1",
+        hs256_jwks_decryption_key="A" * 43,
+        metrics_registry=None,
+    )
+    driver._client = mock.Mock()
+    driver._client.get.return_value.json.return_value = {"algorithm": "unknown"}
+    algo = algorithms.HS256(key=HS256_KEY)
+    token_info = algo.decode(_make_token(algo), ignore_audience=True)
+    auth_token = mock.Mock(audience_name="client-1", token_info=token_info)
+
+    driver.get_introspection_info(auth_token)
+    with pytest.raises(ValueError):
+        driver.get_algorithm(mock.Mock(audience_name="client-1"))
+
+    (introspect,) = tracer.by_name("gcl_iam.driver.introspect")
+    (fetch,) = tracer.by_name("gcl_iam.driver.fetch_jwks")
+    assert introspect.attributes == {"gcl_iam.audience": "client-1"}
+    assert isinstance(fetch.exceptions[0], ValueError)
+
+
+def test_open_telemetry_tracer_without_open_telemetry(monkeypatch) -> None:
+    monkeypatch.setattr(tracing, "otel_trace", None)
+    otel_tracer = mock.Mock()
+    otel_span = otel_tracer.start_span.return_value
+    error = ValueError("boom")
+
+    with pytest.raises(ValueError):
+        with tracing.OpenTelemetryTracer(otel_tracer).start_span("name", {"a": 1}):
+            raise error
+
+    otel_tracer.start_span.assert_called_once_with("name", attributes={"a": 1})
+    otel_span.record_exception.assert_called_once_with(error)
+    otel_span.end.assert_called_once_with()
+
+
+def test_open_telemetry_tracer_activates_spans(monkeypatch) -> None:
+    otel_trace = mock.MagicMock()
+    monkeypatch.setattr(tracing, "otel_trace", otel_trace)
+    otel_tracer = mock.Mock()
+    otel_span = otel_tracer.start_span.return_value
+    scope = otel_trace.use_span.return_value
+
+    with tracing.OpenTelemetryTracer(otel_tracer).start_span("name") as span:
+        span.set_attribute("key", "value")
+        scope.__enter__.assert_called_once_with()
+        scope.__exit__.assert_not_called()
+
+    otel_trace.use_span.assert_called_once_with(
+        otel_span,
+        end_on_exit=False,
+        record_exception=False,
+        set_status_on_exception=False,
+    )
+    scope.__exit__.assert_called_once_with(None, None, None)
+    otel_span.set_attribute.assert_called_once_with("key", "value")
+    otel_span.end.assert_called_once_with()
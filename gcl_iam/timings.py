@@ -0,0 +1,92 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import abc
+import time
+import typing as tp
+
+Phase = tp.Tuple[str, float]
+
+
+class StatsSink(metaclass=abc.ABCMeta):
+    """Receives the duration of every timed auth phase."""
+
+    @abc.abstractmethod
+    def record(self, phase: str, seconds: float) -> None:
+        raise NotImplementedError("Not implemented")
+
+
+class PhaseTimer:
+    """Durations of the auth phases of one request.
+
+    Phases are timed with the monotonic `time.perf_counter()`:
+
+        started = timer.start()
+        ...
+        timer.stop("verify", started)
+    """
+
+    __slots__ = ("_phases",)
+
+    enabled = True
+
+    def __init__(self):
+        super().__init__()
+        self._phases: tp.List[Phase] = []
+
+    @property
+    def phases(self) -> tp.Sequence[Phase]:
+        return self._phases
+
+    def start(self) -> float:
+        return time.perf_counter()
+
+    def stop(self, phase: str, started: float) -> None:
+        self._phases.append((phase, time.perf_counter() - started))
+
+    def server_timing(self) -> str:
+        """Value of a `Server-Timing` header, durations in milliseconds."""
+        return ", ".join(
+            f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in self._phases
+        )
+
+    def report(self, sink: StatsSink) -> None:
+        for phase, seconds in self._phases:
+            sink.record(phase, seconds)
+
+
+class _NullTimer:
+    """Disabled timer, it neither reads the clock nor allocates."""
+
+    __slots__ = ()
+
+    enabled = False
+    phases: tp.Sequence[Phase] = ()
+
+    def start(self) -> float:
+        return 0.0
+
+    def stop(self, phase: str, started: float) -> None:
+        pass
+
+    def server_timing(self) -> str:
+        return ""
+
+    def report(self, sink: StatsSink) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
@@ -14,13 +14,87 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
+import binascii
 import datetime
+import json
 import time
 import typing as tp
 import uuid
 
 import jwt
 
+from gcl_iam import constants as c
+from gcl_iam import exceptions
+
+
+def _decode_segment(segment: memoryview, name: str) -> bytes:
+    try:
+        return base64.b64decode(
+            bytes(segment) + b"=" * (-len(segment) % 4),
+            altchars=b"-_",
+            validate=True,
+        )
+    except (TypeError, binascii.Error):
+        raise jwt.exceptions.DecodeError(f"Invalid {name} padding")
+
+
+def _load_segment_json(data: bytes, name: str) -> dict:
+    try:
+        value = json.loads(data)
+    except (ValueError, RecursionError) as e:
+        raise jwt.exceptions.DecodeError(f"Invalid {name} string: {e}")
+    if not isinstance(value, dict):
+        raise jwt.exceptions.DecodeError(
+            f"Invalid {name} string: must be a json object"
+        )
+    return value
+
+
+class ParsedToken:
+    """JWS compact serialization split and decoded exactly once.
+
+    Nothing here is verified. The signing input is a view over the raw token,
+    so signature verification does not copy it again.
+    """
+
+    __slots__ = ("token", "raw", "header", "payload", "signing_input", "signature")
+
+    def __init__(self, token: str):
+        self.token = token
+        self.raw = token.encode("utf-8")
+        view = memoryview(self.raw)
+
+        first_dot = self.raw.find(b".")
+        last_dot = self.raw.rfind(b".")
+        if first_dot == last_dot:
+            raise jwt.exceptions.DecodeError("Not enough segments")
+
+        self.header = _load_segment_json(
+            _decode_segment(view[:first_dot], "header"),
+            "header",
+        )
+        if not isinstance(self.header.get("kid", ""), str):
+            raise jwt.exceptions.InvalidTokenError(
+                "Key ID header parameter must be a string"
+            )
+        # No JWS extensions (e.g. unencoded "b64" payloads) are supported
+        if "crit" in self.header:
+            raise jwt.exceptions.InvalidTokenError("Unsupported critical extension")
+        if self.header.get("b64", True) is False:
+            raise jwt.exceptions.DecodeError("Detached payloads are not supported")
+        self.payload = _load_segment_json(
+            _decode_segment(view[first_dot + 1 : last_dot], "payload"),
+            "payload",
+        )
+        self.signing_input = view[:last_dot]
+        self.signature = _decode_segment(view[last_dot + 1 :], "crypto")
+
+    def __reduce__(self):
+        # Memoryviews are not picklable, parse the token again on the other
+        # side (e.g. in a process pool worker).
+        return (self.__class__, (self.token,))
+
 
 class BaseToken:
     def __init__(
@@ -52,22 +126,31 @@ class BaseToken:
 
 
 class UnverifiedToken(BaseToken):
-    def __init__(self, token: str):
-        token_info = jwt.decode(
-            token,
-            options={
-                "verify_signature": False,
-                "verify_exp": False,
-                "verify_aud": False,
-            },
-        )
+    def __init__(self, token: tp.Union[str, ParsedToken]):
+        if not isinstance(token, ParsedToken):
+            token = ParsedToken(token)
+        self._parsed_token = token
+        self._header = token.header
+        token_info = dict(token.payload)
 
         super().__init__(
-            token=token,
+            token=token.token,
             token_info=token_info,
             audience=token_info["aud"],
         )
 
+    @property
+    def parsed_token(self) -> ParsedToken:
+        return self._parsed_token
+
+    @property
+    def header(self) -> dict:
+        return self._header
+
+    @property
+    def key_id(self) -> tp.Optional[str]:
+        return self._header.get("kid")
+
 
 class VerifiedToken(BaseToken):
     def __init__(
@@ -86,6 +169,8 @@ class VerifiedToken(BaseToken):
             verify=verify,
         )
         audience_name = token_info["aud"]
+        if isinstance(token, ParsedToken):
+            token = token.token
 
         super().__init__(
             token=token,
@@ -229,3 +314,79 @@ class AnonymousToken(BaseToken):
     @property
     def otp_enabled(self):
         return False
+
+
+# Default caps, way above the size of any token IAM issues
+MAX_AUTH_HEADER_SIZE = 8192
+MAX_TOKEN_SIZE = 8192
+SUPPORTED_ALGORITHMS = frozenset(
+    (c.ALGORITHM_HS256, c.ALGORITHM_RS256, c.ALGORITHM_ES256, c.ALGORITHM_EDDSA)
+)
+
+
+def _numeric_claim(value) -> tp.Optional[int]:
+    # PyJWT compares `int(claim)`, other values are left to verification
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (ValueError, OverflowError):
+        return None
+
+
+class TokenPrefilter:
+    """Cheap rejection of junk tokens ahead of key lookup and verification.
+
+    Everything checked here is unverified, so a token passing the filter
+    proves nothing and is verified as usual. Only tokens verification
+    would reject anyway are rejected: oversized or malformed ones, or
+    numeric `exp`/`nbf` claims which are out of range with the same
+    `leeway_seconds` as verification. The `alg` header is checked only if
+    `allowed_algorithms` is given (e.g. `SUPPORTED_ALGORITHMS`), since
+    drivers may bring algorithms of their own.
+    """
+
+    def __init__(
+        self,
+        max_header_size: int = MAX_AUTH_HEADER_SIZE,
+        max_token_size: int = MAX_TOKEN_SIZE,
+        allowed_algorithms: tp.Optional[tp.AbstractSet[str]] = None,
+        leeway_seconds: float = 0,
+        clock: tp.Callable[[], float] = time.time,
+    ):
+        super().__init__()
+        self._max_header_size = max_header_size
+        self._max_token_size = max_token_size
+        self._allowed_algorithms = None
+        if allowed_algorithms is not None:
+            self._allowed_algorithms = frozenset(allowed_algorithms)
+        self._leeway_seconds = leeway_seconds
+        self._clock = clock
+
+    def check_raw(self, header_value: str, token: str) -> None:
+        """Check the Authorization header and its token before parsing."""
+        if len(header_value) > self._max_header_size:
+            raise exceptions.TokenRejectedError(reason="header is too large")
+        if len(token) > self._max_token_size:
+            raise exceptions.TokenRejectedError(reason="token is too large")
+        if token.count(".") != 2:
+            raise exceptions.TokenRejectedError(reason="not three segments")
+
+    def check_parsed(self, token_info: UnverifiedToken) -> None:
+        """Check the header and claims of a parsed, unverified token."""
+        allowed = self._allowed_algorithms
+        if allowed is not None and token_info.header.get("alg") not in allowed:
+            raise exceptions.TokenRejectedError(reason="algorithm is not allowed")
+
+        claims = token_info.token_info
+        now = self._clock()
+        # Same comparisons as PyJWT
+        exp = _numeric_claim(claims.get("exp"))
+        if exp is not None and exp <= now - self._leeway_seconds:
+            raise exceptions.TokenRejectedError(reason="token has expired")
+        nbf = _numeric_claim(claims.get("nbf"))
+        if nbf is not None and nbf > now + self._leeway_seconds:
+            raise exceptions.TokenRejectedError(reason="token is not yet valid")
+
+
+DEFAULT_PREFILTER = TokenPrefilter()
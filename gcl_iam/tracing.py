@@ -0,0 +1,155 @@
+#    Copyright 2026 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Pluggable tracing of the authentication path.
+
+Spans are opened around token verification, IAM calls, engine creation
+and enforcement through the process wide tracer set with `set_tracer()`.
+The default tracer is disabled: instrumented code checks
+`TRACER.enabled` first, so tracing costs an attribute lookup unless
+turned on. `OpenTelemetryTracer` adapts an OpenTelemetry tracer without
+gcl_iam depending on OpenTelemetry.
+"""
+
+import abc
+import typing as tp
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+Attributes = tp.Mapping[str, tp.Any]
+
+
+class Span(metaclass=abc.ABCMeta):
+    """Span of work, also usable as a context manager ending it."""
+
+    @abc.abstractmethod
+    def set_attribute(self, key: str, value: tp.Any) -> None:
+        raise NotImplementedError("Not implemented")
+
+    @abc.abstractmethod
+    def record_exception(self, exception: BaseException) -> None:
+        raise NotImplementedError("Not implemented")
+
+    @abc.abstractmethod
+    def end(self) -> None:
+        raise NotImplementedError("Not implemented")
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_value is not None:
+            self.record_exception(exc_value)
+        self.end()
+
+
+class Tracer(metaclass=abc.ABCMeta):
+    # Instrumented code skips spans of disabled tracers altogether
+    enabled = True
+
+    @abc.abstractmethod
+    def start_span(self, name: str, attributes: tp.Optional[Attributes] = None) -> Span:
+        raise NotImplementedError("Not implemented")
+
+
+class _NoopSpan(Span):
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def end(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopTracer(Tracer):
+    enabled = False
+
+    def start_span(self, name, attributes=None):
+        return _NOOP_SPAN
+
+
+NOOP_TRACER = NoopTracer()
+
+# Current tracer, replace it with `set_tracer()` only
+TRACER: Tracer = NOOP_TRACER
+
+
+def set_tracer(tracer: tp.Optional[Tracer]) -> None:
+    """Make `tracer` the tracer of the process, None disables tracing."""
+    global TRACER
+    TRACER = NOOP_TRACER if tracer is None else tracer
+
+
+def get_tracer() -> Tracer:
+    return TRACER
+
+
+class _OpenTelemetrySpan(Span):
+    def __init__(self, span):
+        super().__init__()
+        self._span = span
+        # Make the span current so that nested spans become its children
+        self._scope = None
+        if otel_trace is not None:
+            self._scope = otel_trace.use_span(
+                span,
+                end_on_exit=False,
+                record_exception=False,
+                set_status_on_exception=False,
+            )
+            self._scope.__enter__()
+
+    def set_attribute(self, key, value):
+        self._span.set_attribute(key, value)
+
+    def record_exception(self, exception):
+        self._span.record_exception(exception)
+        if otel_trace is not None:
+            self._span.set_status(
+                otel_trace.Status(otel_trace.StatusCode.ERROR, str(exception))
+            )
+
+    def end(self):
+        if self._scope is not None:
+            self._scope.__exit__(None, None, None)
+        self._span.end()
+
+
+class OpenTelemetryTracer(Tracer):
+    """Adapter of an OpenTelemetry tracer, e.g.
+
+    tracing.set_tracer(
+        tracing.OpenTelemetryTracer(trace.get_tracer("gcl_iam"))
+    )
+    """
+
+    def __init__(self, tracer):
+        super().__init__()
+        self._tracer = tracer
+
+    def start_span(self, name, attributes=None):
+        return _OpenTelemetrySpan(self._tracer.start_span(name, attributes=attributes))